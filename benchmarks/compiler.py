@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+AgentScript Compiler Benchmark
+
+Times Lexer.tokenize, Parser.parse, generate_python_code and the
+generate_code of every registered plugin on the synthetic programs of
+corpus.py, at increasing scale. Results are written as JSON; given a
+baseline produced by an earlier run (for example on the main branch), the
+script compares medians and exits with status 1 when any benchmark got
+slower by more than the threshold, so it can gate CI.
+
+Usage:
+    python benchmarks/compiler.py
+    python benchmarks/compiler.py --scales small medium large --json compiler.json
+    python benchmarks/compiler.py --baseline baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from corpus import SCALES, describe_scale, generate_scale  # noqa: E402
+
+from agentscript.codegen import generate_python_code  # noqa: E402
+from agentscript.lexer import Lexer  # noqa: E402
+from agentscript.parser import Parser  # noqa: E402
+from agentscript.plugins import get_registry  # noqa: E402
+from agentscript.plugins.base import GenerationContext  # noqa: E402
+from agentscript.profiler import count_nodes  # noqa: E402
+
+
+# Differences below this many seconds are noise, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.001
+
+
+def _time(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Run function repeat times and summarize its wall time in seconds."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return {"median": statistics.median(times), "min": min(times), "max": max(times)}
+
+
+def benchmark_scale(scale: str, seed: int, repeat: int, plugins: List[str], workdir: Path) -> List[Dict[str, Any]]:
+    """Measure every compiler stage on the program of one scale."""
+    source = generate_scale(scale, seed)
+    filename = f"synthetic_{scale}.ags"
+    tokens = Lexer(source, filename).tokenize()
+    program = Parser(tokens).parse()
+
+    sizes = {
+        "source_bytes": len(source.encode("utf-8")),
+        "tokens": len(tokens),
+        "ast_nodes": count_nodes(program),
+    }
+    benchmarks: Dict[str, Callable[[], Any]] = {
+        "lexer.tokenize": lambda: Lexer(source, filename).tokenize(),
+        "parser.parse": lambda: Parser(tokens).parse(),
+        "codegen.generate_python_code": lambda: generate_python_code(program, filename),
+    }
+
+    registry = get_registry()
+    for name in plugins:
+        plugin = registry.get_plugin(name)
+        context = GenerationContext(
+            source_file=workdir / filename,
+            output_dir=workdir / name,
+            target_framework=name,
+            options={},
+        )
+        benchmarks[f"plugin.{name}.generate_code"] = (
+            lambda plugin=plugin, context=context: plugin.generate_code(program, context)
+        )
+
+    results = []
+    for benchmark, function in benchmarks.items():
+        result = {"scale": scale, "benchmark": benchmark, **sizes}
+        try:
+            function()  # Warm-up, also shows whether the plugin handles the program at all
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        else:
+            result["seconds"] = _time(function, repeat)
+        results.append(result)
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Compare median times against a baseline and return a message per regression."""
+    previous = {
+        (result["scale"], result["benchmark"]): result["seconds"]["median"]
+        for result in baseline.get("results", []) if "seconds" in result
+    }
+
+    regressions = []
+    for result in results:
+        before = previous.get((result["scale"], result["benchmark"]))
+        if before is None or "seconds" not in result:
+            continue
+        after = result["seconds"]["median"]
+        if after > before * (1 + threshold) and after - before > MIN_REGRESSION_SECONDS:
+            regressions.append(
+                f"{result['scale']} {result['benchmark']}: {after * 1000:.1f}ms vs "
+                f"{before * 1000:.1f}ms baseline (+{(after / before - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the AgentScript lexer, parser and code generators")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"],
+                        help="Program sizes to benchmark (default: small medium)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic programs")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--plugins", nargs="*", help="Plugins to benchmark (default: all registered)")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Slowdown of the median that counts as a regression (default: 0.10 = 10%%)")
+    parser.add_argument("--no-fail", action="store_true", help="Report regressions without failing")
+    args = parser.parse_args()
+
+    plugins = args.plugins if args.plugins is not None else get_registry().list_plugins()
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            scale_results = benchmark_scale(scale, args.seed, args.repeat, plugins, Path(tmp))
+            results.extend(scale_results)
+
+            first = scale_results[0]
+            print(f"{scale}: {first['source_bytes']} bytes, {first['tokens']} tokens, "
+                  f"{first['ast_nodes']} AST nodes")
+            for result in scale_results:
+                if "error" in result:
+                    print(f"  {result['benchmark']:<40} failed: {result['error']}")
+                else:
+                    seconds = result["seconds"]
+                    print(f"  {result['benchmark']:<40} median {seconds['median'] * 1000:9.2f}ms "
+                          f"(min {seconds['min'] * 1000:.2f}ms)")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "scales": [describe_scale(scale) for scale in args.scales],
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if not args.baseline:
+        return 0
+
+    baseline: Optional[Dict[str, Any]] = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("seed") != args.seed:
+        print(f"\nWarning: baseline was measured with seed {baseline.get('seed')}, not {args.seed}")
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nSlower than {args.baseline} by more than {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  ✗ {regression}")
+        return 0 if args.no_fail else 1
+
+    print(f"\n✓ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
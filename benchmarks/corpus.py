@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Synthetic AgentScript Corpus
+
+Seeded generator of valid .ags programs for the compiler benchmarks. Each
+scale grows the number of intents, the pipeline depth, the nesting depth of
+lambda expressions and the volume of strings and comments, so that lexer,
+parser and code generator costs can be followed as programs grow. The same
+seed and scale always produce the same program.
+
+Usage:
+    python benchmarks/corpus.py medium > medium.ags
+    python benchmarks/corpus.py large --seed 7 -o large.ags
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Dict, Any, List
+
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "small": {"intents": 5, "depth": 3, "lambda_depth": 2, "string_length": 40, "comment_lines": 1},
+    "medium": {"intents": 50, "depth": 6, "lambda_depth": 3, "string_length": 200, "comment_lines": 3},
+    "large": {"intents": 200, "depth": 10, "lambda_depth": 4, "string_length": 1000, "comment_lines": 10},
+    "xlarge": {"intents": 1000, "depth": 12, "lambda_depth": 5, "string_length": 2000, "comment_lines": 20},
+}
+
+NUMERIC_FIELDS = ["age", "amount", "quantity", "score", "visits"]
+TEXT_FIELDS = ["name", "status", "region"]
+STATUSES = ["active", "trial", "paused", "churned", "pending"]
+WORDS = ["customer", "order", "pipeline", "record", "revenue", "region", "weekly", "quality",
+         "threshold", "segment", "export", "report", "filter", "daily", "signal"]
+
+
+def _text(rng: random.Random, length: int) -> str:
+    """Get prose of about length characters (no quotes or backslashes)."""
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:max(1, length)]
+
+
+def _condition(rng: random.Random, depth: int, parameter: str, string_length: int) -> str:
+    """Build a boolean expression nested depth levels deep."""
+    if depth <= 0:
+        kind = rng.randrange(4)
+        if kind == 0:
+            return f"{parameter}.{rng.choice(NUMERIC_FIELDS)} >= {rng.randint(0, 1000)}"
+        if kind == 1:
+            statuses = ", ".join(f'"{status}"' for status in rng.sample(STATUSES, 2))
+            return f"{parameter}.status in [{statuses}]"
+        if kind == 2:
+            needle = _text(rng, max(3, string_length // 20))
+            return f'{parameter}.name contains "{needle}"'
+        low = rng.randint(0, 500)
+        return f"{parameter}.{rng.choice(NUMERIC_FIELDS)} between {low} and {low + rng.randint(1, 500)}"
+
+    operator = rng.choice(["and", "or"])
+    left = _condition(rng, depth - 1, parameter, string_length)
+    right = _condition(rng, depth - 1, parameter, string_length)
+    return f"({left} {operator} {right})"
+
+
+def _arithmetic(rng: random.Random, depth: int, parameter: str) -> str:
+    """Build a numeric expression nested depth levels deep."""
+    if depth <= 0:
+        if rng.random() < 0.7:
+            return f"{parameter}.{rng.choice(NUMERIC_FIELDS)}"
+        return str(rng.randint(1, 100))
+
+    operator = rng.choice(["+", "-", "*"])
+    return f"({_arithmetic(rng, depth - 1, parameter)} {operator} {_arithmetic(rng, depth - 1, parameter)})"
+
+
+def _transform(rng: random.Random, depth: int, parameter: str) -> str:
+    """Build a record transformation that keeps every benchmark field."""
+    fields = [f"{name}: {_arithmetic(rng, depth, parameter)}" for name in NUMERIC_FIELDS]
+    fields.append(f"name: text.uppercase({parameter}.name)")
+    fields.extend(f"{name}: {parameter}.{name}" for name in TEXT_FIELDS[1:])
+    return f"transform({parameter} => {{ {', '.join(fields)} }})"
+
+
+def generate_program(seed: int = 0, intents: int = 5, depth: int = 3, lambda_depth: int = 2,
+                     string_length: int = 40, comment_lines: int = 1) -> str:
+    """Generate a synthetic .ags program."""
+    rng = random.Random(seed)
+    lines: List[str] = [f"// Synthetic AgentScript benchmark program (seed {seed})"]
+    lines.extend(f"// {_text(rng, 60)}" for _ in range(comment_lines))
+    lines.append("use io.csv, io.json")
+    lines.append("")
+
+    for index in range(intents):
+        lines.extend(f"// {_text(rng, 60)}" for _ in range(comment_lines))
+        lines.append(f"intent Synthetic{index} {{")
+        lines.append(f'    description: "{_text(rng, string_length)}"')
+        lines.append("")
+        lines.append(f'    pipeline: source.csv("input_{index}.csv")')
+
+        for stage in range(depth):
+            parameter = rng.choice(["row", "record", "item"])
+            if stage % 2 == 0:
+                lines.append(f"        -> filter({parameter} => "
+                             f"{_condition(rng, lambda_depth, parameter, string_length)})")
+            else:
+                lines.append(f"        -> {_transform(rng, lambda_depth, parameter)}")
+
+        sink = "json" if index % 2 else "csv"
+        lines.append(f'        -> sink.{sink}("output_{index}.{sink}")')
+        lines.append("}")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def generate_scale(scale: str, seed: int = 0) -> str:
+    """Generate the program of a named scale."""
+    return generate_program(seed, **SCALES[scale])
+
+
+def describe_scale(scale: str) -> Dict[str, Any]:
+    """Get the parameters of a named scale."""
+    return dict(SCALES[scale], scale=scale)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic AgentScript program")
+    parser.add_argument("scale", choices=list(SCALES), help="Program size")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("-o", "--output", type=Path, help="Write the program here instead of stdout")
+    args = parser.parse_args()
+
+    program = generate_scale(args.scale, args.seed)
+    if args.output:
+        args.output.write_text(program, encoding="utf-8")
+    else:
+        sys.stdout.write(program)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
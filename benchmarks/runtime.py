@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+AgentScript Runtime Benchmark
+
+Compiles the example programs in examples/ to pandas code in each codegen
+mode and runs them on synthetic CSV or JSON datasets of increasing size,
+recording throughput (source rows per second), peak RSS and the time of
+every pipeline stage. Every run happens in a fresh interpreter so peak RSS
+belongs to that run alone; per-stage times come from compiling with
+--instrument and reading agentscript.instrumentation's InMemoryCollector.
+
+As with benchmarks/compiler.py, results are written as JSON and can be
+compared against a baseline: the script exits with status 1 when the
+throughput of any run dropped by more than the threshold. Changes to
+codegen.py should come with such a comparison.
+
+Datasets are generated once per size, format and seed and kept in
+--data-dir, since the larger ones take a while to write.
+
+Usage:
+    python benchmarks/runtime.py
+    python benchmarks/runtime.py --rows 10000 100000 1000000 10000000 --json runtime.json
+    python benchmarks/runtime.py --programs user_processor --modes default streaming --format json
+    python benchmarks/runtime.py --baseline baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+EXAMPLES_DIR = REPO_ROOT / "examples"
+DEFAULT_DATA_DIR = Path(tempfile.gettempdir()) / "agentscript-runtime-benchmark"
+
+DEFAULT_PROGRAMS = [
+    "user_processor", "sample_pipeline", "data_pipeline", "customer_analytics",
+    "generated_from_ticket", "financial_report", "simple",
+]
+
+# Compile options of each codegen mode
+MODES: Dict[str, Dict[str, Any]] = {
+    "default": {"opt_level": 1},
+    "O0": {"opt_level": 0},
+    "O2": {"opt_level": 2},
+    "streaming": {"opt_level": 1, "streaming": True, "chunksize": 100_000},
+    "source_cache": {"opt_level": 1, "source_cache": True},
+}
+
+SOURCE_CALL = re.compile(r'source\.(csv|json)\("([^"]+)"\)')
+
+STATUSES = ["active", "trial", "paused", "churned"]
+REGIONS = ["north", "south", "east", "west"]
+
+
+def _environment() -> Dict[str, str]:
+    """Run against the source tree rather than whatever is installed."""
+    env = dict(os.environ)
+    src = str(REPO_ROOT / "src")
+    env["PYTHONPATH"] = src + os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else src
+    env.pop("AGENTSCRIPT_METRICS", None)
+    return env
+
+
+def program_source(program: str, data_format: str) -> str:
+    """Get the source of an example program, reading JSON instead of CSV if asked."""
+    source = (EXAMPLES_DIR / f"{program}.ags").read_text(encoding="utf-8")
+    if data_format == "json":
+        source = SOURCE_CALL.sub(
+            lambda match: f'source.json("{Path(match.group(2)).with_suffix(".json")}")', source
+        )
+    return source
+
+
+def dataset_path(data_dir: Path, rows: int, data_format: str, seed: int, lines: bool) -> Path:
+    """
+    Get a synthetic dataset, generating it on first use.
+
+    Every dataset has the columns the example programs read. JSON datasets
+    are written as one array of records, or as JSON lines for streaming runs
+    (the only layout the generated code streams).
+    """
+    suffix = "jsonl" if lines else data_format
+    path = data_dir / f"rows{rows}_seed{seed}.{suffix}"
+    if path.exists():
+        return path
+
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows)
+    df = pd.DataFrame({
+        "id": ids,
+        "name": pd.Series(ids).map("user{}".format),
+        "email": pd.Series(ids).map("User{}@Example.com".format),
+        "age": rng.integers(10, 90, rows),
+        "amount": rng.gamma(2.0, 60.0, rows).round(2),
+        "active": rng.random(rows) < 0.6,
+        "status": pd.Categorical.from_codes(rng.integers(0, len(STATUSES), rows), STATUSES),
+        "region": pd.Categorical.from_codes(rng.integers(0, len(REGIONS), rows), REGIONS),
+    })
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    print(f"  generating {path.name}...", flush=True)
+    if data_format == "csv":
+        df.to_csv(temp_path, index=False)
+    else:
+        df.to_json(temp_path, orient="records", lines=lines)
+    os.replace(temp_path, path)
+    return path
+
+
+def prepare_run_dir(run_dir: Path, source: str, dataset: Path):
+    """Make every source the program reads resolve to the dataset."""
+    run_dir.mkdir(parents=True, exist_ok=True)
+    for _, filename in SOURCE_CALL.findall(source):
+        link = run_dir / filename
+        if link.exists() or link.is_symlink():
+            link.unlink()
+        try:
+            link.symlink_to(dataset)
+        except OSError:
+            shutil.copyfile(dataset, link)
+
+
+def run_worker(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Compile and run one program in this process (used in the child interpreter)."""
+    import resource
+    import types
+
+    from agentscript.codegen import PythonCodeGenerator
+    from agentscript.instrumentation import InMemoryCollector, set_collector
+    from agentscript.optimizer import optimize_program
+    from agentscript.parser import parse_agentscript
+    from agentscript.stats import StatisticsCache
+
+    run_dir = Path(spec["run_dir"])
+    os.chdir(run_dir)
+
+    options = MODES[spec["mode"]]
+    filename = f"{spec['program']}.ags"
+    statistics_cache = StatisticsCache(run_dir / "stats")
+    program = parse_agentscript(spec["source"], filename)
+    program = optimize_program(program, options["opt_level"], lambda path: statistics_cache.get(Path(path)))
+
+    generator = PythonCodeGenerator(
+        filename,
+        streaming=options.get("streaming", False),
+        chunksize=options.get("chunksize", 100_000),
+        source_cache_dir=str(run_dir / "source-cache") if options.get("source_cache") else None,
+        instrument=True,
+    )
+    module = types.ModuleType(spec["program"])
+    exec(compile(generator.generate(program), f"{spec['program']}.py", "exec"), module.__dict__)
+
+    def run_intents():
+        for intent in generator.intents:
+            if intent["method"]:
+                getattr(getattr(module, intent["class"])(), intent["method"])()
+
+    if spec.get("warm_up"):
+        run_intents()  # Fills the source cache, so the timed run measures warm reads
+
+    collector = InMemoryCollector()
+    set_collector(collector)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    run_intents()
+    seconds = time.perf_counter() - started
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    rows = sum(metrics.rows_out for metrics in collector.metrics if metrics.kind == "source")
+    return {
+        "seconds": seconds,
+        "rows": rows,
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "rss_before_bytes": rss_before * scale,
+        "stages": collector.summary(),
+    }
+
+
+def measure(program: str, mode: str, rows: int, data_format: str, seed: int, repeat: int,
+            data_dir: Path, env: Dict[str, str]) -> Dict[str, Any]:
+    """Run one program in one mode on one dataset size, repeat times, each in a fresh interpreter."""
+    source = program_source(program, data_format)
+    lines = data_format == "json" and MODES[mode].get("streaming", False)
+    dataset = dataset_path(data_dir, rows, data_format, seed, lines)
+
+    result: Dict[str, Any] = {"program": program, "mode": mode, "rows": rows, "format": data_format}
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        run_dir = Path(tmp)
+        prepare_run_dir(run_dir, source, dataset)
+        spec = {
+            "program": program, "mode": mode, "source": source, "run_dir": str(run_dir),
+            "warm_up": MODES[mode].get("source_cache", False),
+        }
+        for _ in range(repeat):
+            completed = subprocess.run(
+                [sys.executable, __file__, "--worker", json.dumps(spec)],
+                env=env, capture_output=True, text=True
+            )
+            if completed.returncode != 0:
+                result["error"] = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else \
+                    f"exit status {completed.returncode}"
+                return result
+            runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    median_run = sorted(runs, key=lambda run: run["seconds"])[len(runs) // 2]
+    seconds = [run["seconds"] for run in runs]
+    result.update({
+        "seconds": {"median": statistics.median(seconds), "min": min(seconds), "max": max(seconds)},
+        "source_rows": median_run["rows"],
+        "rows_per_second": median_run["rows"] / median_run["seconds"] if median_run["seconds"] else 0.0,
+        "peak_rss_bytes": max(run["peak_rss_bytes"] for run in runs),
+        "rss_before_bytes": median_run["rss_before_bytes"],
+        "stages": median_run["stages"],
+    })
+    return result
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Compare throughput against a baseline and return a message per regression."""
+    previous = {
+        (result["program"], result["mode"], result["rows"], result["format"]): result["rows_per_second"]
+        for result in baseline.get("results", []) if "rows_per_second" in result
+    }
+
+    regressions = []
+    for result in results:
+        before = previous.get((result["program"], result["mode"], result["rows"], result["format"]))
+        if not before or "rows_per_second" not in result:
+            continue
+        after = result["rows_per_second"]
+        if after < before * (1 - threshold):
+            regressions.append(
+                f"{result['program']} {result['mode']} {result['rows']} rows ({result['format']}): "
+                f"{after:,.0f} rows/s vs {before:,.0f} baseline ({(after / before - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark generated pandas pipelines on synthetic data")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--programs", nargs="+", default=DEFAULT_PROGRAMS,
+                        help="Example programs to run (names in examples/, without .ags)")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES),
+                        help="Codegen modes to compare (default: all)")
+    parser.add_argument("--rows", nargs="+", type=int, default=[10_000, 100_000, 1_000_000],
+                        help="Dataset sizes (default: 10000 100000 1000000)")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv",
+                        help="Dataset format; JSON runs read source.json instead of source.csv")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic datasets")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR,
+                        help=f"Where generated datasets are kept (default: {DEFAULT_DATA_DIR})")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Throughput drop that counts as a regression (default: 0.10 = 10%%)")
+    parser.add_argument("--no-fail", action="store_true", help="Report regressions without failing")
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(json.loads(args.worker))))
+        return 0
+
+    env = _environment()
+    results: List[Dict[str, Any]] = []
+    for rows in args.rows:
+        for program in args.programs:
+            print(f"{program}, {rows:,} rows ({args.format})")
+            for mode in args.modes:
+                result = measure(program, mode, rows, args.format, args.seed, args.repeat, args.data_dir, env)
+                results.append(result)
+                if "error" in result:
+                    print(f"  {mode:<13} failed: {result['error']}")
+                    continue
+
+                print(f"  {mode:<13} {result['rows_per_second']:>13,.0f} rows/s  "
+                      f"{result['seconds']['median']:8.3f}s  peak RSS {result['peak_rss_bytes'] / 1024 ** 2:7.1f} MiB")
+                for stage in result["stages"][:3]:
+                    print(f"    {stage['seconds']:8.3f}s  {stage['method']} stage {stage['stage']} "
+                          f"({stage['kind']}, line {stage['ags_line']})")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if not args.baseline:
+        return 0
+
+    baseline: Optional[Dict[str, Any]] = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nSlower than {args.baseline} by more than {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  ✗ {regression}")
+        return 0 if args.no_fail else 1
+
+    print(f"\n✓ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+AgentScript CLI Startup Benchmark
+
+Measures cold-start latency of the `agentscript` entry point for a few
+representative subcommands and records `python -X importtime` data for each.
+Results are compared against the budgets in startup_budgets.json; the script
+exits with status 1 when any budget is exceeded so it can gate CI.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 20 --json startup.json
+    python benchmarks/startup.py --budget version.wall_ms=80
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Any
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGETS = Path(__file__).resolve().parent / "startup_budgets.json"
+
+TRIVIAL_PROGRAM = """use io.csv
+
+intent Trivial {
+    description: "Startup benchmark input"
+    pipeline: source.csv("in.csv") -> sink.csv("out.csv")
+}
+"""
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _command_args(name: str, workdir: Path) -> List[str]:
+    """Get the CLI arguments for a benchmarked command."""
+    if name == "version":
+        return ["version"]
+    if name == "plugins":
+        return ["plugins"]
+    if name == "compile":
+        source = workdir / "trivial.ags"
+        source.write_text(TRIVIAL_PROGRAM, encoding="utf-8")
+        return ["compile", str(source), "-o", str(workdir / "trivial.py"), "--no-cache"]
+    raise ValueError(f"Unknown command: {name}")
+
+
+def _environment() -> Dict[str, str]:
+    """Run against the source tree rather than whatever is installed."""
+    env = dict(os.environ)
+    src = str(REPO_ROOT / "src")
+    env["PYTHONPATH"] = src + os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else src
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def _run(args: List[str], env: Dict[str, str], python_flags: List[str] = None) -> subprocess.CompletedProcess:
+    """Run the CLI once in a fresh interpreter."""
+    command = [sys.executable, *(python_flags or []), "-m", "agentscript.main", *args]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr}")
+    return result
+
+
+def parse_import_times(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `-X importtime` output into (module, self_us, cumulative_us, depth) records."""
+    records = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            records.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2,
+            })
+    return records
+
+
+def measure_command(name: str, repeat: int, workdir: Path, env: Dict[str, str]) -> Dict[str, Any]:
+    """Measure wall-clock start-up and import time for one command."""
+    args = _command_args(name, workdir)
+
+    # One untimed run so bytecode caches are warm, as they are for users
+    _run(args, env)
+
+    wall_times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _run(args, env)
+        wall_times.append((time.perf_counter() - started) * 1000)
+
+    imports = parse_import_times(_run(args, env, ["-X", "importtime"]).stderr)
+    top_level = sorted(
+        (record for record in imports if record["depth"] == 0),
+        key=lambda record: record["cumulative_us"],
+        reverse=True
+    )
+
+    return {
+        "command": name,
+        "wall_ms": {
+            "median": statistics.median(wall_times),
+            "min": min(wall_times),
+            "max": max(wall_times),
+        },
+        "import_ms": sum(record["self_us"] for record in imports) / 1000,
+        "agentscript_import_ms": sum(
+            record["self_us"] for record in imports if record["module"].startswith("agentscript")
+        ) / 1000,
+        "modules_imported": len(imports),
+        "top_imports": [
+            {"module": record["module"], "cumulative_ms": record["cumulative_us"] / 1000}
+            for record in top_level[:10]
+        ],
+    }
+
+
+def check_budgets(results: List[Dict[str, Any]], budgets: Dict[str, Dict[str, float]]) -> List[str]:
+    """Compare results against budgets and return a message per violation."""
+    violations = []
+    for result in results:
+        budget = budgets.get(result["command"], {})
+        measured = {
+            "wall_ms": result["wall_ms"]["median"],
+            "import_ms": result["import_ms"],
+            "agentscript_import_ms": result["agentscript_import_ms"],
+        }
+        for metric, limit in budget.items():
+            if metric in measured and measured[metric] > limit:
+                violations.append(
+                    f"{result['command']}: {metric} {measured[metric]:.1f} exceeds budget {limit:.1f}"
+                )
+    return violations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark AgentScript CLI start-up time")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per command")
+    parser.add_argument("--commands", nargs="+", default=["version", "plugins", "compile"],
+                        help="Commands to benchmark")
+    parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS, help="Budget JSON file")
+    parser.add_argument("--budget", action="append", default=[], metavar="COMMAND.METRIC=MS",
+                        help="Override a single budget, e.g. version.wall_ms=80")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--no-fail", action="store_true", help="Report budget violations without failing")
+    args = parser.parse_args()
+
+    budgets = json.loads(args.budgets.read_text(encoding="utf-8")) if args.budgets.exists() else {}
+    for override in args.budget:
+        key, value = override.split("=", 1)
+        command, metric = key.split(".", 1)
+        budgets.setdefault(command, {})[metric] = float(value)
+
+    env = _environment()
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [measure_command(name, args.repeat, Path(tmp), env) for name in args.commands]
+
+    for result in results:
+        wall = result["wall_ms"]
+        print(f"agentscript {result['command']}")
+        print(f"  wall:    median {wall['median']:.1f}ms (min {wall['min']:.1f}ms, max {wall['max']:.1f}ms)")
+        print(f"  imports: {result['import_ms']:.1f}ms total, "
+              f"{result['agentscript_import_ms']:.1f}ms in agentscript, "
+              f"{result['modules_imported']} modules")
+        for record in result["top_imports"][:5]:
+            print(f"    {record['cumulative_ms']:7.1f}ms  {record['module']}")
+
+    if args.json:
+        args.json.write_text(json.dumps({"results": results, "budgets": budgets}, indent=2), encoding="utf-8")
+
+    violations = check_budgets(results, budgets)
+    if violations:
+        print("\nBudget exceeded:")
+        for violation in violations:
+            print(f"  ✗ {violation}")
+        return 0 if args.no_fail else 1
+
+    print("\n✓ All start-up budgets met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
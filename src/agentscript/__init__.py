@@ -7,10 +7,39 @@ and understand, while transpiling to clean, readable Python code.
 
 __version__ = "0.1.0"
 
-from .lexer import Lexer, Token, TokenType, LexerError
-from .parser import Parser, ParseError, parse_agentscript
-from .codegen import PythonCodeGenerator, generate_python_code
-from .ast_nodes import *
+import importlib
+
+# The compiler modules are imported on first attribute access (PEP 562), so
+# entry points such as 'agentscript version' start without loading them.
+_LAZY_ATTRIBUTES = {
+    'Lexer': 'lexer',
+    'Token': 'lexer',
+    'TokenType': 'lexer',
+    'LexerError': 'lexer',
+    'Parser': 'parser',
+    'ParseError': 'parser',
+    'parse_agentscript': 'parser',
+    'PythonCodeGenerator': 'codegen',
+    'generate_python_code': 'codegen',
+}
+
+
+def __getattr__(name):
+    if name.startswith('__'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    # AST node classes are re-exported from ast_nodes, as with the former star import
+    module = importlib.import_module(f".{_LAZY_ATTRIBUTES.get(name, 'ast_nodes')}", __name__)
+    if hasattr(module, name):
+        value = getattr(module, name)
+    else:
+        try:
+            value = importlib.import_module(f".{name}", __name__)
+        except ImportError:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    
+    globals()[name] = value
+    return value
 
 __all__ = [
     'Lexer', 'Token', 'TokenType', 'LexerError',
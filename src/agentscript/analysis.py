@@ -0,0 +1,355 @@
+"""
+AgentScript Pipeline Analysis
+
+Static analyses over pipeline ASTs that code generators use to emit cheaper
+code: column usage, i.e. which fields of a source a pipeline actually reads,
+so that generated readers can skip the rest (usecols= for CSV, columns= for
+columnar formats), and column types, so that readers are given explicit,
+compact dtypes instead of inferring them.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Any, Tuple
+
+from .ast_nodes import *
+
+
+def column_name(node: Expression, parameter: str) -> Optional[str]:
+    """
+    Get the column an attribute chain on a lambda parameter refers to.
+    
+    user.age is the column "age" and user.address.city the column
+    "address.city"; anything not rooted at the parameter is not a column.
+    """
+    parts = []
+    while isinstance(node, AttributeAccess):
+        parts.append(node.attribute)
+        node = node.object
+    
+    if isinstance(node, Identifier) and node.name == parameter and parts:
+        return ".".join(reversed(parts))
+    return None
+
+
+def referenced_columns(node: LambdaExpression) -> Optional[List[str]]:
+    """
+    Get the columns a lambda reads from its parameter, in first-use order.
+    
+    Returns None when the lambda uses the parameter as a whole (for example
+    passing the row to a helper function), since any column may then be read.
+    """
+    columns: List[str] = []
+    
+    def visit(value: Any) -> bool:
+        if isinstance(value, AttributeAccess):
+            name = column_name(value, node.parameter)
+            if name is not None:
+                if name not in columns:
+                    columns.append(name)
+                return True
+        elif isinstance(value, Identifier):
+            return value.name != node.parameter
+        elif isinstance(value, LambdaExpression) and value.parameter == node.parameter:
+            return True  # Inner lambda shadows the parameter
+        
+        if isinstance(value, ASTNode):
+            return all(visit(getattr(value, field.name)) for field in fields(value))
+        elif isinstance(value, (list, tuple)):
+            return all(visit(item) for item in value)
+        elif isinstance(value, dict):
+            return all(visit(item) for item in value.values())
+        return True
+    
+    if not visit(node.body):
+        return None
+    return columns
+
+
+def stage_call(stage: PipelineStage) -> Optional[str]:
+    """Get the name of a filter(...)/transform(...) style stage, or None."""
+    operation = stage.operation
+    if isinstance(operation, FunctionCall) and isinstance(operation.function, Identifier):
+        return operation.function.name
+    return None
+
+
+def stage_lambda(stage: PipelineStage) -> Optional[LambdaExpression]:
+    """Get the lambda passed to a stage call, if it has exactly one."""
+    operation = stage.operation
+    if (isinstance(operation, FunctionCall) and len(operation.arguments) == 1 and
+            isinstance(operation.arguments[0], LambdaExpression)):
+        return operation.arguments[0]
+    return None
+
+
+def node_signature(value: Any) -> str:
+    """
+    Render an AST as text that leaves out source positions.
+    
+    Nodes with the same signature compute the same thing wherever they are
+    in the .ags file, so signatures can key cached results.
+    """
+    if isinstance(value, ASTNode):
+        parts = [f"{field.name}={node_signature(getattr(value, field.name))}"
+                 for field in fields(value) if field.name != 'position']
+        return f"{type(value).__name__}({', '.join(parts)})"
+    elif isinstance(value, (list, tuple)):
+        return "[" + ", ".join(node_signature(item) for item in value) + "]"
+    elif isinstance(value, dict):
+        return "{" + ", ".join(f"{key!r}: {node_signature(item)}" for key, item in value.items()) + "}"
+    return repr(value)
+
+
+def required_columns(pipeline: PipelineExpression) -> Optional[List[str]]:
+    """
+    Get the source columns a pipeline needs, or None if it needs all of them.
+    
+    Stages are walked from the end of the pipeline back to the source.
+    Sinks and the pipeline result keep every column they receive, so they
+    require all columns. A transform that builds a new record defines its
+    output columns itself and only requires the fields it reads; a filter
+    requires what its predicate reads on top of what later stages require.
+    Anything the analysis does not understand requires all columns.
+    """
+    needed: Optional[List[str]] = None  # None means every column
+    
+    for stage in reversed(pipeline.stages[1:]):
+        name = stage_call(stage)
+        predicate = stage_lambda(stage)
+        
+        if name == "filter" and predicate is not None:
+            columns = referenced_columns(predicate)
+            if needed is None or columns is None:
+                needed = None
+            else:
+                needed = columns + [column for column in needed if column not in columns]
+        elif name == "transform" and predicate is not None and isinstance(predicate.body, ObjectLiteral):
+            needed = referenced_columns(predicate)
+        else:
+            needed = None
+    
+    # Reading zero columns would also lose the row count
+    return needed or None
+
+
+@dataclass
+class ColumnType:
+    """How a source column should be stored once loaded."""
+    dtype: Optional[str] = None        # Passed to the reader's dtype= map
+    downcast: Optional[str] = None     # pd.to_numeric(downcast=...) after loading
+    date_format: Optional[str] = None  # Parse as datetime with this strftime format
+    is_date: bool = False
+    inferred: bool = False             # Guessed from filter literals rather than declared
+
+
+# Types a behavior's 'expects' block can declare for its fields
+DECLARED_TYPES = {
+    'string': ColumnType(dtype='str'),
+    'text': ColumnType(dtype='str'),
+    'category': ColumnType(dtype='category'),
+    'enum': ColumnType(dtype='category'),
+    'bool': ColumnType(dtype='boolean'),
+    'boolean': ColumnType(dtype='boolean'),
+    'int': ColumnType(downcast='integer'),
+    'integer': ColumnType(downcast='integer'),
+    'float': ColumnType(dtype='float64'),
+    'number': ColumnType(dtype='float64'),
+    'date': ColumnType(is_date=True, date_format='%Y-%m-%d'),
+    'datetime': ColumnType(is_date=True, date_format='%Y-%m-%d %H:%M:%S'),
+}
+for _width in ('int8', 'int16', 'int32', 'int64', 'uint8', 'uint16', 'uint32', 'uint64', 'float32', 'float64'):
+    DECLARED_TYPES[_width] = ColumnType(dtype=_width)
+
+
+def declared_column_type(node: Expression) -> Optional[ColumnType]:
+    """
+    Get the column type for a type expression in an 'expects' block.
+    
+    Types are plain names (int, category, float32) or date types with an
+    explicit format: date("%d/%m/%Y").
+    """
+    if isinstance(node, Identifier):
+        return DECLARED_TYPES.get(node.name)
+    
+    if (isinstance(node, FunctionCall) and isinstance(node.function, Identifier) and
+            node.function.name in ('date', 'datetime') and node.arguments and
+            isinstance(node.arguments[0], Literal) and isinstance(node.arguments[0].value, str)):
+        return ColumnType(is_date=True, date_format=node.arguments[0].value)
+    
+    return None
+
+
+def _literals(node: Expression) -> Optional[List[Any]]:
+    """Get the literal value(s) of a literal or array of literals."""
+    if isinstance(node, Literal):
+        return [node.value]
+    if isinstance(node, UnaryOperation) and node.operator == "-" and isinstance(node.operand, Literal):
+        return [node.operand.value]
+    if isinstance(node, ArrayLiteral):
+        values = [_literals(element) for element in node.elements]
+        if values and all(value is not None for value in values):
+            return [value[0] for value in values]
+    return None
+
+
+# Comparisons that give the same result on a narrowed column as on the original
+COMPARISON_OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in", "between")
+
+
+def _literal_comparison(node: Any, parameter: str) -> Optional[Tuple[str, ColumnType]]:
+    """
+    Get the column a comparison tests against literals, and its narrowed type.
+    
+    Strings tested for equality or membership can be categorical, integer
+    columns compared with integers can be downcast, and columns searched
+    with contains or matches are read as strings.
+    """
+    if not isinstance(node, BinaryOperation):
+        return None
+    
+    column = column_name(node.left, parameter)
+    literals = _literals(node.right)
+    if column is None and node.operator in ("==", "!="):
+        column = column_name(node.right, parameter)
+        literals = _literals(node.left)
+    if column is None or not literals:
+        return None
+    
+    if all(isinstance(literal, str) for literal in literals):
+        if node.operator in ("contains", "matches"):
+            return column, ColumnType(dtype='str', inferred=True)
+        if node.operator in ("==", "!=", "in"):
+            return column, ColumnType(dtype='category', inferred=True)
+    elif all(isinstance(literal, int) and not isinstance(literal, bool) for literal in literals):
+        if node.operator in COMPARISON_OPERATORS:
+            return column, ColumnType(downcast='integer', inferred=True)
+    return None
+
+
+def literal_column_types(predicate: LambdaExpression) -> Dict[str, ColumnType]:
+    """
+    Infer column types from the literals a filter compares columns against.
+    
+    Columns tested for equality or membership against strings are treated
+    as categorical; columns compared against integers are downcast to the
+    smallest integer type that holds them, if pandas read them as integers
+    (a comparison with an integer says nothing about a column's contents:
+    zip == 12345 may run over "ABC12"); columns searched with contains or
+    matches are read as strings. The comparisons themselves give the same
+    result on the narrowed columns, but other uses may not: see
+    infer_column_types().
+    """
+    types: Dict[str, ColumnType] = {}
+    
+    def visit(value: Any):
+        comparison = _literal_comparison(value, predicate.parameter)
+        if comparison is not None:
+            types.setdefault(*comparison)
+        
+        if isinstance(value, ASTNode):
+            for field in fields(value):
+                visit(getattr(value, field.name))
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                visit(item)
+        elif isinstance(value, dict):
+            for item in value.values():
+                visit(item)
+    
+    visit(predicate.body)
+    return types
+
+
+def _is_io_stage(stage: PipelineStage) -> bool:
+    """Check whether a stage is a source.csv(...)/sink.json(...) style stage."""
+    operation = stage.operation
+    return (isinstance(operation, FunctionCall) and
+            isinstance(operation.function, AttributeAccess) and
+            isinstance(operation.function.object, Identifier) and
+            operation.function.object.name in ("source", "sink"))
+
+
+def _comparison_only(pipeline: PipelineExpression, types: Dict[str, ColumnType]) -> Dict[str, ColumnType]:
+    """
+    Keep the literal-inferred types of columns that are only ever compared.
+    
+    A downcast column overflows in arithmetic (int8 200 + 200 is -112) and a
+    categorical one cannot be concatenated or ordered, so a column keeps its
+    inferred type only if every reference to it in every stage is a
+    comparison that inferred that same type. Stages the analysis does not
+    understand, or lambdas that use the whole record, keep no inferred types.
+    """
+    kept = dict(types)
+    
+    def visit(value: Any, parameter: str) -> bool:
+        comparison = _literal_comparison(value, parameter)
+        if comparison is not None:
+            column, column_type = comparison
+            if kept.get(column) != column_type:
+                kept.pop(column, None)
+            return True  # The other operand is made of literals
+        
+        if isinstance(value, AttributeAccess):
+            name = column_name(value, parameter)
+            if name is not None:
+                kept.pop(name, None)
+                return True
+        elif isinstance(value, Identifier):
+            return value.name != parameter
+        elif isinstance(value, LambdaExpression) and value.parameter == parameter:
+            return True  # Inner lambda shadows the parameter
+        
+        if isinstance(value, ASTNode):
+            return all(visit(getattr(value, field.name), parameter) for field in fields(value))
+        elif isinstance(value, (list, tuple)):
+            return all(visit(item, parameter) for item in value)
+        elif isinstance(value, dict):
+            return all(visit(item, parameter) for item in value.values())
+        return True
+    
+    for stage in pipeline.stages[1:]:
+        if _is_io_stage(stage):
+            continue
+        predicate = stage_lambda(stage)
+        if stage_call(stage) not in ("filter", "transform") or predicate is None:
+            return {}
+        if not visit(predicate.body, predicate.parameter):
+            return {}
+    
+    return kept
+
+
+def infer_column_types(
+    pipeline: PipelineExpression,
+    schema: Optional[Dict[str, Expression]] = None
+) -> Dict[str, ColumnType]:
+    """
+    Infer storage types for a pipeline's source columns.
+    
+    Declared types from a behavior's 'expects' schema take precedence over
+    types inferred from the literals in the pipeline's filters. Only filters
+    before the first transform see source columns, so later ones are ignored.
+    
+    Inferred types leave the pipeline's output values unchanged, though
+    columns of the returned frame may have the narrower dtype: a column is
+    only narrowed when no stage uses it other than in comparisons with
+    literals (see _comparison_only()). Declared types are applied as given.
+    """
+    types: Dict[str, ColumnType] = {}
+    
+    for stage in pipeline.stages[1:]:
+        name = stage_call(stage)
+        predicate = stage_lambda(stage)
+        if name != "filter" or predicate is None:
+            break
+        for column, column_type in literal_column_types(predicate).items():
+            types.setdefault(column, column_type)
+    
+    types = _comparison_only(pipeline, types)
+    
+    for column, type_node in (schema or {}).items():
+        column_type = declared_column_type(type_node)
+        if column_type is not None:
+            types[column] = column_type
+    
+    return types
@@ -5,11 +5,34 @@ This module defines all the AST node types used by the AgentScript parser.
 Each node represents a different construct in the AgentScript language.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import List, Optional, Dict, Any, Union
 from abc import ABC, abstractmethod
 
 
+def slotted(cls):
+    """
+    Rebuild a dataclass with __slots__ instead of a per-instance __dict__.
+    
+    Equivalent to @dataclass(slots=True), which needs Python 3.10+. Only the
+    fields a class adds are slotted; inherited fields live in the base slots.
+    """
+    inherited = set()
+    for base in cls.__mro__[1:]:
+        inherited.update(getattr(base, '__slots__', ()))
+    
+    field_names = tuple(f.name for f in fields(cls) if f.name not in inherited)
+    namespace = dict(cls.__dict__)
+    for name in field_names:
+        namespace.pop(name, None)  # Defaults already live in the generated __init__
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = field_names
+    
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@slotted
 @dataclass
 class Position:
     """Source code position information for error reporting."""
@@ -18,6 +41,7 @@ class Position:
     filename: Optional[str] = None
 
 
+@slotted
 @dataclass
 class ASTNode(ABC):
     """Base class for all AST nodes."""
@@ -29,18 +53,21 @@ class ASTNode(ABC):
         pass
 
 
+@slotted
 @dataclass
 class Expression(ASTNode):
     """Base class for all expressions."""
     pass
 
 
+@slotted
 @dataclass
 class Statement(ASTNode):
     """Base class for all statements."""
     pass
 
 
+@slotted
 @dataclass
 class Identifier(Expression):
     """Represents an identifier (variable name, function name, etc.)."""
@@ -50,6 +77,7 @@ class Identifier(Expression):
         return visitor.visit_identifier(self)
 
 
+@slotted
 @dataclass
 class Literal(Expression):
     """Represents literal values (strings, numbers, booleans)."""
@@ -60,6 +88,7 @@ class Literal(Expression):
         return visitor.visit_literal(self)
 
 
+@slotted
 @dataclass
 class ImportStatement(Statement):
     """Represents import statements like 'use io.csv, validation.email'."""
@@ -69,6 +98,7 @@ class ImportStatement(Statement):
         return visitor.visit_import(self)
 
 
+@slotted
 @dataclass
 class IntentDeclaration(Statement):
     """Represents an intent block - the main construct of AgentScript."""
@@ -82,6 +112,7 @@ class IntentDeclaration(Statement):
         return visitor.visit_intent_declaration(self)
 
 
+@slotted
 @dataclass
 class BehaviorDeclaration(Statement):
     """Represents a custom behavior definition."""
@@ -90,11 +121,13 @@ class BehaviorDeclaration(Statement):
     returns: Optional[str]  # Return type
     description: Optional[str]
     rules: List['ValidationRule']
+    schema: Optional[Dict[str, Expression]] = None  # Field name -> type of the expected input
     
     def accept(self, visitor):
         return visitor.visit_behavior_declaration(self)
 
 
+@slotted
 @dataclass
 class ValidationRule(ASTNode):
     """Represents a validation rule within a behavior."""
@@ -105,6 +138,7 @@ class ValidationRule(ASTNode):
         return visitor.visit_validation_rule(self)
 
 
+@slotted
 @dataclass
 class PipelineExpression(Expression):
     """Represents a data processing pipeline with -> operators."""
@@ -114,6 +148,7 @@ class PipelineExpression(Expression):
         return visitor.visit_pipeline_expression(self)
 
 
+@slotted
 @dataclass
 class PipelineStage(ASTNode):
     """Represents a single stage in a pipeline."""
@@ -123,6 +158,7 @@ class PipelineStage(ASTNode):
         return visitor.visit_pipeline_stage(self)
 
 
+@slotted
 @dataclass
 class FunctionCall(Expression):
     """Represents a function call with arguments."""
@@ -134,6 +170,7 @@ class FunctionCall(Expression):
         return visitor.visit_function_call(self)
 
 
+@slotted
 @dataclass
 class LambdaExpression(Expression):
     """Represents a lambda expression like 'user => user.age > 18'."""
@@ -144,6 +181,7 @@ class LambdaExpression(Expression):
         return visitor.visit_lambda_expression(self)
 
 
+@slotted
 @dataclass
 class BinaryOperation(Expression):
     """Represents binary operations like comparisons and arithmetic."""
@@ -155,6 +193,7 @@ class BinaryOperation(Expression):
         return visitor.visit_binary_operation(self)
 
 
+@slotted
 @dataclass
 class UnaryOperation(Expression):
     """Represents unary operations like 'not', '-', etc."""
@@ -165,6 +204,7 @@ class UnaryOperation(Expression):
         return visitor.visit_unary_operation(self)
 
 
+@slotted
 @dataclass
 class AttributeAccess(Expression):
     """Represents attribute access like 'user.age'."""
@@ -175,6 +215,7 @@ class AttributeAccess(Expression):
         return visitor.visit_attribute_access(self)
 
 
+@slotted
 @dataclass
 class ObjectLiteral(Expression):
     """Represents object literals like '{ name: "John", age: 30 }'."""
@@ -184,6 +225,7 @@ class ObjectLiteral(Expression):
         return visitor.visit_object_literal(self)
 
 
+@slotted
 @dataclass
 class ArrayLiteral(Expression):
     """Represents array literals like '[1, 2, 3]'."""
@@ -193,6 +235,7 @@ class ArrayLiteral(Expression):
         return visitor.visit_array_literal(self)
 
 
+@slotted
 @dataclass
 class ResourceDeclaration(Statement):
     """Represents a resource declaration for databases, APIs, etc."""
@@ -204,6 +247,7 @@ class ResourceDeclaration(Statement):
         return visitor.visit_resource_declaration(self)
 
 
+@slotted
 @dataclass
 class Program(ASTNode):
     """Represents the root of the AST - the entire program."""
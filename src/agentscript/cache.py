@@ -0,0 +1,215 @@
+"""
+AgentScript Compilation Cache
+
+Content-addressed on-disk cache for compiled output. Entries are keyed by a
+hash of the source text, its path, the target framework, the compile options,
+the compiler/plugin versions and a fingerprint of the compiler's own source
+code, and map to the set of generated files. Unchanged inputs can therefore
+skip lexing, parsing and code generation, while any change to the lexer,
+parser, optimizer, code generators or plugins invalidates every entry.
+"""
+
+import hashlib
+import json
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Sequence
+
+
+# Bump when the entry layout changes so stale entries are never read back
+CACHE_FORMAT_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """Get the default cache directory, honouring AGENTSCRIPT_CACHE_DIR and XDG_CACHE_HOME."""
+    if os.getenv('AGENTSCRIPT_CACHE_DIR'):
+        return Path(os.getenv('AGENTSCRIPT_CACHE_DIR'))
+    
+    base = os.getenv('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'agentscript'
+
+
+@lru_cache(maxsize=None)
+def compiler_fingerprint(*extra_files: str) -> str:
+    """
+    Hash the source code of the agentscript package and of extra_files.
+    
+    The version number alone does not change when the compiler does, so
+    entries are also keyed by the code that produced them. extra_files are
+    modules outside the package, such as third-party plugins.
+    """
+    package_dir = Path(__file__).resolve().parent
+    digest = hashlib.sha256()
+    for path in sorted(package_dir.rglob('*.py')):
+        digest.update(path.relative_to(package_dir).as_posix().encode('utf-8'))
+        digest.update(path.read_bytes())
+    for name in sorted(extra_files):
+        path = Path(name)
+        if package_dir not in path.resolve().parents:
+            digest.update(str(path).encode('utf-8'))
+            try:
+                digest.update(path.read_bytes())
+            except OSError:
+                pass
+    return digest.hexdigest()
+
+
+class CompilationCache:
+    """Maps compilation inputs to previously generated files."""
+    
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_size_mb: int = 512,
+        max_age_days: int = 30
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.max_age_seconds = max_age_days * 24 * 60 * 60
+        self.hits = 0
+        self.misses = 0
+    
+    def make_key(
+        self,
+        source_code: str,
+        source_file: str,
+        target: str,
+        options: Dict[str, Any],
+        version: str,
+        module_files: Sequence[str] = (),
+        inputs: Optional[List[Any]] = None
+    ) -> str:
+        """
+        Build the cache key for a compilation.
+        
+        The source path is part of the key because generated code embeds it
+        in comments and error metadata. module_files are extra modules the
+        output depends on (see compiler_fingerprint()); inputs identifies any
+        data files the compilation looked at, such as the sources whose
+        statistics -O 2 orders filter conditions by.
+        """
+        from . import __version__
+        
+        digest = hashlib.sha256()
+        digest.update(source_code.encode('utf-8'))
+        metadata = {
+            'format': CACHE_FORMAT_VERSION,
+            'compiler': __version__,
+            'fingerprint': compiler_fingerprint(*module_files),
+            'inputs': inputs,
+            'source_file': source_file,
+            'target': target,
+            'options': options,
+            'version': version,
+        }
+        digest.update(json.dumps(metadata, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """Get the generated files for a key, or None on a miss."""
+        entry_path = self._entry_path(key)
+        
+        try:
+            data = json.loads(entry_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        
+        if data.get('format') != CACHE_FORMAT_VERSION or not isinstance(data.get('files'), dict):
+            self.misses += 1
+            return None
+        
+        # Refresh mtime so eviction treats the entry as recently used
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        
+        self.hits += 1
+        return data['files']
+    
+    def put(self, key: str, files: Dict[str, str]) -> bool:
+        """
+        Store the generated files for a key.
+        
+        The cache is best effort: an unwritable cache directory never fails
+        a compilation, the entry is simply not stored.
+        """
+        entry_path = self._entry_path(key)
+        data = {
+            'format': CACHE_FORMAT_VERSION,
+            'created': time.time(),
+            'files': files,
+        }
+        
+        # Write atomically so concurrent compilers never read a partial entry
+        temp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps(data), encoding='utf-8')
+            os.replace(temp_path, entry_path)
+        except OSError:
+            return False
+        
+        return True
+    
+    def evict(self) -> int:
+        """
+        Remove expired entries, then least recently used ones until the cache
+        fits within its size budget.
+        
+        Returns:
+            Number of entries removed
+        """
+        entries = self._list_entries()
+        now = time.time()
+        removed = 0
+        
+        kept: List[Tuple[float, int, Path]] = []
+        for mtime, size, path in entries:
+            if now - mtime > self.max_age_seconds:
+                removed += self._remove(path)
+            else:
+                kept.append((mtime, size, path))
+        
+        total_size = sum(size for _, size, _ in kept)
+        for mtime, size, path in sorted(kept):
+            if total_size <= self.max_size_bytes:
+                break
+            removed += self._remove(path)
+            total_size -= size
+        
+        return removed
+    
+    def clear(self) -> int:
+        """Remove every cache entry and return how many were removed."""
+        return sum(self._remove(path) for _, _, path in self._list_entries())
+    
+    def _entry_path(self, key: str) -> Path:
+        """Get the file holding the entry for a key."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+    
+    def _list_entries(self) -> List[Tuple[float, int, Path]]:
+        """List (mtime, size, path) for every entry in the cache."""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        
+        return entries
+    
+    def _remove(self, path: Path) -> int:
+        """Remove an entry file, returning 1 if it was removed."""
+        try:
+            path.unlink()
+            return 1
+        except OSError:
+            return 0
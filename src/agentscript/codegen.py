@@ -5,30 +5,249 @@ Converts AgentScript AST to clean, readable Python code.
 Maintains good coding practices and generates well-documented output.
 """
 
+import hashlib
+import re
 import textwrap
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Optional, Any, Tuple
 from .ast_nodes import *
+from .analysis import ColumnType, column_name, infer_column_types, node_signature, required_columns, stage_call, stage_lambda
+
+
+# File formats of source.*/sink.* stages. Text formats can be streamed in
+# chunks; columnar formats are read through pyarrow datasets.
+TEXT_FORMATS = ("csv", "json")
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# Keyword options accepted by columnar sinks: sink.parquet("out.parquet", compression: "zstd")
+SINK_OPTIONS = ("compression", "row_group_size")
+
+# Size bound of the generated code's CSV sidecar cache
+DEFAULT_SOURCE_CACHE_MAX_BYTES = 10 * 1024 ** 3
+
+
+class VectorizationError(Exception):
+    """Raised when an expression cannot be expressed as whole-column operations."""
+    pass
+
+
+class PandasExpressionGenerator:
+    """
+    Translates lambda bodies into vectorized pandas expressions.
+    
+    Attribute access on the lambda parameter becomes a column reference
+    (user.age -> df["age"], user.address.city -> df["address.city"]), so a
+    filter like 'user => user.age >= 18 and user.active' becomes the boolean
+    mask (df["age"] >= 18) & df["active"]. Expressions that have no column
+    equivalent raise VectorizationError so callers can fall back to apply().
+    """
+    
+    COMPARISON_OPERATORS = {"==", "!=", "<", "<=", ">", ">="}
+    ARITHMETIC_OPERATORS = {"+", "-", "*", "/", "%"}
+    
+    # text.* helpers and their pandas string accessor methods
+    TEXT_FUNCTIONS = {
+        "uppercase": "upper",
+        "lowercase": "lower",
+        "trim": "strip",
+        "length": "len",
+    }
+    
+    def __init__(self, parameter: str, frame: str = "df"):
+        self.parameter = parameter
+        self.frame = frame
+        self.columns: List[str] = []  # Referenced columns, in first-use order
+    
+    def generate(self, node: Expression) -> str:
+        """Generate a vectorized expression for node."""
+        if isinstance(node, Literal):
+            return self._literal(node)
+        elif isinstance(node, AttributeAccess):
+            return self._column(node)
+        elif isinstance(node, ArrayLiteral):
+            return "[" + ", ".join(self._scalar(element) for element in node.elements) + "]"
+        elif isinstance(node, UnaryOperation):
+            operand = self.generate(node.operand)
+            if node.operator == "not":
+                return f"~{operand}"
+            elif node.operator == "-":
+                return f"(-{operand})"
+        elif isinstance(node, BinaryOperation):
+            return self._binary(node)
+        elif isinstance(node, FunctionCall):
+            return self._call(node)
+        
+        raise VectorizationError(f"Cannot vectorize {type(node).__name__}")
+    
+    def _column(self, node: AttributeAccess) -> str:
+        """Generate a column reference."""
+        name = column_name(node, self.parameter)
+        if name is None:
+            raise VectorizationError(f"'{node.attribute}' is not a column of {self.parameter}")
+        
+        if name not in self.columns:
+            self.columns.append(name)
+        return f"{self.frame}[{name!r}]"
+    
+    def _literal(self, node: Literal) -> str:
+        """Generate a Python literal."""
+        return repr(node.value)
+    
+    def _scalar(self, node: Expression) -> str:
+        """Generate an expression that must not depend on any column."""
+        if isinstance(node, Literal):
+            return self._literal(node)
+        if isinstance(node, UnaryOperation) and node.operator == "-" and isinstance(node.operand, Literal):
+            return f"-{self._literal(node.operand)}"
+        raise VectorizationError("Expected a literal value")
+    
+    def _binary(self, node: BinaryOperation) -> str:
+        """Generate a binary operation."""
+        operator = node.operator
+        
+        if operator == "and":
+            return f"({self.generate(node.left)} & {self.generate(node.right)})"
+        elif operator == "or":
+            return f"({self.generate(node.left)} | {self.generate(node.right)})"
+        elif operator in self.COMPARISON_OPERATORS or operator in self.ARITHMETIC_OPERATORS:
+            return f"({self.generate(node.left)} {operator} {self.generate(node.right)})"
+        elif operator == "in":
+            if isinstance(node.right, ArrayLiteral):
+                return f"{self._column_operand(node.left)}.isin({self.generate(node.right)})"
+            # "text" in user.field: substring test on a string column
+            return f"{self._column_operand(node.right)}.str.contains({self._scalar(node.left)}, regex=False, na=False)"
+        elif operator == "contains":
+            return f"{self._column_operand(node.left)}.str.contains({self._scalar(node.right)}, regex=False, na=False)"
+        elif operator == "matches":
+            return f"{self._column_operand(node.left)}.str.fullmatch({self._scalar(node.right)}, na=False)"
+        elif operator == "between" and isinstance(node.right, ArrayLiteral) and len(node.right.elements) == 2:
+            low, high = node.right.elements
+            return f"{self._column_operand(node.left)}.between({self._scalar(low)}, {self._scalar(high)})"
+        
+        raise VectorizationError(f"Cannot vectorize operator '{operator}'")
+    
+    def _call(self, node: FunctionCall) -> str:
+        """Generate a text.* helper call as a string accessor method."""
+        function = node.function
+        if (isinstance(function, AttributeAccess) and isinstance(function.object, Identifier) and
+                function.object.name == "text" and function.attribute in self.TEXT_FUNCTIONS and
+                len(node.arguments) == 1 and not node.keyword_arguments):
+            method = self.TEXT_FUNCTIONS[function.attribute]
+            return f"{self.generate(node.arguments[0])}.str.{method}()"
+        
+        raise VectorizationError("Cannot vectorize function call")
+    
+    def _column_operand(self, node: Expression) -> str:
+        """Generate an operand that must be a column (or an expression over columns)."""
+        if isinstance(node, (Literal, ArrayLiteral)):
+            raise VectorizationError("Expected a column reference")
+        return self.generate(node)
+
+
+# Python regular expression syntax that RE2, the engine of pyarrow.compute, lacks
+# or reads differently: backreferences, lookarounds, atomic groups, conditionals,
+# possessive quantifiers and the classes RE2 only applies to ASCII
+NON_RE2_SYNTAX = re.compile(r"\\[1-9]|\(\?P=|\(\?<?[=!]|\(\?>|\(\?\(|\\[dDwWsSbBZ]|[*+?}]\+")
+
+
+class ArrowExpressionGenerator(PandasExpressionGenerator):
+    """
+    Translates filter predicates into pyarrow dataset expressions.
+    
+    The expressions are pushed into pyarrow.dataset scans so row groups and
+    rows a filter rejects are never loaded: user.age >= 18 becomes
+    ds.field('age') >= 18. Only predicates that reject missing values the
+    same way the pandas filter does are translated (not and != keep rows
+    with missing values in pandas but not in Arrow), so pushing one down
+    never drops a row the filter would keep.
+    """
+    
+    def generate(self, node: Expression) -> str:
+        """Generate a dataset expression for node."""
+        if isinstance(node, (UnaryOperation, FunctionCall)) and not (
+                isinstance(node, UnaryOperation) and node.operator == "-"):
+            raise VectorizationError(f"Cannot push down {type(node).__name__}")
+        return super().generate(node)
+    
+    def _column(self, node: AttributeAccess) -> str:
+        """Generate a field reference."""
+        name = column_name(node, self.parameter)
+        if name is None:
+            raise VectorizationError(f"'{node.attribute}' is not a column of {self.parameter}")
+        
+        if name not in self.columns:
+            self.columns.append(name)
+        return f"ds.field({name!r})"
+    
+    def _binary(self, node: BinaryOperation) -> str:
+        """Generate a binary operation."""
+        operator = node.operator
+        
+        if operator == "!=":
+            raise VectorizationError("Cannot push down '!='")
+        elif operator == "in" and not isinstance(node.right, ArrayLiteral):
+            return f"pc.match_substring({self._column_operand(node.right)}, {self._scalar(node.left)})"
+        elif operator == "contains":
+            return f"pc.match_substring({self._column_operand(node.left)}, {self._scalar(node.right)})"
+        elif operator == "matches":
+            if not isinstance(node.right, Literal) or not isinstance(node.right.value, str):
+                raise VectorizationError("Expected a literal pattern")
+            if NON_RE2_SYNTAX.search(node.right.value):
+                raise VectorizationError("Pattern uses syntax RE2 does not support the way Python does")
+            pattern = "^(?:" + node.right.value + ")$"
+            return f"pc.match_substring_regex({self._column_operand(node.left)}, {pattern!r})"
+        elif operator == "between" and isinstance(node.right, ArrayLiteral) and len(node.right.elements) == 2:
+            column = self._column_operand(node.left)
+            low, high = node.right.elements
+            return f"(({column} >= {self._scalar(low)}) & ({column} <= {self._scalar(high)}))"
+        
+        return super()._binary(node)
 
 
 class PythonCodeGenerator(ASTVisitor):
     """Generates Python code from AgentScript AST."""
     
-    def __init__(self, source_filename: str = None):
+    def __init__(self, source_filename: str = None, streaming: bool = False, chunksize: int = 100_000,
+                 source_cache_dir: Optional[str] = None, source_cache_max_bytes: int = DEFAULT_SOURCE_CACHE_MAX_BYTES,
+                 checkpoint_dir: Optional[str] = None, instrument: bool = False):
         self.imports: Set[str] = set()
         self.classes: List[str] = []
         self.current_indent = 0
         self.indent_size = 4
         self.source_filename = source_filename
         self.line_mappings: Dict[int, int] = {}  # Python line -> AgentScript line
+        self.intents: List[Dict[str, Any]] = []  # Generated class and method of each intent
+        self.streaming = streaming  # Process sources in chunks of chunksize rows
+        self.chunksize = chunksize
+        self.behaviors: Dict[str, BehaviorDeclaration] = {}  # By behavior and expected type name
+        self.source_cache_dir = source_cache_dir  # Read CSV sources through Feather sidecars here
+        self.source_cache_max_bytes = source_cache_max_bytes
+        self.uses_source_cache = False
+        self.checkpoint_dir = checkpoint_dir  # Save stage outputs here so failed runs can resume
+        self.uses_checkpoints = False
+        self.instrument = instrument  # Report per-stage metrics to agentscript.instrumentation
     
     def generate(self, program: Program) -> str:
         """Generate complete Python code from the program AST."""
         self.imports.clear()
         self.classes.clear()
+        self.intents.clear()
         self.current_indent = 0
+        self.uses_source_cache = False
+        self.uses_checkpoints = False
+        
+        # Behaviors can be declared after the intents whose sources use their schema
+        self.behaviors.clear()
+        for statement in program.statements:
+            if isinstance(statement, BehaviorDeclaration):
+                if statement.expects:
+                    self.behaviors.setdefault(statement.expects, statement)
+                self.behaviors[statement.name] = statement
         
         # Visit the program to collect imports and generate classes
         program.accept(self)
+        helpers = self._generate_source_cache_helpers() if self.uses_source_cache else []
+        if self.uses_checkpoints:
+            helpers.extend(self._generate_checkpoint_helpers())
         
         # Build the final Python code
         result = []
@@ -43,10 +262,48 @@ class PythonCodeGenerator(ASTVisitor):
             result.extend(sorted(self.imports))
             result.append("")  # Empty line after imports
         
+        if helpers:
+            result.extend(helpers)
+            result.append("")
+        
         # Add generated classes
         result.extend(self.classes)
         
-        return "\n".join(result)
+        code = "\n".join(result)
+        self._map_source_lines(code.split("\n"))
+        return code
+    
+    def _map_source_lines(self, lines: List[str]):
+        """
+        Map every generated statement to the AgentScript line it came from.
+        
+        Source comments mark where an intent, pipeline method or stage
+        starts; the statements below a marker belong to it until the code
+        dedents out of it or the next comment at the same depth. Module-level
+        helpers have no AgentScript line and stay unmapped.
+        """
+        self.line_mappings.clear()
+        if not self.source_filename:
+            return
+        
+        marker = re.compile(rf"# Source: {re.escape(self.source_filename)}:(\d+)$")
+        scopes: List[Tuple[int, int, bool]] = []  # Indent, AgentScript line, opened by class/def
+        for python_line, line in enumerate(lines, start=1):
+            code = line.strip()
+            if not code:
+                continue
+            
+            indent = len(line) - len(line.lstrip())
+            comment_only = code.startswith("#")
+            while scopes and (indent < scopes[-1][0] or
+                              (indent == scopes[-1][0] and (scopes[-1][2] or comment_only))):
+                scopes.pop()
+            
+            match = marker.search(code)
+            if match:
+                scopes.append((indent, int(match.group(1)), not comment_only))
+            if scopes and not comment_only:
+                self.line_mappings[python_line] = scopes[-1][1]
     
     def _indent(self, text: str) -> str:
         """Apply current indentation to text."""
@@ -110,6 +367,9 @@ class PythonCodeGenerator(ASTVisitor):
                     self.imports.add("import csv")
                 if "json" in module:
                     self.imports.add("import json")
+                if "parquet" in module or "arrow" in module:
+                    self.imports.add("import pandas as pd")
+                    self.imports.add("import pyarrow.dataset as ds")
             elif module.startswith("validation."):
                 self.imports.add("import re")
             elif module.startswith("transformation."):
@@ -159,7 +419,7 @@ class PythonCodeGenerator(ASTVisitor):
         class_lines.append(self._indent("# Track validation errors during processing for debugging"))
         class_lines.append(self._indent("self.validation_errors = []"))
         
-        if "re" in str(self.imports):
+        if "import re" in self.imports:
             class_lines.append(self._indent("# Email validation pattern for data quality checks"))
             class_lines.append(self._indent("self.email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}$')"))
         
@@ -167,8 +427,14 @@ class PythonCodeGenerator(ASTVisitor):
         class_lines.append("")
         
         # Generate main method from pipeline
+        method_name = self._to_snake_case(node.name) if node.pipeline else None
+        self.intents.append({
+            'name': node.name,
+            'class': class_name,
+            'method': method_name,
+            'line': node.position.line,
+        })
         if node.pipeline:
-            method_name = self._to_snake_case(node.name)
             method_code = self._generate_pipeline_method(node.pipeline, method_name, node.description, node.position.line)
             class_lines.append(self._indent(method_code))
         
@@ -236,6 +502,24 @@ class PythonCodeGenerator(ASTVisitor):
                     # sink.json("file.json") -> to_json("file.json")
                     filename = node.arguments[0].accept(self) if node.arguments else '""'
                     return f"to_json({filename}, orient='records', indent=2)"
+            
+            elif node.function.attribute in COLUMNAR_FORMATS and isinstance(node.function.object, Identifier):
+                filename = node.arguments[0].accept(self) if node.arguments else '""'
+                if node.function.object.name == "source":
+                    # source.parquet("file.parquet") -> ds.dataset("file.parquet", format='parquet')...
+                    return f"ds.dataset({filename}, format={node.function.attribute!r}).to_table().to_pandas()"
+                elif node.function.object.name == "sink":
+                    # sink.parquet("file.parquet", compression: "zstd") -> to_parquet("file.parquet", ...)
+                    return self._columnar_writer(node.function.attribute, filename, self._sink_options(node))
+        
+            elif (isinstance(node.function.object, Identifier) and node.function.object.name == "text" and
+                  node.function.attribute in PandasExpressionGenerator.TEXT_FUNCTIONS and len(node.arguments) == 1):
+                # text.uppercase(value) -> str(value).upper()
+                value = node.arguments[0].accept(self)
+                method = PandasExpressionGenerator.TEXT_FUNCTIONS[node.function.attribute]
+                if method == "len":
+                    return f"len(str({value}))"
+                return f"str({value}).{method}()"
         
         # Handle regular function calls
         func_code = node.function.accept(self)
@@ -252,10 +536,38 @@ class PythonCodeGenerator(ASTVisitor):
         body = node.body.accept(self)
         return f"lambda {param}: {body}"
     
+    # Python binding strength of each operator, used to parenthesize grouped operands
+    OPERATOR_PRECEDENCE = {
+        "or": 1, "and": 2,
+        "==": 4, "!=": 4, "<": 4, "<=": 4, ">": 4, ">=": 4,
+        "in": 4, "contains": 4, "matches": 4, "between": 4,
+        "+": 5, "-": 5, "*": 6, "/": 6, "%": 6,
+    }
+    
+    def _operand(self, node: Expression, precedence: int) -> str:
+        """Convert an operand, adding parentheses if it binds more loosely than its context."""
+        code = node.accept(self)
+        if isinstance(node, BinaryOperation) and self.OPERATOR_PRECEDENCE.get(node.operator, 0) < precedence:
+            return f"({code})"
+        return code
+    
     def visit_binary_operation(self, node: BinaryOperation) -> str:
         """Convert binary operations."""
-        left = node.left.accept(self)
-        right = node.right.accept(self)
+        precedence = self.OPERATOR_PRECEDENCE.get(node.operator, 0)
+        left = self._operand(node.left, precedence)
+        
+        if node.operator == "between" and isinstance(node.right, ArrayLiteral) and len(node.right.elements) == 2:
+            low, high = [element.accept(self) for element in node.right.elements]
+            return f"{low} <= {left} <= {high}"
+        
+        # Right operands of the same precedence are grouped explicitly: a - (b - c)
+        right = self._operand(node.right, precedence + 1)
+        
+        if node.operator == "contains":
+            return f"{right} in {left}"
+        elif node.operator == "matches":
+            self.imports.add("import re")
+            return f"re.fullmatch({right}, {left}) is not None"
         
         # Map AgentScript operators to Python
         op_map = {
@@ -279,7 +591,7 @@ class PythonCodeGenerator(ASTVisitor):
     
     def visit_unary_operation(self, node: UnaryOperation) -> str:
         """Convert unary operations."""
-        operand = node.operand.accept(self)
+        operand = self._operand(node.operand, max(self.OPERATOR_PRECEDENCE.values()) + 1)
         
         op_map = {
             "not": "not",
@@ -337,6 +649,9 @@ class PythonCodeGenerator(ASTVisitor):
     def _generate_pipeline_method(self, pipeline: PipelineExpression, method_name: str, description: Optional[str], source_line: int = None) -> str:
         """Generate a method from a pipeline expression."""
         lines = []
+        # Only text formats are read in chunks; columnar sources are compact already
+        streaming = (self.streaming and self._io_format(pipeline.stages[0], "source") in TEXT_FORMATS and
+                     all(self._io_format(stage, "sink") in (None,) + TEXT_FORMATS for stage in pipeline.stages[1:]))
         
         # Method signature with source reference
         source_comment = self._add_source_comment(source_line)
@@ -349,11 +664,20 @@ class PythonCodeGenerator(ASTVisitor):
             docstring_lines.append(f"    {description}")
             docstring_lines.append("")
         
-        docstring_lines.extend([
-            f"    This method implements the AgentScript pipeline from {self.source_filename or 'source'}.",
-            "    The pipeline is executed as a series of pandas operations in sequence:",
-            ""
-        ])
+        if streaming:
+            docstring_lines.extend([
+                f"    This method implements the AgentScript pipeline from {self.source_filename or 'source'}.",
+                f"    The input is read in chunks of {self.chunksize} rows and each chunk is passed",
+                "    through the pipeline stages in sequence, so memory use is bounded by the",
+                "    chunk size rather than the size of the input:",
+                ""
+            ])
+        else:
+            docstring_lines.extend([
+                f"    This method implements the AgentScript pipeline from {self.source_filename or 'source'}.",
+                "    The pipeline is executed as a series of pandas operations in sequence:",
+                ""
+            ])
         
         # Document each pipeline stage
         for i, stage in enumerate(pipeline.stages):
@@ -367,6 +691,7 @@ class PythonCodeGenerator(ASTVisitor):
             "        output_file (str, optional): Override default output file",
             "",
             "    Returns:",
+            "        int: Number of rows that reached the end of the pipeline" if streaming else
             "        pd.DataFrame: The processed dataset",
             "",
             "    Raises:",
@@ -377,64 +702,621 @@ class PythonCodeGenerator(ASTVisitor):
         lines.extend(docstring_lines)
         lines.append("")
         
+        # Only read the source columns later stages use, with explicit types
+        columns = required_columns(pipeline)
+        column_types = infer_column_types(pipeline, self._source_schema(pipeline.stages[0]))
+        if columns:
+            column_types = {column: column_type for column, column_type in column_types.items() if column in columns}
+        
+        if streaming:
+            lines.extend(self._generate_streaming_stages(pipeline, columns, column_types, method_name))
+        else:
+            lines.extend(self._generate_stages(pipeline, columns, column_types, method_name))
+        
+        lines.append("")  
+        lines.append("    except Exception as e:")
+        lines.append("        # Log error for debugging while preserving original exception")
+        lines.append("        error_info = {")
+        lines.append("            'error': str(e),")
+        lines.append("            'error_type': type(e).__name__,")
+        lines.append(f"            'method': '{method_name}',")
+        lines.append(f"            'source_file': '{self.source_filename or 'unknown'}'")
+        lines.append("        }")
+        lines.append("        self.validation_errors.append(error_info)")
+        lines.append("        raise  # Re-raise for proper error handling")
+        
+        return "\n".join(lines)
+    
+    def _generate_stages(self, pipeline: PipelineExpression, columns: Optional[List[str]] = None,
+                         column_types: Optional[Dict[str, ColumnType]] = None,
+                         method_name: Optional[str] = None) -> List[str]:
+        """
+        Generate the body of a pipeline method that processes the whole dataset at once.
+        
+        With checkpointing, the output of every stage except sinks is saved
+        and a run resumes after the latest stage a failed earlier run saved.
+        Checkpoints are keyed on a hash chained over the AST of the stage and
+        all stages before it (plus the columns, types and row filter the
+        source is read with), so editing a stage invalidates its checkpoint
+        and every later one, while moving it to other .ags lines or turning
+        instrumentation on or off does not.
+        """
+        lines = []
+        
         # Method body - convert pipeline to sequential operations
         lines.append("    # Execute AgentScript pipeline as sequential pandas operations")
         lines.append("    try:")
         
         # Generate code for each pipeline stage with documentation
+        stages = []
+        row_filter = None
         for i, stage in enumerate(pipeline.stages):
             stage_code = stage.accept(self)
-            stage_source_line = getattr(stage, 'position', None)
-            stage_line_comment = self._add_source_comment(stage_source_line.line if stage_source_line else None)
+            stage_line_comment = self._stage_source_comment(stage)
             
             if i == 0:
                 # First stage - usually data loading
-                lines.append(f"        # Stage {i + 1}: Data input{stage_line_comment}")
-                lines.append(f"        df = {stage_code}")
+                row_filter = self._pushdown_filter(pipeline) if self._io_format(stage, "source") in COLUMNAR_FORMATS else None
+                stage_lines = [
+                    f"        # Stage {i + 1}: Data input{stage_line_comment}",
+                    f"        df = {self._generate_reader(stage, columns, column_types, row_filter=row_filter)}",
+                ]
+                stage_lines.extend(self._generate_post_load(stage, columns, column_types, "        "))
+            elif self._io_format(stage, "sink") is not None:
+                # Handle output - these are terminal operations
+                stage_lines = [
+                    f"        # Stage {i + 1}: Data output{stage_line_comment}",
+                    f"        df.{stage_code}",
+                ]
             else:
-                # Subsequent stages - transformations
-                if "filter" in stage_code or "query" in stage_code:
-                    # Handle filtering
-                    lines.append(f"        # Stage {i + 1}: Data filtering{stage_line_comment}")
-                    if isinstance(stage.operation, FunctionCall) and stage.operation.arguments:
-                        if isinstance(stage.operation.arguments[0], LambdaExpression):
-                            lambda_expr = stage.operation.arguments[0]
-                            condition = lambda_expr.body.accept(self)
-                            # Convert lambda condition to pandas query
-                            condition = condition.replace(f"{lambda_expr.parameter}.", "")
-                            lines.append(f"        df = df.query('{condition}')  # Filter: {lambda_expr.parameter} => {condition}")
-                elif "apply" in stage_code or "transform" in stage_code:
-                    # Handle transformations
-                    lines.append(f"        # Stage {i + 1}: Data transformation{stage_line_comment}")
-                    lines.append(f"        df = df.{stage_code}")
-                elif "to_csv" in stage_code or "to_json" in stage_code:
-                    # Handle output - these are terminal operations
-                    lines.append(f"        # Stage {i + 1}: Data output{stage_line_comment}")
-                    lines.append(f"        df.{stage_code}")
-                else:
-                    # Generic pipeline stage
-                    lines.append(f"        # Stage {i + 1}: Custom operation{stage_line_comment}")
-                    lines.append(f"        df = df.pipe(lambda x: {stage_code})")
+                stage_lines = self._generate_stage(stage, i, "        ")
             
-            if i < len(pipeline.stages) - 1:
-                lines.append("")  # Empty line between stages for readability
+            if self.instrument:
+                stage_lines = self._instrument_stage(stage_lines, stage, i, method_name)
+            stages.append(stage_lines)
+        
+        if self.checkpoint_dir:
+            self.uses_checkpoints = True
+            stage_hashes = {}
+            chain = hashlib.sha256()
+            for i, stage in enumerate(pipeline.stages):
+                chain.update(node_signature(stage).encode('utf-8'))
+                if i == 0:
+                    chain.update(repr((columns, column_types, row_filter)).encode('utf-8'))
+                if self._io_format(stage, "sink") is None:
+                    stage_hashes[i + 1] = chain.hexdigest()[:16]
+            
+            source_file = self._source_file(pipeline.stages[0])
+            lines.append("        # Resume after the latest stage a failed earlier run checkpointed")
+            lines.append(f"        stage_hashes = {stage_hashes!r}")
+            lines.append(f"        checkpoints = StageCheckpoints(CHECKPOINT_DIR, {source_file})")
+            lines.append("        resumed_stage, df = checkpoints.resume(stage_hashes)")
+            lines.append("")
+            
+            for i, stage_lines in enumerate(stages):
+                lines.append(stage_lines[0])
+                lines.append(f"        if resumed_stage < {i + 1}:")
+                lines.extend("    " + line for line in stage_lines[1:])
+                if i + 1 in stage_hashes:
+                    lines.append(f"            checkpoints.save(stage_hashes[{i + 1}], df)")
+                lines.append("")
+            
+            lines.append("        checkpoints.clear(stage_hashes)  # Completed: the next run starts from the source")
+        else:
+            for i, stage_lines in enumerate(stages):
+                lines.extend(stage_lines)
+                if i < len(stages) - 1:
+                    lines.append("")  # Empty line between stages for readability
         
         lines.append("")
         lines.append("        # Pipeline execution completed successfully")
         lines.append("        return df")
-        lines.append("")  
-        lines.append("    except Exception as e:")
-        lines.append("        # Log error for debugging while preserving original exception")
-        lines.append("        error_info = {")
-        lines.append("            'error': str(e),")
-        lines.append("            'error_type': type(e).__name__,")
-        lines.append(f"            'method': '{method_name}',")
-        lines.append(f"            'source_file': '{self.source_filename or 'unknown'}'")
-        lines.append("        }")
-        lines.append("        self.validation_errors.append(error_info)")
-        lines.append("        raise  # Re-raise for proper error handling")
         
-        return "\n".join(lines)
+        return lines
+    
+    def _instrument_stage(self, stage_lines: List[str], stage: PipelineStage, index: int,
+                          method_name: Optional[str], chunk: bool = False) -> List[str]:
+        """
+        Wrap the statements of a stage with timing and a record_stage() call.
+        
+        The first line of stage_lines is the stage's comment; the timer starts
+        after it and the stage is recorded after its last statement.
+        """
+        indent = stage_lines[0][:len(stage_lines[0]) - len(stage_lines[0].lstrip())]
+        rows_in = "0" if index == 0 else "len(df)"
+        return [
+            stage_lines[0],
+            f"{indent}started, rows_in = perf_counter(), {rows_in}",
+            *stage_lines[1:],
+            f"{indent}{self._record_stage(method_name, stage, index, 'started', 'rows_in', chunk)}",
+        ]
+    
+    def _record_stage(self, method_name: Optional[str], stage: PipelineStage, index: int,
+                      started: str, rows_in: str, chunk: bool = False) -> str:
+        """Generate the record_stage() call reporting a stage to the metrics collector."""
+        self.imports.add("from time import perf_counter")
+        self.imports.add("from agentscript.instrumentation import record_stage")
+        
+        if index == 0:
+            kind = "source"
+        elif self._io_format(stage, "sink") is not None:
+            kind = "sink"
+        elif self._is_stage_call(stage, "filter") or self._is_stage_call(stage, "transform"):
+            kind = stage.operation.function.name
+        else:
+            kind = "custom"
+        
+        position = getattr(stage, 'position', None)
+        arguments = [repr(method_name), str(index + 1), repr(kind), started, rows_in, "df",
+                     repr(self.source_filename), str(position.line) if position else "None"]
+        if chunk:
+            arguments.append("chunk_number")
+        return f"record_stage({', '.join(arguments)})"
+    
+    def _source_file(self, stage: PipelineStage) -> str:
+        """Get the code for the file name a source stage reads, or None."""
+        if self._io_format(stage, "source") is not None and stage.operation.arguments:
+            return stage.operation.arguments[0].accept(self)
+        return "None"
+    
+    def _generate_streaming_stages(self, pipeline: PipelineExpression, columns: Optional[List[str]] = None,
+                                   column_types: Optional[Dict[str, ColumnType]] = None,
+                                   method_name: Optional[str] = None) -> List[str]:
+        """
+        Generate the body of a pipeline method that processes its input in chunks.
+        
+        The source is opened with chunksize= and every later stage runs once
+        per chunk. Sinks are opened before the first chunk and appended to:
+        CSV sinks write their header with the first chunk only, JSON sinks
+        are written as JSON lines (one record per line).
+        """
+        lines = []
+        source = pipeline.stages[0]
+        reader = self._generate_reader(source, columns, column_types, self.chunksize)
+        
+        context_managers = [f"{reader} as reader"]
+        for i, stage in enumerate(pipeline.stages[1:], start=1):
+            sink_format = self._io_format(stage, "sink")
+            if sink_format is not None:
+                sink_file = stage.operation.arguments[0].accept(self) if stage.operation.arguments else '""'
+                newline = ", newline=''" if sink_format == "csv" else ""
+                context_managers.append(f"open({sink_file}, 'w', encoding='utf-8'{newline}) as sink_{i + 1}")
+        
+        lines.append("    # Execute AgentScript pipeline one chunk at a time")
+        lines.append("    try:")
+        lines.append("        rows = 0")
+        lines.append("")
+        lines.append(f"        # Stage 1: Data input, streamed in chunks of {self.chunksize} rows{self._stage_source_comment(source)}")
+        lines.append(f"        with {', '.join(context_managers)}:")
+        lines.append("            for chunk_number, df in enumerate(reader):")
+        
+        indent = "                "
+        post_load = self._generate_post_load(source, columns, column_types, indent)
+        if self.instrument:
+            # Time spent reading a chunk is measured from the end of the previous one
+            lines.insert(-2, "        read_started = perf_counter()")
+            post_load.append(f"{indent}{self._record_stage(method_name, source, 0, 'read_started', '0', chunk=True)}")
+        if post_load:
+            lines.extend(post_load)
+            lines.append("")
+        
+        for i, stage in enumerate(pipeline.stages[1:], start=1):
+            stage_line_comment = self._stage_source_comment(stage)
+            sink_format = self._io_format(stage, "sink")
+            
+            if sink_format == "csv":
+                stage_lines = [
+                    f"{indent}# Stage {i + 1}: Data output, appended per chunk{stage_line_comment}",
+                    f"{indent}df.to_csv(sink_{i + 1}, header=chunk_number == 0, index=False)",
+                ]
+            elif sink_format == "json":
+                stage_lines = [
+                    f"{indent}# Stage {i + 1}: Data output as JSON lines, appended per chunk{stage_line_comment}",
+                    f"{indent}if len(df):",
+                    f"{indent}    sink_{i + 1}.write(df.to_json(orient='records', lines=True).rstrip('\\n') + '\\n')",
+                ]
+            else:
+                stage_lines = self._generate_stage(stage, i, indent)
+            
+            if self.instrument:
+                stage_lines = self._instrument_stage(stage_lines, stage, i, method_name, chunk=True)
+            lines.extend(stage_lines)
+            lines.append("")
+        
+        lines.append(f"{indent}rows += len(df)")
+        if self.instrument:
+            lines.append(f"{indent}read_started = perf_counter()")
+        lines.append("")
+        lines.append("        # Pipeline execution completed successfully")
+        lines.append("        return rows")
+        
+        return lines
+    
+    def _generate_reader(self, stage: PipelineStage, columns: Optional[List[str]] = None,
+                         column_types: Optional[Dict[str, ColumnType]] = None, chunksize: Optional[int] = None,
+                         row_filter: Optional[str] = None) -> str:
+        """
+        Generate the expression that loads a source stage.
+        
+        CSV sources read only the given columns via usecols=, and columns with
+        a known type are given it through dtype= so pandas skips inferring it.
+        With a chunksize the reader yields DataFrames of that many rows; JSON
+        sources are then read as JSON lines, the only JSON layout pandas can
+        stream. Parquet and Arrow sources are scanned as pyarrow datasets,
+        which read only the given columns and skip the rows row_filter rejects.
+        With a source cache, whole CSV files are read through read_csv_cached().
+        """
+        source_format = self._io_format(stage, "source")
+        if source_format is None:
+            return stage.accept(self)
+        
+        arguments = [stage.operation.arguments[0].accept(self) if stage.operation.arguments else '""']
+        if source_format in COLUMNAR_FORMATS:
+            scan_arguments = []
+            if columns:
+                scan_arguments.append(f"columns={columns!r}")
+            if row_filter:
+                scan_arguments.append(f"filter={row_filter}")
+            # The file stores column types; only categories need asking for
+            categories = [column for column, column_type in (column_types or {}).items()
+                          if column_type.dtype == 'category']
+            categories_argument = f"categories={categories!r}" if categories else ""
+            return (f"ds.dataset({arguments[0]}, format={source_format!r})"
+                    f".to_table({', '.join(scan_arguments)}).to_pandas({categories_argument})")
+        elif source_format == "csv":
+            if columns:
+                arguments.append(f"usecols={columns!r}")
+            reader = "pd.read_csv"
+            if self.source_cache_dir and not chunksize:
+                reader = "read_csv_cached"
+                self.uses_source_cache = True
+        else:
+            if chunksize:
+                arguments.append("lines=True")
+            reader = "pd.read_json"
+        
+        dtypes = {column: column_type.dtype for column, column_type in (column_types or {}).items() if column_type.dtype}
+        if dtypes:
+            arguments.append(f"dtype={dtypes!r}")
+        
+        if chunksize:
+            arguments.append(f"chunksize={chunksize}")
+        
+        return f"{reader}({', '.join(arguments)})"
+    
+    def _pushdown_filter(self, pipeline: PipelineExpression) -> Optional[str]:
+        """
+        Get the dataset expression for the filters a columnar scan can apply.
+        
+        The conditions of the filters right after the source that have a
+        dataset equivalent are combined with &. The filter stages still run
+        on the loaded frame, so conditions that cannot be pushed down are
+        applied there as before.
+        """
+        conditions = []
+        for stage in pipeline.stages[1:]:
+            predicate = stage_lambda(stage)
+            if stage_call(stage) != "filter" or predicate is None:
+                break
+            
+            pending = [predicate.body]
+            while pending:
+                node = pending.pop(0)
+                if isinstance(node, BinaryOperation) and node.operator == "and":
+                    pending[:0] = [node.left, node.right]
+                    continue
+                
+                generator = ArrowExpressionGenerator(predicate.parameter)
+                try:
+                    condition = generator.generate(node)
+                except VectorizationError:
+                    continue
+                if generator.columns:
+                    conditions.append(condition)
+                    if "pc." in condition:
+                        self.imports.add("import pyarrow.compute as pc")
+        
+        return " & ".join(conditions) or None
+    
+    def _sink_options(self, node: FunctionCall) -> Dict[str, Any]:
+        """Get the literal values of a sink's known keyword options."""
+        options = {}
+        for name in SINK_OPTIONS:
+            value = node.keyword_arguments.get(name)
+            if isinstance(value, Literal):
+                options[name] = value.value
+        return options
+    
+    def _columnar_writer(self, sink_format: str, filename: str, options: Dict[str, Any]) -> str:
+        """
+        Generate the DataFrame method call that writes a Parquet or Arrow sink.
+        
+        Row-group sizing maps to row_group_size= for Parquet and to the
+        record batch size, chunksize=, for Arrow IPC files.
+        """
+        arguments = [filename]
+        if sink_format == "parquet":
+            method = "to_parquet"
+            arguments.append("index=False")
+            size_argument = "row_group_size"
+        else:
+            method = "reset_index(drop=True).to_feather"  # Feather files cannot store a filtered index
+            size_argument = "chunksize"
+        
+        if "compression" in options:
+            arguments.append(f"compression={options['compression']!r}")
+        if "row_group_size" in options:
+            arguments.append(f"{size_argument}={options['row_group_size']!r}")
+        return f"{method}({', '.join(arguments)})"
+    
+    def _generate_post_load(self, stage: PipelineStage, columns: Optional[List[str]],
+                            column_types: Optional[Dict[str, ColumnType]], indent: str) -> List[str]:
+        """
+        Generate the column selection and conversions applied right after loading.
+        
+        pandas parses every field of a JSON record, so unused columns are
+        dropped here instead, before any other stage runs. Integer columns
+        are downcast to the smallest type that holds them (columns typed from
+        filter literals only if pandas read them as integers) and date
+        columns are parsed with their known format.
+        """
+        if self._io_format(stage, "source") not in TEXT_FORMATS:
+            return []  # Columnar sources store their column types
+        
+        lines = []
+        if columns and self._io_format(stage, "source") == "json":
+            lines.append(f"{indent}df = df[{columns!r}]  # Keep only the columns the pipeline uses")
+        
+        for column, column_type in (column_types or {}).items():
+            if column_type.downcast and column_type.inferred:
+                lines.append(f"{indent}if pd.api.types.is_integer_dtype(df[{column!r}]):")
+                lines.append(f"{indent}    df[{column!r}] = pd.to_numeric(df[{column!r}], downcast={column_type.downcast!r})")
+            elif column_type.downcast:
+                lines.append(f"{indent}df[{column!r}] = pd.to_numeric(df[{column!r}], downcast={column_type.downcast!r})")
+            elif column_type.is_date:
+                date_format = f", format={column_type.date_format!r}" if column_type.date_format else ""
+                lines.append(f"{indent}df[{column!r}] = pd.to_datetime(df[{column!r}]{date_format})")
+        
+        return lines
+    
+    def _source_schema(self, stage: PipelineStage) -> Optional[Dict[str, Expression]]:
+        """Get the declared schema for a source like source.csv("users.csv", schema: User)."""
+        if not isinstance(stage.operation, FunctionCall):
+            return None
+        
+        reference = stage.operation.keyword_arguments.get("schema")
+        if isinstance(reference, Identifier) and reference.name in self.behaviors:
+            return self.behaviors[reference.name].schema
+        return None
+    
+    def _generate_stage(self, stage: PipelineStage, index: int, indent: str) -> List[str]:
+        """Generate a filter, transformation or custom stage that replaces df."""
+        stage_code = stage.accept(self)
+        stage_line_comment = self._stage_source_comment(stage)
+        lines = []
+        
+        if self._is_stage_call(stage, "filter"):
+            # Handle filtering
+            lines.append(f"{indent}# Stage {index + 1}: Data filtering{stage_line_comment}")
+            if stage.operation.arguments:
+                lines.append(f"{indent}{self._generate_filter(stage.operation.arguments[0])}")
+        elif self._is_stage_call(stage, "transform") and stage.operation.arguments:
+            # Handle record transformations
+            lines.append(f"{indent}# Stage {index + 1}: Data transformation{stage_line_comment}")
+            lines.extend(indent + line for line in self._generate_transform(stage.operation.arguments[0]))
+        elif "apply" in stage_code or "transform" in stage_code:
+            # Handle transformations
+            lines.append(f"{indent}# Stage {index + 1}: Data transformation{stage_line_comment}")
+            lines.append(f"{indent}df = df.{stage_code}")
+        else:
+            # Generic pipeline stage
+            lines.append(f"{indent}# Stage {index + 1}: Custom operation{stage_line_comment}")
+            lines.append(f"{indent}df = df.pipe(lambda x: {stage_code})")
+        
+        return lines
+    
+    def _stage_source_comment(self, stage: PipelineStage) -> str:
+        """Get the source reference comment for a pipeline stage."""
+        stage_source_line = getattr(stage, 'position', None)
+        return self._add_source_comment(stage_source_line.line if stage_source_line else None)
+    
+    def _io_format(self, stage: PipelineStage, kind: str) -> Optional[str]:
+        """Get the format of a source.csv/sink.parquet style stage, or None for other stages."""
+        operation = stage.operation
+        if (isinstance(operation, FunctionCall) and
+                isinstance(operation.function, AttributeAccess) and
+                isinstance(operation.function.object, Identifier) and
+                operation.function.object.name == kind and
+                operation.function.attribute in TEXT_FORMATS + COLUMNAR_FORMATS):
+            return operation.function.attribute
+        return None
+    
+    def _is_stage_call(self, stage: PipelineStage, name: str) -> bool:
+        """Check whether a pipeline stage is a call like filter(...)."""
+        operation = stage.operation
+        return (isinstance(operation, FunctionCall) and
+                isinstance(operation.function, Identifier) and
+                operation.function.name == name)
+    
+    def _generate_filter(self, predicate: Expression) -> str:
+        """
+        Generate the statement for a filter stage.
+        
+        Lambda predicates are compiled to a vectorized boolean mask over the
+        frame's columns; predicates without a column equivalent (e.g. calls to
+        helper functions) fall back to evaluating the lambda row by row.
+        """
+        if isinstance(predicate, LambdaExpression):
+            description = f"{predicate.parameter} => {predicate.body.accept(self)}"
+            mask_generator = PandasExpressionGenerator(predicate.parameter)
+            try:
+                mask = mask_generator.generate(predicate.body)
+                if mask_generator.columns:
+                    return f"df = df[{mask}]  # Filter: {description}"
+            except VectorizationError:
+                pass
+            return f"df = df[df.apply({predicate.accept(self)}, axis=1)]  # Filter: {description}"
+        
+        return f"df = df[df.apply({predicate.accept(self)}, axis=1)]"
+    
+    def _generate_transform(self, function: Expression) -> List[str]:
+        """
+        Generate the statements for a transform stage.
+        
+        A lambda building a record ({ name: text.uppercase(user.name), ... })
+        becomes a new DataFrame with one vectorized column expression per
+        field. Other transforms are evaluated row by row and the resulting
+        records expanded into columns.
+        """
+        if isinstance(function, LambdaExpression) and isinstance(function.body, ObjectLiteral):
+            column_generator = PandasExpressionGenerator(function.parameter)
+            try:
+                fields = [(name, column_generator.generate(value)) for name, value in function.body.fields.items()]
+            except VectorizationError:
+                pass
+            else:
+                lines = ["df = pd.DataFrame({"]
+                lines.extend(f"    {name!r}: {code}," for name, code in fields)
+                lines.append("}, index=df.index)")
+                return lines
+        
+        return [f"df = df.apply({function.accept(self)}, axis=1, result_type='expand')"]
+    
+    def _generate_source_cache_helpers(self) -> List[str]:
+        """
+        Generate the module-level functions that read CSV sources through a sidecar cache.
+        
+        Parsed sources are stored as uncompressed Feather files, which later
+        runs memory-map instead of parsing the CSV text again.
+        """
+        for module in ("import hashlib", "import json", "import os", "from pathlib import Path",
+                       "import pandas as pd", "import pyarrow.feather as feather"):
+            self.imports.add(module)
+        
+        helpers = f'''# Columnar sidecar cache for CSV sources
+SOURCE_CACHE_DIR = Path({self.source_cache_dir!r}).expanduser()
+SOURCE_CACHE_MAX_BYTES = {self.source_cache_max_bytes}
+
+
+def read_csv_cached(path, **options):
+    """
+    Read a CSV file, reusing the frame parsed by an earlier run if the file is unchanged.
+    
+    Parsed frames are stored as Feather sidecars keyed by the file's path,
+    size and modification time and the reader options (columns and dtype
+    map), and memory-mapped on later reads. Once the cache is larger than
+    SOURCE_CACHE_MAX_BYTES the least recently used sidecars are evicted.
+    """
+    stat = os.stat(path)
+    identity = json.dumps([os.path.abspath(path), stat.st_size, stat.st_mtime_ns, options], sort_keys=True, default=str)
+    sidecar = SOURCE_CACHE_DIR / (hashlib.sha256(identity.encode('utf-8')).hexdigest() + '.feather')
+    
+    try:
+        df = feather.read_table(sidecar, memory_map=True).to_pandas()
+    except (OSError, ValueError):
+        pass  # Not cached yet, or unreadable: parse the CSV
+    else:
+        os.utime(sidecar)  # Mark as recently used
+        return df
+    
+    df = pd.read_csv(path, **options)
+    
+    temp_path = sidecar.with_name(f"{{sidecar.name}}.{{os.getpid()}}.tmp")
+    try:
+        SOURCE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_feather(temp_path, compression='uncompressed')  # Uncompressed files can be memory-mapped
+        os.replace(temp_path, sidecar)
+        evict_source_cache()
+    except (OSError, ValueError):
+        # The cache only saves time; the frame was read either way
+        if temp_path.exists():
+            temp_path.unlink()
+    return df
+
+
+def evict_source_cache():
+    """Delete the least recently used sidecars until the cache fits SOURCE_CACHE_MAX_BYTES."""
+    entries = []
+    for entry in SOURCE_CACHE_DIR.glob('*.feather'):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= SOURCE_CACHE_MAX_BYTES:
+            break
+        try:
+            entry.unlink()
+        except OSError:
+            continue
+        total -= size
+'''
+        return helpers.split("\n")
+    
+    def _generate_checkpoint_helpers(self) -> List[str]:
+        """Generate the module-level class that saves and restores stage outputs."""
+        for module in ("import hashlib", "import os", "from pathlib import Path", "import pandas as pd"):
+            self.imports.add(module)
+        
+        helpers = f'''# Stage checkpoints, kept until the pipeline completes
+CHECKPOINT_DIR = Path({self.checkpoint_dir!r}).expanduser()
+
+
+class StageCheckpoints:
+    """
+    Parquet files holding stage outputs of a pipeline, so a failed run can resume.
+    
+    A checkpoint's name hashes the pipeline's input file (path, size and
+    modification time) with the stage's hash, which covers the stage and
+    all stages before it: checkpoints are only reused for the same input
+    and the same upstream stages.
+    """
+    
+    def __init__(self, directory, source_file=None):
+        self.directory = Path(directory)
+        self.identity = ""
+        if source_file and os.path.exists(source_file):
+            stat = os.stat(source_file)
+            self.identity = f"{{os.path.abspath(source_file)}}:{{stat.st_size}}:{{stat.st_mtime_ns}}"
+    
+    def path(self, stage_hash):
+        """Get the file holding the checkpoint for a stage hash."""
+        key = hashlib.sha256(f"{{self.identity}}:{{stage_hash}}".encode('utf-8')).hexdigest()
+        return self.directory / f"{{key}}.parquet"
+    
+    def resume(self, stage_hashes):
+        """Load the latest readable checkpoint as (stage number, frame), or (0, None)."""
+        for stage in sorted(stage_hashes, reverse=True):
+            try:
+                return stage, pd.read_parquet(self.path(stage_hashes[stage]))
+            except (OSError, ValueError):
+                continue  # Missing or incomplete: try an earlier stage
+        return 0, None
+    
+    def save(self, stage_hash, df):
+        """Save a stage's output; a failure to save never fails the pipeline."""
+        path = self.path(stage_hash)
+        temp_path = path.with_name(f"{{path.name}}.{{os.getpid()}}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(temp_path)
+            os.replace(temp_path, path)  # Readers never see a partial checkpoint
+        except (OSError, ValueError, TypeError):
+            if temp_path.exists():
+                temp_path.unlink()
+    
+    def clear(self, stage_hashes):
+        """Delete the checkpoints of a completed run."""
+        for stage_hash in stage_hashes.values():
+            try:
+                self.path(stage_hash).unlink()
+            except OSError:
+                pass
+'''
+        return helpers.split("\n")
     
     def _describe_pipeline_stage(self, stage: 'PipelineStage', index: int) -> str:
         """Generate human-readable description of a pipeline stage."""
@@ -497,7 +1379,14 @@ class PythonCodeGenerator(ASTVisitor):
         return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
 
 
-def generate_python_code(program: Program, source_filename: str = None) -> str:
+def generate_python_code(program: Program, source_filename: str = None,
+                         streaming: bool = False, chunksize: int = 100_000,
+                         source_cache_dir: Optional[str] = None,
+                         source_cache_max_bytes: int = DEFAULT_SOURCE_CACHE_MAX_BYTES,
+                         checkpoint_dir: Optional[str] = None, instrument: bool = False) -> str:
     """Convenience function to generate Python code from an AST."""
-    generator = PythonCodeGenerator(source_filename)
+    generator = PythonCodeGenerator(source_filename, streaming=streaming, chunksize=chunksize,
+                                    source_cache_dir=source_cache_dir,
+                                    source_cache_max_bytes=source_cache_max_bytes,
+                                    checkpoint_dir=checkpoint_dir, instrument=instrument)
     return generator.generate(program)
@@ -96,6 +96,8 @@ class CompilerConfig:
     output_format: str = "python"
     include_comments: bool = True
     code_style: str = "pep8"
+    source_cache_dir: Optional[str] = None  # Columnar sidecars of CSV sources read by generated code
+    source_cache_max_size_mb: int = 10240
 
 
 @dataclass
@@ -304,9 +306,12 @@ class ConfigManager:
     def _load_toml(self, config_path: Path) -> AgentScriptConfig:
         """Load TOML configuration"""
         try:
-            import tomllib if hasattr(__builtins__, 'tomllib') else __import__('tomli')  # Python 3.11+
+            try:
+                import tomllib  # Python 3.11+
+            except ImportError:
+                import tomli as tomllib
             with open(config_path, 'rb') as f:
-                data = tomllib.load(f) if hasattr(__builtins__, 'tomllib') else __import__('tomli').load(f)
+                data = tomllib.load(f)
             
             config = AgentScriptConfig.from_dict(data)
             config.apply_env_overrides()
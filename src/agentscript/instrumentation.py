@@ -0,0 +1,212 @@
+"""
+AgentScript Pipeline Instrumentation
+
+Runtime support for pipelines compiled with --instrument. Every stage of an
+instrumented pipeline method reports its wall time, input and output row
+counts, the memory of its output frame and the .ags line it came from to
+the active collector:
+
+    from agentscript.instrumentation import JSONLinesCollector, set_collector
+    set_collector(JSONLinesCollector("stages.jsonl"))
+
+Collectors keep metrics in memory (the default), append them to a JSON
+lines file, or maintain a Prometheus text file for the node exporter's
+textfile collector. The collector can also be chosen without code changes
+through AGENTSCRIPT_METRICS, e.g. AGENTSCRIPT_METRICS=jsonl:stages.jsonl or
+AGENTSCRIPT_METRICS=prometheus:/var/lib/node_exporter/agentscript.prom.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+
+@dataclass
+class StageMetrics:
+    """Measurements of one execution of a pipeline stage."""
+    method: str                     # Pipeline method (snake_case intent name)
+    stage: int                      # 1-based position in the pipeline
+    kind: str                       # source, filter, transform, sink or custom
+    seconds: float
+    rows_in: int
+    rows_out: int
+    memory_bytes: int               # Output frame, memory_usage(deep=False)
+    ags_file: Optional[str] = None
+    ags_line: Optional[int] = None
+    chunk: Optional[int] = None     # Chunk number in streaming pipelines
+    timestamp: float = 0.0
+
+
+class MetricsCollector:
+    """Receives stage metrics; subclasses decide where they go."""
+    
+    def record(self, metrics: StageMetrics):
+        """Handle the metrics of one stage execution."""
+        raise NotImplementedError
+    
+    def close(self):
+        """Flush anything buffered."""
+        pass
+
+
+class InMemoryCollector(MetricsCollector):
+    """Keeps all metrics in a list, for tests, notebooks and benchmarks."""
+    
+    def __init__(self):
+        self.metrics: List[StageMetrics] = []
+        self._lock = threading.Lock()
+    
+    def record(self, metrics: StageMetrics):
+        with self._lock:
+            self.metrics.append(metrics)
+    
+    def clear(self):
+        """Forget all recorded metrics."""
+        with self._lock:
+            self.metrics.clear()
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """Get the total time, rows and peak memory per stage, slowest stage first."""
+        totals: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        with self._lock:
+            for metrics in self.metrics:
+                key = (metrics.method, metrics.stage)
+                total = totals.setdefault(key, {
+                    'method': metrics.method, 'stage': metrics.stage, 'kind': metrics.kind,
+                    'ags_line': metrics.ags_line, 'calls': 0, 'seconds': 0.0,
+                    'rows_in': 0, 'rows_out': 0, 'peak_memory_bytes': 0,
+                })
+                total['calls'] += 1
+                total['seconds'] += metrics.seconds
+                total['rows_in'] += metrics.rows_in
+                total['rows_out'] += metrics.rows_out
+                total['peak_memory_bytes'] = max(total['peak_memory_bytes'], metrics.memory_bytes)
+        return sorted(totals.values(), key=lambda total: total['seconds'], reverse=True)
+
+
+class JSONLinesCollector(MetricsCollector):
+    """Appends every stage execution to a file as one JSON object per line."""
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+    
+    def record(self, metrics: StageMetrics):
+        line = json.dumps(asdict(metrics)) + "\n"
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as handle:
+                handle.write(line)
+
+
+class PrometheusCollector(MetricsCollector):
+    """
+    Maintains a Prometheus text exposition file of per-stage totals.
+    
+    Counters accumulate over the life of the process and the file is
+    replaced atomically after every stage, so a scraper never reads a
+    partial file.
+    """
+    
+    METRICS = (
+        ('agentscript_stage_seconds_total', 'counter', 'Wall time spent in the stage'),
+        ('agentscript_stage_runs_total', 'counter', 'Number of stage executions'),
+        ('agentscript_stage_rows_in_total', 'counter', 'Rows passed into the stage'),
+        ('agentscript_stage_rows_out_total', 'counter', 'Rows produced by the stage'),
+        ('agentscript_stage_memory_bytes', 'gauge', 'Memory of the last output frame of the stage'),
+    )
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._totals: Dict[Tuple[str, int, str, str], List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, metrics: StageMetrics):
+        key = (metrics.method, metrics.stage, metrics.kind, str(metrics.ags_line or ''))
+        with self._lock:
+            totals = self._totals.setdefault(key, [0.0, 0, 0, 0, 0])
+            totals[0] += metrics.seconds
+            totals[1] += 1
+            totals[2] += metrics.rows_in
+            totals[3] += metrics.rows_out
+            totals[4] = metrics.memory_bytes
+            self._write()
+    
+    def _write(self):
+        """Replace the exposition file with the current totals."""
+        lines = []
+        for index, (name, metric_type, description) in enumerate(self.METRICS):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for (method, stage, kind, ags_line), totals in self._totals.items():
+                labels = f'method="{method}",stage="{stage}",kind="{kind}",ags_line="{ags_line}"'
+                lines.append(f"{name}{{{labels}}} {totals[index]}")
+        
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            temp_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass  # Metrics must never fail the pipeline
+
+
+_collector: Optional[MetricsCollector] = None
+
+
+def collector_from_env() -> MetricsCollector:
+    """Create the collector AGENTSCRIPT_METRICS names, or an in-memory one."""
+    setting = os.getenv('AGENTSCRIPT_METRICS', '')
+    kind, _, target = setting.partition(':')
+    if kind == 'jsonl' and target:
+        return JSONLinesCollector(Path(target))
+    elif kind == 'prometheus' and target:
+        return PrometheusCollector(Path(target))
+    return InMemoryCollector()
+
+
+def get_collector() -> MetricsCollector:
+    """Get the collector stage metrics are sent to."""
+    global _collector
+    if _collector is None:
+        _collector = collector_from_env()
+    return _collector
+
+
+def set_collector(collector: MetricsCollector):
+    """Send stage metrics to collector from now on."""
+    global _collector
+    _collector = collector
+
+
+def record_stage(method: str, stage: int, kind: str, started: float, rows_in: int, df: Any,
+                 ags_file: Optional[str] = None, ags_line: Optional[int] = None, chunk: Optional[int] = None):
+    """
+    Record a stage that started at perf_counter() time started and produced df.
+    
+    Called by generated code after each stage. Memory is measured with
+    memory_usage(deep=False), which only sums the column buffers and so
+    stays cheap for object columns.
+    """
+    seconds = time.perf_counter() - started
+    try:
+        rows_out = len(df)
+        memory_bytes = int(df.memory_usage(deep=False).sum())
+    except (TypeError, AttributeError):
+        rows_out, memory_bytes = 0, 0  # Not a DataFrame (custom stage)
+    
+    get_collector().record(StageMetrics(
+        method=method,
+        stage=stage,
+        kind=kind,
+        seconds=seconds,
+        rows_in=rows_in,
+        rows_out=rows_out,
+        memory_bytes=memory_bytes,
+        ags_file=ags_file,
+        ags_line=ags_line,
+        chunk=chunk,
+        timestamp=time.time(),
+    ))
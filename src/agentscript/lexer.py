@@ -6,10 +6,13 @@ Supports both symbolic operators and natural language constructs.
 """
 
 import re
+import sys
 from enum import Enum
 from dataclasses import dataclass
 from typing import List, Optional, Iterator
 
+from .ast_nodes import slotted
+
 
 class TokenType(Enum):
     # Literals
@@ -81,6 +84,7 @@ class TokenType(Enum):
     COMMENT = "COMMENT"
 
 
+@slotted
 @dataclass
 class Token:
     """Represents a single token in the source code."""
@@ -104,7 +108,9 @@ class LexerError(Exception):
 class Lexer:
     """Tokenizes AgentScript source code."""
     
-    # Keywords that should be recognized as special tokens
+    # Keywords that should be recognized as special tokens. Pipeline stage
+    # names (source, sink, filter, transform) are lexed as identifiers so
+    # that they parse as ordinary calls.
     KEYWORDS = {
         'intent': TokenType.INTENT,
         'behavior': TokenType.BEHAVIOR,
@@ -115,7 +121,6 @@ class Lexer:
         'expects': TokenType.EXPECTS,
         'returns': TokenType.RETURNS,
         'validate': TokenType.VALIDATE,
-        'transform': TokenType.TRANSFORM,
         'on_error': TokenType.ON_ERROR,
         'and': TokenType.AND,
         'or': TokenType.OR,
@@ -129,9 +134,60 @@ class Lexer:
         'false': TokenType.BOOLEAN,
     }
     
-    def __init__(self, source: str, filename: Optional[str] = None):
+    SINGLE_CHAR_TOKENS = {
+        ':': TokenType.ASSIGN,
+        ',': TokenType.COMMA,
+        '.': TokenType.DOT,
+        '<': TokenType.LT,
+        '>': TokenType.GT,
+        '+': TokenType.PLUS,
+        '-': TokenType.MINUS,
+        '*': TokenType.MULTIPLY,
+        '/': TokenType.DIVIDE,
+        '%': TokenType.MODULO,
+        '(': TokenType.LPAREN,
+        ')': TokenType.RPAREN,
+        '{': TokenType.LBRACE,
+        '}': TokenType.RBRACE,
+        '[': TokenType.LBRACKET,
+        ']': TokenType.RBRACKET,
+        '\n': TokenType.NEWLINE,
+    }
+    
+    # Operators handled by the fast scanner (everything but newline)
+    OPERATOR_TOKENS = {
+        '->': TokenType.ARROW,
+        '=>': TokenType.LAMBDA_ARROW,
+        '==': TokenType.EQ,
+        '!=': TokenType.NE,
+        '<=': TokenType.LE,
+        '>=': TokenType.GE,
+        **{char: token_type for char, token_type in SINGLE_CHAR_TOKENS.items() if char != '\n'},
+    }
+    
+    ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+    
+    # Master pattern for the fast scanner; alternatives are tried in the same
+    # order as the character scanner's _match_* methods.
+    _TOKEN_PATTERN = re.compile(r'''
+        (?P<space>[ \t\r]+)
+      | //(?P<comment>[^\n\0]*)
+      | "(?P<dq_string>(?:[^"\\\n\0]|\\[^\n\0])*)"
+      | '(?P<sq_string>(?:[^'\\\n\0]|\\[^\n\0])*)'
+      | (?P<float>[0-9]+\.[0-9]+)
+      | (?P<integer>[0-9]+)
+      | (?P<operator>->|=>|==|!=|<=|>=|[:,.<>+\-*/%(){}\[\]])
+      | (?P<newline>\n)
+      | (?P<identifier>[A-Za-z_][A-Za-z0-9_]*)
+    ''', re.VERBOSE)
+    
+    _ESCAPE_PATTERN = re.compile(r'\\(.)')
+    
+    def __init__(self, source: str, filename: Optional[str] = None, fast: bool = True):
         self.source = source
-        self.filename = filename
+        # Interned so every token and AST position shares one string per file
+        self.filename = sys.intern(filename) if filename else filename
+        self.fast = fast
         self.position = 0
         self.line = 1
         self.column = 1
@@ -139,34 +195,153 @@ class Lexer:
         
     def tokenize(self) -> List[Token]:
         """Tokenize the entire source code."""
+        self.tokens = list(self.iter_tokens())
+        return self.tokens
+    
+    def iter_tokens(self) -> Iterator[Token]:
+        """
+        Lazily yield tokens, ending with the EOF token.
+        
+        Unlike tokenize(), the token list is never materialized, so callers
+        such as the parser can consume arbitrarily large sources in bounded
+        memory and see lexer errors only once scanning reaches them.
+        """
+        if self.fast:
+            yield from self._scan_tokens()
+            return
+        
         while self.position < len(self.source):
             self._skip_whitespace()
             
             if self.position >= len(self.source):
                 break
+            
+            self.tokens = []
+            self._match_token()
+            yield from self.tokens
+        
+        self.tokens = []
+        yield Token(TokenType.EOF, "", self.line, self.column, self.filename)
+    
+    def _match_token(self) -> bool:
+        """Match a single token at the current position using the character scanner."""
+        if self._match_comment():
+            return True
+        elif self._match_string():
+            return True
+        elif self._match_number():
+            return True
+        elif self._match_arrow():
+            return True
+        elif self._match_comparison_operators():
+            return True
+        elif self._match_single_char_tokens():
+            return True
+        elif self._match_identifier_or_keyword():
+            return True
+        
+        raise LexerError(
+            f"Unexpected character: '{self._current_char()}'",
+            self.line, self.column, self.filename
+        )
+    
+    def _scan_tokens(self) -> Iterator[Token]:
+        """
+        Scan the source with the compiled master pattern.
+        
+        Produces exactly the same tokens (including line/column information) as
+        the character scanner. Anything the pattern does not cover on its own -
+        non-ASCII identifiers and digits, multi-line strings, escapes spanning
+        lines, unterminated strings and invalid characters - is handed to the
+        character scanner for that one token, so both modes stay in lockstep.
+        """
+        source = self.source
+        filename = self.filename
+        length = len(source)
+        match_token = self._TOKEN_PATTERN.match
+        keywords = self.KEYWORDS
+        operators = self.OPERATOR_TOKENS
+        position = self.position
+        line = self.line
+        line_start = position - (self.column - 1)
+        
+        while position < length:
+            match = match_token(source, position)
+            kind = match.lastgroup if match else None
+            
+            if kind is not None:
+                end = match.end()
+                column = position - line_start + 1
                 
-            if self._match_comment():
-                continue
-            elif self._match_string():
-                continue
-            elif self._match_number():
-                continue
-            elif self._match_arrow():
-                continue
-            elif self._match_comparison_operators():
-                continue
-            elif self._match_single_char_tokens():
-                continue
-            elif self._match_identifier_or_keyword():
-                continue
-            else:
-                raise LexerError(
-                    f"Unexpected character: '{self._current_char()}'",
-                    self.line, self.column, self.filename
-                )
+                if kind == 'space':
+                    position = end
+                    continue
+                elif kind == 'newline':
+                    # Tokens are stamped after the newline has been consumed
+                    line += 1
+                    line_start = end
+                    position = end
+                    yield Token(TokenType.NEWLINE, "\n", line, column, filename)
+                    continue
+                elif kind == 'operator':
+                    position = end
+                    text = match.group()
+                    yield Token(operators[text], text, line, column, filename)
+                    continue
+                elif kind == 'comment':
+                    position = end
+                    yield Token(TokenType.COMMENT, match.group('comment').strip(), line, column, filename)
+                    continue
+                elif kind == 'dq_string' or kind == 'sq_string':
+                    position = end
+                    value = match.group(kind)
+                    if '\\' in value:
+                        value = self._ESCAPE_PATTERN.sub(self._unescape, value)
+                    yield Token(TokenType.STRING, value, line, column, filename)
+                    continue
+                elif not self._continues_non_ascii(end):
+                    position = end
+                    text = match.group()
+                    if kind == 'identifier':
+                        token_type = keywords.get(text, TokenType.IDENTIFIER)
+                    elif kind == 'float':
+                        token_type = TokenType.FLOAT
+                    else:
+                        token_type = TokenType.INTEGER
+                    yield Token(token_type, text, line, column, filename)
+                    continue
+            
+            # Fall back to the character scanner for this token
+            self.position = position
+            self.line = line
+            self.column = position - line_start + 1
+            self.tokens = []
+            self._match_token()
+            yield from self.tokens
+            self.tokens = []
+            position = self.position
+            line = self.line
+            line_start = position - (self.column - 1)
         
-        self.tokens.append(Token(TokenType.EOF, "", self.line, self.column, self.filename))
-        return self.tokens
+        self.position = position
+        self.line = line
+        self.column = position - line_start + 1
+        yield Token(TokenType.EOF, "", line, self.column, filename)
+    
+    def _continues_non_ascii(self, end: int) -> bool:
+        """Check whether an identifier or number continues past ASCII at end."""
+        source = self.source
+        if end >= len(source):
+            return False
+        if source[end] >= '\x80':
+            return True
+        return source[end] == '.' and end + 1 < len(source) and source[end + 1] >= '\x80'
+    
+    @staticmethod
+    def _unescape(match) -> str:
+        """Decode a single escape sequence inside a string literal."""
+        char = match.group(1)
+        return Lexer.ESCAPES.get(char, char)
     
     def _current_char(self) -> str:
         """Get the current character."""
@@ -339,30 +514,10 @@ class Lexer:
         char = self._current_char()
         start_column = self.column
         
-        single_char_map = {
-            ':': TokenType.ASSIGN,
-            ',': TokenType.COMMA,
-            '.': TokenType.DOT,
-            '<': TokenType.LT,
-            '>': TokenType.GT,
-            '+': TokenType.PLUS,
-            '-': TokenType.MINUS,
-            '*': TokenType.MULTIPLY,
-            '/': TokenType.DIVIDE,
-            '%': TokenType.MODULO,
-            '(': TokenType.LPAREN,
-            ')': TokenType.RPAREN,
-            '{': TokenType.LBRACE,
-            '}': TokenType.RBRACE,
-            '[': TokenType.LBRACKET,
-            ']': TokenType.RBRACKET,
-            '\n': TokenType.NEWLINE,
-        }
-        
-        if char in single_char_map:
+        if char in self.SINGLE_CHAR_TOKENS:
             self._advance()
             self.tokens.append(Token(
-                single_char_map[char], char,
+                self.SINGLE_CHAR_TOKENS[char], char,
                 self.line, start_column, self.filename
             ))
             return True
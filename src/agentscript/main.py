@@ -6,31 +6,53 @@ Command-line interface for compiling AgentScript to Python.
 """
 
 import argparse
+import os
 import sys
+from contextlib import nullcontext
+from dataclasses import replace
 from pathlib import Path
+from typing import Optional, List, Tuple, Dict, Any, Callable, TYPE_CHECKING
 
-from .parser import parse_agentscript
-from .codegen import generate_python_code
-from .lexer import LexerError
-from .parser import ParseError
-from .error_reporter import create_error_report
+from . import __version__
 
+# Compiler modules are imported by the subcommands that need them, so that
+# commands like 'version' and 'plugins' start without loading the compiler.
+if TYPE_CHECKING:
+    from .ast_nodes import Program
+    from .cache import CompilationCache
+    from .config import CompilerConfig
+    from .codegen import PythonCodeGenerator
+    from .profiler import CompileProfile
 
-def compile_file(input_file: Path, output_path: Path = None, target: str = 'pandas', **options):
-    """Compile a single AgentScript file using the specified plugin."""
+
+def compile_file(input_file: Path, output_path: Path = None, target: str = 'pandas',
+                 cache: Optional['CompilationCache'] = None,
+                 parse_source: Optional[Callable[[str, str], 'Program']] = None,
+                 profile: Optional['CompileProfile'] = None, **options):
+    """
+    Compile a single AgentScript file using the specified plugin.
+    
+    With a profile, the cost of every compilation phase is recorded in it.
+    """
+    from .parser import parse_agentscript, ParseError
+    from .optimizer import optimize_program, DEFAULT_OPT_LEVEL
+    from .sourcemap import SourceMap, source_map_path
+    from .lexer import LexerError
+    from .error_reporter import create_error_report
+    
+    parse_source = parse_source or parse_agentscript
+    if profile is not None:
+        parse_source = profile.parse
+    phase = profile.phase if profile is not None else lambda name: nullcontext()
+    opt_level = options.get('opt_level', DEFAULT_OPT_LEVEL)
+    statistics = _statistics_lookup(input_file, cache) if opt_level >= 2 else None
+    
     try:
         # Read input file
-        source_code = input_file.read_text(encoding='utf-8')
-        
-        # Parse AgentScript to AST
-        print(f"Parsing {input_file}...")
-        ast = parse_agentscript(source_code, str(input_file))
+        with phase('read'):
+            source_code = input_file.read_text(encoding='utf-8')
         
         if target == 'pandas':
-            # Original pandas compilation
-            print("Generating Python code...")
-            python_code = generate_python_code(ast, str(input_file))
-            
             # Determine output file
             if output_path is None:
                 output_file = input_file.with_suffix('.py')
@@ -39,9 +61,47 @@ def compile_file(input_file: Path, output_path: Path = None, target: str = 'pand
             else:
                 output_file = output_path
             
-            # Write output file
-            output_file.write_text(python_code, encoding='utf-8')
-            print(f"✓ Compiled to {output_file}")
+            module_name = input_file.with_suffix('.py').name
+            map_name = source_map_path(Path(module_name)).name
+            cache_key = None
+            cached_files = None
+            if cache is not None:
+                cache_key = cache.make_key(source_code, str(input_file), target, options, __version__,
+                                           inputs=_statistics_inputs(input_file, source_code) if statistics else None)
+                cached_files = cache.get(cache_key)
+            
+            if cached_files is not None and module_name in cached_files:
+                python_code = cached_files[module_name]
+                source_map = None
+                if map_name in cached_files:
+                    # The entry may have been stored by a compile to another output file
+                    source_map = replace(SourceMap.from_json(cached_files[map_name]), generated=output_file.name)
+            else:
+                # Parse AgentScript to AST
+                print(f"Parsing {input_file}...")
+                ast = parse_source(source_code, str(input_file))
+                with phase('optimize'):
+                    ast = optimize_program(ast, opt_level, statistics)
+                
+                # Original pandas compilation
+                print("Generating Python code...")
+                with phase('generate'):
+                    generator = _pandas_generator(input_file, options)
+                    python_code = generator.generate(ast)
+                    source_map = SourceMap.from_generator(generator, output_file.name)
+                
+                if cache_key:
+                    cache.put(cache_key, {module_name: python_code, map_name: source_map.to_json()})
+            
+            # Write output file, with the source map mapping it back to the .ags lines
+            with phase('write'):
+                output_file.write_text(python_code, encoding='utf-8')
+                if source_map is not None:
+                    source_map.write(source_map_path(output_file))
+            if profile is not None:
+                profile.generated_bytes = len(python_code.encode('utf-8'))
+            cached_note = " (cached)" if cached_files is not None else ""
+            print(f"✓ Compiled to {output_file}{cached_note}")
             
         else:
             # Use plugin system
@@ -73,20 +133,46 @@ def compile_file(input_file: Path, output_path: Path = None, target: str = 'pand
                     print(f"Error: {error}", file=sys.stderr)
                 return 1
             
-            # Generate code files
-            print(f"Generating {target} application...")
-            generated_files = plugin.generate_code(ast, context)
+            cache_key = None
+            generated_files = None
+            if cache is not None:
+                plugin_module = sys.modules[type(plugin).__module__]
+                cache_key = cache.make_key(source_code, str(input_file), target, options, plugin.config.version,
+                                           module_files=[getattr(plugin_module, '__file__', None) or ''],
+                                           inputs=_statistics_inputs(input_file, source_code) if statistics else None)
+                generated_files = cache.get(cache_key)
             
-            if not generated_files:
-                print("No files generated", file=sys.stderr)
-                return 1
+            cached_note = ""
+            if generated_files is not None:
+                cached_note = " (cached)"
+            else:
+                # Parse AgentScript to AST
+                print(f"Parsing {input_file}...")
+                ast = parse_source(source_code, str(input_file))
+                with phase('optimize'):
+                    ast = optimize_program(ast, opt_level, statistics)
+                
+                # Generate code files
+                print(f"Generating {target} application...")
+                with phase('generate'):
+                    generated_files = plugin.generate_code(ast, context)
+                
+                if not generated_files:
+                    print("No files generated", file=sys.stderr)
+                    return 1
+                
+                if cache_key:
+                    cache.put(cache_key, generated_files)
             
             # Write generated files
-            for file_path, content in generated_files.items():
-                full_path = output_dir / file_path
-                full_path.parent.mkdir(parents=True, exist_ok=True)
-                full_path.write_text(content, encoding='utf-8')
-                print(f"✓ Generated {full_path}")
+            with phase('write'):
+                for file_path, content in generated_files.items():
+                    full_path = output_dir / file_path
+                    full_path.parent.mkdir(parents=True, exist_ok=True)
+                    full_path.write_text(content, encoding='utf-8')
+                    print(f"✓ Generated {full_path}{cached_note}")
+            if profile is not None:
+                profile.generated_bytes = sum(len(content.encode('utf-8')) for content in generated_files.values())
             
             # Show next steps
             dependencies = plugin.get_dependencies(context)
@@ -110,6 +196,235 @@ def compile_file(input_file: Path, output_path: Path = None, target: str = 'pand
     return 0
 
 
+def profile_compilation(compile_jobs: List[Tuple[Path, Optional[Path]]], target: str,
+                        report_format: str, options: Dict[str, Any]) -> int:
+    """
+    Compile files one at a time, measuring every phase, and print the profiles.
+    
+    For JSON reports the compiler's progress messages go to stderr, so that
+    stdout only holds the JSON document.
+    """
+    import tracemalloc
+    from contextlib import redirect_stdout
+    from .profiler import CompileProfile
+    
+    profiles = []
+    exit_code = 0
+    tracemalloc.start()
+    try:
+        for file_path, output_path in compile_jobs:
+            profile = CompileProfile(source=str(file_path), target=target)
+            with redirect_stdout(sys.stderr) if report_format == 'json' else nullcontext():
+                result = compile_file(file_path, output_path, target=target, profile=profile, **options)
+            if result != 0:
+                exit_code = result
+            profiles.append(profile)
+    finally:
+        tracemalloc.stop()
+    
+    if report_format == 'json':
+        import json
+        print(json.dumps([profile.to_dict() for profile in profiles], indent=2))
+    else:
+        for profile in profiles:
+            print()
+            print(profile.format())
+    
+    return exit_code
+
+
+def _pandas_generator(input_file: Path, options: Dict[str, Any]) -> 'PythonCodeGenerator':
+    """Create the pandas code generator for the compile options."""
+    from .codegen import PythonCodeGenerator, DEFAULT_SOURCE_CACHE_MAX_BYTES
+    
+    return PythonCodeGenerator(
+        str(input_file),
+        streaming=options.get('streaming', False),
+        chunksize=options.get('chunksize', 100_000),
+        source_cache_dir=options.get('source_cache_dir'),
+        source_cache_max_bytes=options.get('source_cache_max_bytes', DEFAULT_SOURCE_CACHE_MAX_BYTES),
+        checkpoint_dir=options.get('checkpoint_dir'),
+        instrument=options.get('instrument', False)
+    )
+
+
+def profile_file(input_file: Path, intents: Optional[List[str]] = None, limit: Optional[int] = 20,
+                 json_output: bool = False, pstats_file: Optional[Path] = None, **options):
+    """Compile an AgentScript file to pandas code, run its pipelines and report time per .ags line."""
+    from .parser import parse_agentscript, ParseError
+    from .optimizer import optimize_program, DEFAULT_OPT_LEVEL
+    from .sourcemap import SourceMap
+    from .profiler import profile_module
+    from .lexer import LexerError
+    from .error_reporter import create_error_report
+    
+    opt_level = options.get('opt_level', DEFAULT_OPT_LEVEL)
+    statistics = _statistics_lookup(input_file, None) if opt_level >= 2 else None
+    
+    try:
+        source_code = input_file.read_text(encoding='utf-8')
+        ast = parse_agentscript(source_code, str(input_file))
+        ast = optimize_program(ast, opt_level, statistics)
+        
+        generator = _pandas_generator(input_file, options)
+        python_code = generator.generate(ast)
+        source_map = SourceMap.from_generator(generator, str(input_file.with_suffix('.py')))
+        
+        report, stats = profile_module(python_code, source_map, source_code, intents)
+        
+    except LexerError as e:
+        print(create_error_report(e, source_code, str(input_file)), file=sys.stderr)
+        return 1
+    except ParseError as e:
+        print(create_error_report(e, source_code, str(input_file)), file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    if pstats_file:
+        stats.dump_stats(str(pstats_file))
+    
+    if json_output:
+        import json
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(report.format(limit))
+        if pstats_file:
+            print(f"\nFull cProfile statistics written to {pstats_file}")
+    
+    return 1 if any(intent['error'] for intent in report.intents) else 0
+
+
+def _compiler_config() -> 'CompilerConfig':
+    """Get the compiler settings of the project configuration in the working directory."""
+    from .config import CompilerConfig, load_config
+    
+    try:
+        return load_config().compiler
+    except (OSError, ImportError, ValueError, TypeError) as e:
+        print(f"Warning: ignoring project configuration: {e}", file=sys.stderr)
+        return CompilerConfig()
+
+
+def _statistics_lookup(input_file: Path, cache: Optional['CompilationCache']) -> Callable:
+    """
+    Get a function returning statistics for the source files a program reads.
+    
+    Source paths are resolved against the working directory first, then
+    against the directory of the AgentScript file.
+    """
+    from .stats import StatisticsCache
+    
+    statistics_cache = StatisticsCache(cache.cache_dir / 'stats' if cache is not None else None)
+    
+    def lookup(source_path: str):
+        path = Path(source_path)
+        if not path.exists():
+            path = input_file.parent / source_path
+        return statistics_cache.get(path)
+    
+    return lookup
+
+
+def _statistics_inputs(input_file: Path, source_code: str) -> List[Any]:
+    """
+    Identify the source files whose statistics an -O 2 compilation may use.
+    
+    Each file read by a source.* stage is identified by its resolved path,
+    size and modification time, the same identity the statistics cache
+    uses, so a changed source file also changes the compilation cache key.
+    """
+    from .lexer import Lexer, LexerError, TokenType
+    
+    try:
+        tokens = Lexer(source_code, str(input_file)).tokenize()
+    except LexerError:
+        return []
+    
+    inputs = []
+    for index in range(len(tokens) - 4):
+        first, dot, _, paren, path_token = tokens[index:index + 5]
+        if (first.value == 'source' and dot.type == TokenType.DOT and
+                paren.type == TokenType.LPAREN and path_token.type == TokenType.STRING):
+            path = Path(path_token.value)
+            if not path.exists():
+                path = input_file.parent / path_token.value
+            try:
+                stat = path.stat()
+                inputs.append([str(path.resolve()), stat.st_size, stat.st_mtime_ns])
+            except OSError:
+                inputs.append([str(path), None, None])
+    return inputs
+
+
+def _init_compile_worker(target: str):
+    """Warm up per-process state once, so each file only pays for its own compilation."""
+    if target != 'pandas':
+        from .plugins import get_registry
+        get_registry()
+
+
+def _compile_captured(job: Tuple[Path, Optional[Path], str, Optional['CompilationCache'], Dict[str, Any]]) -> Tuple[int, str, str]:
+    """Compile one file in a worker process, capturing its console output."""
+    import io
+    from contextlib import redirect_stdout, redirect_stderr
+    
+    input_file, output_path, target, cache, options = job
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        result = compile_file(input_file, output_path, target=target, cache=cache, **options)
+    
+    return result, stdout.getvalue(), stderr.getvalue()
+
+
+def compile_files_parallel(
+    compile_jobs: List[Tuple[Path, Optional[Path]]],
+    target: str,
+    cache: Optional['CompilationCache'],
+    options: Dict[str, Any],
+    jobs: int
+) -> int:
+    """
+    Compile several files across a process pool.
+    
+    Each worker initializes the plugin registry once. Console output of every
+    file (including error reports) is replayed in input order, so the log is
+    identical to a serial run regardless of which worker finishes first.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    
+    work = [(file_path, output_path, target, cache, options) for file_path, output_path in compile_jobs]
+    failed = []
+    exit_code = 0
+    
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(work)),
+            initializer=_init_compile_worker,
+            initargs=(target,)
+        ) as executor:
+            for (file_path, _), (result, out, err) in zip(compile_jobs, executor.map(_compile_captured, work)):
+                sys.stdout.write(out)
+                sys.stderr.write(err)
+                if result != 0:
+                    failed.append(file_path)
+                    exit_code = result
+    except BrokenProcessPool as e:
+        print(f"Error: Compilation worker terminated unexpectedly: {e}", file=sys.stderr)
+        return 1
+    
+    if failed:
+        print(f"\n✗ {len(failed)} of {len(compile_jobs)} files failed to compile:", file=sys.stderr)
+        for file_path in failed:
+            print(f"   - {file_path}", file=sys.stderr)
+    
+    return exit_code
+
+
 def list_plugins(verbose: bool = False):
     """List available plugins and their capabilities."""
     try:
@@ -129,7 +444,7 @@ def list_plugins(verbose: bool = False):
             plugin_info = registry.get_plugin_info(name)
             if not plugin_info:
                 continue
-                
+            
             print(f"\n📦 {plugin_info['name']}")
             print(f"   {plugin_info['description']}")
             print(f"   Version: {plugin_info['version']}")
@@ -157,7 +472,7 @@ def list_plugins(verbose: bool = False):
         
         print(f"\n💡 Usage: agentscript compile <file.ags> --target <plugin>")
         return 0
-        
+    
     except ImportError as e:
         print(f"Error: Plugin system not available: {e}", file=sys.stderr)
         return 1
@@ -183,7 +498,7 @@ def handle_ticket_commands(args):
             if not args.input_file.exists():
                 print(f"Error: File not found: {args.input_file}", file=sys.stderr)
                 return 1
-                
+            
             result = create_tickets_from_agentscript_cli(
                 str(args.input_file),
                 args.epic_title,
@@ -206,7 +521,7 @@ def handle_ticket_commands(args):
             print(f"   - Transformations: {len(analysis['transformations'])}")
             
             return 0
-            
+        
         elif args.tickets_command == 'generate':
             output_path = generate_agentscript_from_ticket_cli(
                 args.ticket_id,
@@ -216,11 +531,11 @@ def handle_ticket_commands(args):
             
             print(f"✅ Generated AgentScript file: {output_path}")
             return 0
-            
+        
         else:
             print("Available ticket commands: create, generate")
             return 1
-            
+    
     except TicketIntegrationError as e:
         print(f"❌ Ticket integration error: {e}", file=sys.stderr)
         return 1
@@ -244,6 +559,12 @@ Examples:
   agentscript compile data_processor.ags
   agentscript compile input.ags -o output.py
   
+  # Compile to multi-threaded Polars lazy queries
+  agentscript compile pipeline.ags --target polars
+  
+  # Compile to SQL run by embedded DuckDB
+  agentscript compile pipeline.ags --target duckdb
+  
   # Generate web applications
   agentscript compile pipeline.ags --target django --app-name "DataApp" --database postgresql
   agentscript compile pipeline.ags --target fastapi --with-auth --with-cors
@@ -252,6 +573,9 @@ Examples:
   # Generate TUI applications
   agentscript compile pipeline.ags --target tui --app-name "Data Dashboard"
   
+  # Run the pipelines and report where the time goes per .ags line
+  agentscript profile pipeline.ags
+  
   # List available plugins
   agentscript plugins
   agentscript plugins --verbose
@@ -271,10 +595,47 @@ Examples:
                                help='AgentScript files to compile')
     compile_parser.add_argument('-o', '--output', type=Path,
                                help='Output directory or file')
-    compile_parser.add_argument('--target', choices=['pandas', 'django', 'fastapi', 'flask', 'tui'],
+    compile_parser.add_argument('--target', choices=['pandas', 'polars', 'duckdb', 'django', 'fastapi', 'flask', 'tui'],
                                default='pandas', help='Target framework for code generation')
     compile_parser.add_argument('--check', action='store_true',
                                help='Check syntax without generating output')
+    compile_parser.add_argument('-j', '--jobs', type=int, default=1,
+                               help='Number of files to compile in parallel (0 = one per CPU)')
+    compile_parser.add_argument('--watch', action='store_true',
+                               help='Recompile files whenever they change')
+    compile_parser.add_argument('--poll-interval', type=float, default=0.5,
+                               help='Seconds between change checks in watch mode')
+    compile_parser.add_argument('--no-cache', action='store_true',
+                               help='Always recompile, bypassing the compilation cache')
+    compile_parser.add_argument('--cache-dir', type=Path,
+                               help='Compilation cache directory (default: ~/.cache/agentscript)')
+    compile_parser.add_argument('--profile', nargs='?', const='text', choices=['text', 'json'],
+                               help='Report the time and memory (tracemalloc) of each compilation phase '
+                                    'per file, as text (default) or JSON; files are compiled one at a '
+                                    'time, without the compilation cache')
+    
+    compile_parser.add_argument('-O', '--opt-level', type=int, choices=[0, 1, 2], default=1,
+                               help='Pipeline optimization level: 0 off, 1 fold constants and fuse filters '
+                                    '(default), 2 also move filters ahead of transforms and order '
+                                    'filter conditions using statistics of the source files')
+    
+    # Pandas code generation options
+    compile_parser.add_argument('--streaming', action='store_true',
+                               help='Generate pipelines that process their input in chunks')
+    compile_parser.add_argument('--chunksize', type=int, default=100_000,
+                               help='Rows per chunk for --streaming (default: 100000)')
+    compile_parser.add_argument('--source-cache', action='store_true',
+                               help='Generate pipelines that keep parsed CSV sources as Feather sidecars '
+                                    '(directory: compiler.source_cache_dir in agentscript.yaml, '
+                                    'default ~/.cache/agentscript/sources)')
+    compile_parser.add_argument('--checkpoint', nargs='?', const='.agentscript-checkpoints', metavar='DIR',
+                               help='Generate pipelines that save each stage\'s output to DIR (default: '
+                                    '.agentscript-checkpoints) and resume after the last saved stage '
+                                    'when an earlier run failed; not used with --streaming')
+    compile_parser.add_argument('--instrument', action='store_true',
+                               help='Generate pipelines that report the time, row counts and memory of '
+                                    'every stage to agentscript.instrumentation (collector chosen with '
+                                    'AGENTSCRIPT_METRICS=jsonl:FILE or prometheus:FILE)')
     
     # Framework-specific options
     compile_parser.add_argument('--app-name', help='Application name for web frameworks')
@@ -289,6 +650,25 @@ Examples:
     compile_parser.add_argument('--async-mode', action='store_true',
                                help='Use async/await patterns where supported')
     
+    # Profile command
+    profile_parser = subparsers.add_parser('profile', help='Run compiled pipelines under cProfile and report '
+                                                          'time per AgentScript line and intent')
+    profile_parser.add_argument('file', type=Path, help='AgentScript file to profile')
+    profile_parser.add_argument('--intent', action='append', dest='intents', metavar='NAME',
+                               help='Only run this intent (repeatable; default: all intents)')
+    profile_parser.add_argument('-O', '--opt-level', type=int, choices=[0, 1, 2], default=1,
+                               help='Pipeline optimization level, as for compile')
+    profile_parser.add_argument('--streaming', action='store_true',
+                               help='Profile the chunked pipelines --streaming generates')
+    profile_parser.add_argument('--chunksize', type=int, default=100_000,
+                               help='Rows per chunk for --streaming (default: 100000)')
+    profile_parser.add_argument('--limit', type=int, default=20,
+                               help='Number of AgentScript lines to show (default: 20)')
+    profile_parser.add_argument('--json', action='store_true',
+                               help='Print the report as JSON')
+    profile_parser.add_argument('--pstats', type=Path, metavar='FILE',
+                               help='Also save the full cProfile statistics to FILE')
+    
     # Version command
     version_parser = subparsers.add_parser('version', help='Show version information')
     
@@ -322,12 +702,12 @@ Examples:
     args = parser.parse_args()
     
     if args.command == 'version':
-        print("AgentScript Compiler v0.1.0")
+        print(f"AgentScript Compiler v{__version__}")
         return 0
     
     elif args.command == 'compile':
         # Prepare compilation options
-        compile_options = {}
+        compile_options = {'opt_level': args.opt_level}
         if hasattr(args, 'app_name') and args.app_name:
             compile_options['app_name'] = args.app_name
         if hasattr(args, 'database') and args.database:
@@ -341,8 +721,31 @@ Examples:
             compile_options['cors'] = True
         if hasattr(args, 'async_mode') and args.async_mode:
             compile_options['async_mode'] = True
+        if args.streaming:
+            if args.chunksize < 1:
+                print("Error: --chunksize must be at least 1", file=sys.stderr)
+                return 1
+            compile_options['streaming'] = True
+            compile_options['chunksize'] = args.chunksize
+        if args.checkpoint:
+            compile_options['checkpoint_dir'] = args.checkpoint
+        if args.instrument:
+            compile_options['instrument'] = True
+        if args.source_cache:
+            # The project configuration is only read when an option needs it,
+            # keeping agentscript.config off the start-up path of other compiles
+            compiler_config = _compiler_config()
+            from .cache import default_cache_dir
+            compile_options['source_cache_dir'] = compiler_config.source_cache_dir or str(default_cache_dir() / 'sources')
+            compile_options['source_cache_max_bytes'] = compiler_config.source_cache_max_size_mb * 1024 ** 2
+        
+        cache = None
+        if not args.no_cache and not args.profile:
+            from .cache import CompilationCache
+            cache = CompilationCache(args.cache_dir)
         
         exit_code = 0
+        compile_jobs = []
         for file_path in args.files:
             if not file_path.exists():
                 print(f"Error: File not found: {file_path}", file=sys.stderr)
@@ -357,17 +760,62 @@ Examples:
             if len(args.files) > 1 and args.target != 'pandas':
                 output_path = args.output / file_path.stem if args.output else None
             
-            result = compile_file(
-                file_path, 
-                output_path, 
-                target=args.target,
-                **compile_options
+            compile_jobs.append((file_path, output_path))
+        
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        if args.watch:
+            from .watch import watch_files
+            
+            output_paths = dict(compile_jobs)
+            exit_code = watch_files(
+                [file_path for file_path, _ in compile_jobs],
+                lambda file_path, parse_source: compile_file(
+                    file_path,
+                    output_paths[file_path],
+                    target=args.target,
+                    cache=cache,
+                    parse_source=parse_source,
+                    **compile_options
+                ),
+                interval=args.poll_interval
             )
+        elif args.profile:
+            exit_code = profile_compilation(compile_jobs, args.target, args.profile, compile_options)
+        elif jobs > 1 and len(compile_jobs) > 1:
+            result = compile_files_parallel(compile_jobs, args.target, cache, compile_options, jobs)
             if result != 0:
                 exit_code = result
+        else:
+            for file_path, output_path in compile_jobs:
+                result = compile_file(
+                    file_path, 
+                    output_path, 
+                    target=args.target,
+                    cache=cache,
+                    **compile_options
+                )
+                if result != 0:
+                    exit_code = result
+        
+        if cache is not None:
+            try:
+                cache.evict()
+            except OSError as e:
+                print(f"Warning: Could not prune compilation cache: {e}", file=sys.stderr)
         
         return exit_code
     
+    elif args.command == 'profile':
+        if not args.file.exists():
+            print(f"Error: File not found: {args.file}", file=sys.stderr)
+            return 1
+        
+        profile_options = {'opt_level': args.opt_level}
+        if args.streaming:
+            profile_options['streaming'] = True
+            profile_options['chunksize'] = max(1, args.chunksize)
+        return profile_file(args.file, args.intents, args.limit, args.json, args.pstats, **profile_options)
+    
     elif args.command == 'plugins':
         return list_plugins(args.verbose)
     
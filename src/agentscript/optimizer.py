@@ -0,0 +1,593 @@
+"""
+AgentScript Pipeline Optimizer
+
+Rewrites pipelines between parsing and code generation so that every target
+generates code for a cheaper, equivalent pipeline:
+
+- literal sub-expressions are constant-folded
+- filters that always pass are dropped
+- filters are moved ahead of transforms when they only read fields the
+  transform copies unchanged, so later stages see fewer rows
+- consecutive filters are fused into a single predicate, so the data is
+  scanned once
+- the conditions of a filter are ordered so that the most selective,
+  cheapest ones run first, using statistics of the source file when they
+  are available; expensive conditions are split into a later filter so
+  they only run over the rows that are left
+
+The optimizer never modifies the AST it is given (watch mode reuses parsed
+statements between builds); rewritten nodes are copies.
+"""
+
+from dataclasses import fields, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .ast_nodes import *
+from .analysis import column_name, referenced_columns, stage_call, stage_lambda
+
+if TYPE_CHECKING:
+    from .stats import SourceStatistics
+
+
+# Optimization levels accepted by --opt-level
+OPT_LEVELS = (0, 1, 2)
+DEFAULT_OPT_LEVEL = 1
+
+# Relative cost of evaluating a condition, by operator
+PREDICATE_COSTS = {
+    "==": 1, "!=": 1, "<": 1, "<=": 1, ">": 1, ">=": 1,
+    "in": 2, "between": 2, "contains": 10, "matches": 20,
+}
+TEXT_FUNCTION_COST = 5   # text.uppercase(...) and friends
+OPAQUE_COST = 50         # Calls the compiler cannot see into run row by row
+
+# Fraction of rows a condition is assumed to keep when there are no statistics
+DEFAULT_SELECTIVITY = {
+    "==": 0.1, "!=": 0.9, "<": 1 / 3, "<=": 1 / 3, ">": 1 / 3, ">=": 1 / 3,
+    "in": 0.2, "between": 0.25, "contains": 0.5, "matches": 0.5,
+}
+
+# Conditions at least this expensive go into a separate, later filter once the
+# conditions before them keep at most SPLIT_SELECTIVITY of the rows
+SPLIT_COST = 10
+SPLIT_SELECTIVITY = 0.5
+
+# Operator to use when the operands of a comparison are swapped
+FLIPPED_OPERATORS = {"==": "==", "!=": "!=", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+
+class PipelineOptimizer:
+    """
+    Optimizes the pipelines of a program.
+    
+    Level 0 leaves the program untouched. Level 1 folds constants, drops
+    no-op stages and fuses consecutive filters. Level 2 also moves filters
+    ahead of transforms and orders filter conditions by estimated
+    selectivity and cost, which reorders stages relative to the source.
+    
+    statistics, if given, maps a source path (as written in the pipeline)
+    to statistics of that file, or None if there are none.
+    """
+    
+    def __init__(
+        self,
+        level: int = DEFAULT_OPT_LEVEL,
+        statistics: Optional[Callable[[str], Optional['SourceStatistics']]] = None
+    ):
+        if level not in OPT_LEVELS:
+            raise ValueError(f"Unknown optimization level: {level}")
+        self.level = level
+        self.statistics = statistics
+        self.rewrites = 0  # Number of rewrites applied, for reporting
+    
+    def optimize(self, program: Program) -> Program:
+        """Get an optimized copy of a program."""
+        if self.level == 0:
+            return program
+        
+        statements = []
+        for statement in program.statements:
+            if isinstance(statement, IntentDeclaration) and statement.pipeline is not None:
+                statement = replace(statement, pipeline=self.optimize_pipeline(statement.pipeline))
+            statements.append(statement)
+        
+        return replace(program, statements=statements)
+    
+    def optimize_pipeline(self, pipeline: PipelineExpression) -> PipelineExpression:
+        """Get an optimized copy of a pipeline."""
+        if not pipeline.stages:
+            return pipeline
+        
+        # The source stage is never moved or dropped
+        stages = [pipeline.stages[0]] + [self._fold_stage(stage) for stage in pipeline.stages[1:]]
+        stages = [stages[0]] + [stage for stage in stages[1:] if not self._is_no_op(stage)]
+        
+        if self.level >= 2:
+            stages = self._push_down_filters(stages)
+        
+        stages = self._fuse_filters(stages)
+        
+        if self.level >= 2:
+            stages = self._order_conditions(stages, self._source_statistics(stages[0]))
+        
+        return replace(pipeline, stages=stages)
+    
+    # Constant folding
+    
+    def fold(self, node: Expression) -> Expression:
+        """Constant-fold an expression."""
+        if isinstance(node, BinaryOperation):
+            return self._fold_binary(replace(node, left=self.fold(node.left), right=self.fold(node.right)))
+        elif isinstance(node, UnaryOperation):
+            return self._fold_unary(replace(node, operand=self.fold(node.operand)))
+        elif isinstance(node, LambdaExpression):
+            return replace(node, body=self.fold(node.body))
+        elif isinstance(node, FunctionCall):
+            return replace(
+                node,
+                arguments=[self.fold(argument) for argument in node.arguments],
+                keyword_arguments={name: self.fold(value) for name, value in node.keyword_arguments.items()}
+            )
+        elif isinstance(node, ObjectLiteral):
+            return replace(node, fields={name: self.fold(value) for name, value in node.fields.items()})
+        elif isinstance(node, ArrayLiteral):
+            return replace(node, elements=[self.fold(element) for element in node.elements])
+        
+        return node
+    
+    def _fold_stage(self, stage: PipelineStage) -> PipelineStage:
+        """Constant-fold the expressions of a stage."""
+        folded = self.fold(stage.operation)
+        return stage if folded is stage.operation else replace(stage, operation=folded)
+    
+    def _fold_binary(self, node: BinaryOperation) -> Expression:
+        """Fold a binary operation whose operands are already folded."""
+        left, right = node.left, node.right
+        
+        # Boolean identities hold whatever the other operand is
+        if node.operator in ("and", "or"):
+            for constant, other in ((left, right), (right, left)):
+                if isinstance(constant, Literal) and isinstance(constant.value, bool):
+                    self.rewrites += 1
+                    if node.operator == "and":
+                        return other if constant.value else constant
+                    return constant if constant.value else other
+            return node
+        
+        if not (isinstance(left, Literal) and isinstance(right, Literal)):
+            return node
+        
+        value = _evaluate(node.operator, left.value, right.value)
+        if value is _UNFOLDABLE:
+            return node
+        
+        self.rewrites += 1
+        return _literal(value, node.position)
+    
+    def _fold_unary(self, node: UnaryOperation) -> Expression:
+        """Fold a unary operation whose operand is already folded."""
+        operand = node.operand
+        if not isinstance(operand, Literal):
+            return node
+        
+        if node.operator == "not" and isinstance(operand.value, bool):
+            self.rewrites += 1
+            return _literal(not operand.value, node.position)
+        if node.operator == "-" and _is_number(operand.value):
+            self.rewrites += 1
+            return _literal(-operand.value, node.position)
+        
+        return node
+    
+    # Stage rewrites
+    
+    def _is_no_op(self, stage: PipelineStage) -> bool:
+        """Check whether a stage provably leaves its input unchanged."""
+        predicate = stage_lambda(stage)
+        if stage_call(stage) == "filter" and predicate is not None:
+            body = predicate.body
+            if isinstance(body, Literal) and body.value is True:
+                self.rewrites += 1
+                return True
+        return False
+    
+    def _fuse_filters(self, stages: List[PipelineStage]) -> List[PipelineStage]:
+        """Combine runs of consecutive filters into one filter."""
+        fused = [stages[0]]
+        
+        for stage in stages[1:]:
+            previous = fused[-1]
+            if len(fused) > 1 and self._is_lambda_filter(previous) and self._is_lambda_filter(stage):
+                first = stage_lambda(previous)
+                second = stage_lambda(stage)
+                body = rename_parameter(second.body, second.parameter, first.parameter)
+                if body is not None:
+                    predicate = replace(first, body=BinaryOperation(
+                        left=first.body, operator="and", right=body, position=second.body.position
+                    ))
+                    fused[-1] = replace(previous, operation=replace(previous.operation, arguments=[predicate]))
+                    self.rewrites += 1
+                    continue
+            fused.append(stage)
+        
+        return fused
+    
+    def _push_down_filters(self, stages: List[PipelineStage]) -> List[PipelineStage]:
+        """Move filters ahead of transforms that copy the fields they read."""
+        stages = list(stages)
+        moved = True
+        
+        while moved:
+            moved = False
+            for index in range(2, len(stages)):
+                transform, stage = stages[index - 1], stages[index]
+                if not self._is_lambda_filter(stage) or stage_call(transform) != "transform":
+                    continue
+                
+                pushed = self._filter_before_transform(stage, transform)
+                if pushed is not None:
+                    stages[index - 1], stages[index] = pushed, transform
+                    self.rewrites += 1
+                    moved = True
+        
+        return stages
+    
+    def _filter_before_transform(self, stage: PipelineStage, transform: PipelineStage) -> Optional[PipelineStage]:
+        """
+        Rewrite a filter that follows a transform so it can run before it.
+        
+        Every field the filter reads must be copied unchanged by the
+        transform (name: record.column); the filter is then rewritten to
+        read those source columns through the transform's parameter.
+        """
+        predicate = stage_lambda(stage)
+        builder = stage_lambda(transform)
+        if builder is None or not isinstance(builder.body, ObjectLiteral):
+            return None
+        
+        columns = referenced_columns(predicate)
+        if columns is None:
+            return None
+        
+        copied: Dict[str, Expression] = {}
+        for name, value in builder.body.fields.items():
+            if column_name(value, builder.parameter) is not None:
+                copied[name] = value
+        if any(column not in copied for column in columns):
+            return None
+        
+        # The transform's parameter must not capture another name in the predicate
+        if builder.parameter != predicate.parameter and _uses_name(predicate.body, builder.parameter):
+            return None
+        
+        body = _substitute_columns(predicate.body, predicate.parameter, copied)
+        return replace(stage, operation=replace(
+            stage.operation, arguments=[replace(predicate, parameter=builder.parameter, body=body)]
+        ))
+    
+    # Condition ordering
+    
+    def _source_statistics(self, source: PipelineStage) -> Optional['SourceStatistics']:
+        """Get statistics for a source.csv("path") stage, if available."""
+        operation = source.operation
+        if (self.statistics is None or not isinstance(operation, FunctionCall) or
+                not operation.arguments or not isinstance(operation.arguments[0], Literal) or
+                not isinstance(operation.arguments[0].value, str)):
+            return None
+        return self.statistics(operation.arguments[0].value)
+    
+    def _order_conditions(self, stages: List[PipelineStage],
+                          statistics: Optional['SourceStatistics']) -> List[PipelineStage]:
+        """
+        Order the conditions of each filter by selectivity and cost.
+        
+        Conditions are ranked by (selectivity - 1) / cost, which puts the
+        conditions that remove the most rows per unit of work first. A
+        condition the compiler cannot see into (a call to a helper) keeps
+        its position relative to the others and gets a filter of its own,
+        so it still only sees rows that passed the conditions before it.
+        Statistics describe source columns, so they are only used for
+        filters that run before the first stage that reshapes the data.
+        """
+        ordered = [stages[0]]
+        
+        for stage in stages[1:]:
+            if not self._is_lambda_filter(stage):
+                if stage_call(stage) != "filter":
+                    statistics = None
+                ordered.append(stage)
+                continue
+            
+            predicate = stage_lambda(stage)
+            ranked = []
+            for segment in self._segments(_conjuncts(predicate.body)):
+                scored = [(condition, estimate_selectivity(condition, predicate.parameter, statistics),
+                           estimate_cost(condition)) for condition in segment]
+                ranked.extend(sorted(scored, key=lambda item: (item[1] - 1) / item[2]))
+            
+            groups = self._split_groups(ranked)
+            if len(groups) > 1 or [condition for condition, _, _ in ranked] != _conjuncts(predicate.body):
+                self.rewrites += 1
+            
+            for group in groups:
+                body = group[0]
+                for condition in group[1:]:
+                    body = BinaryOperation(left=body, operator="and", right=condition, position=condition.position)
+                ordered.append(replace(stage, operation=replace(
+                    stage.operation, arguments=[replace(predicate, body=body)]
+                )))
+        
+        return ordered
+    
+    def _segments(self, conditions: List[Expression]) -> List[List[Expression]]:
+        """Split conditions into runs that may be reordered, with opaque conditions on their own."""
+        segments: List[List[Expression]] = [[]]
+        for condition in conditions:
+            if _is_opaque(condition):
+                segments.append([condition])
+                segments.append([])
+            else:
+                segments[-1].append(condition)
+        return [segment for segment in segments if segment]
+    
+    def _split_groups(self, ranked: List[Tuple[Expression, float, float]]) -> List[List[Expression]]:
+        """Group ordered conditions into filters, starting a new one before expensive conditions."""
+        groups: List[List[Expression]] = []
+        kept = 1.0
+        
+        for condition, selectivity, cost in ranked:
+            separate = _is_opaque(condition) or (cost >= SPLIT_COST and kept <= SPLIT_SELECTIVITY)
+            if not groups or separate or (groups[-1] and _is_opaque(groups[-1][-1])):
+                groups.append([])
+            groups[-1].append(condition)
+            kept *= selectivity
+        
+        return groups
+    
+    def _is_lambda_filter(self, stage: PipelineStage) -> bool:
+        """Check whether a stage is filter(param => predicate)."""
+        operation = stage.operation
+        return (stage_call(stage) == "filter" and stage_lambda(stage) is not None and
+                not operation.keyword_arguments)
+
+
+def optimize_program(
+    program: Program,
+    level: int = DEFAULT_OPT_LEVEL,
+    statistics: Optional[Callable[[str], Optional['SourceStatistics']]] = None
+) -> Program:
+    """Convenience function to optimize every pipeline in a program."""
+    return PipelineOptimizer(level, statistics).optimize(program)
+
+
+def estimate_selectivity(node: Expression, parameter: str,
+                         statistics: Optional['SourceStatistics'] = None) -> float:
+    """
+    Estimate the fraction of rows a condition keeps.
+    
+    With column statistics, equality uses the distinct count, ranges
+    interpolate between the column's minimum and maximum, and nulls never
+    match. Without them, fixed per-operator defaults are used.
+    """
+    if isinstance(node, Literal) and isinstance(node.value, bool):
+        return 1.0 if node.value else 0.0
+    if isinstance(node, UnaryOperation) and node.operator == "not":
+        return 1.0 - estimate_selectivity(node.operand, parameter, statistics)
+    if not isinstance(node, BinaryOperation):
+        return 0.5
+    
+    if node.operator == "and":
+        return (estimate_selectivity(node.left, parameter, statistics) *
+                estimate_selectivity(node.right, parameter, statistics))
+    if node.operator == "or":
+        left = estimate_selectivity(node.left, parameter, statistics)
+        right = estimate_selectivity(node.right, parameter, statistics)
+        return left + right - left * right
+    
+    default = DEFAULT_SELECTIVITY.get(node.operator, 0.5)
+    operator, column, value = node.operator, column_name(node.left, parameter), node.right
+    if column is None and operator in FLIPPED_OPERATORS:
+        operator, column, value = FLIPPED_OPERATORS[operator], column_name(node.right, parameter), node.left
+    
+    column_statistics = statistics.column(column) if statistics is not None and column else None
+    if column_statistics is None:
+        return default
+    
+    non_null = 1.0 - column_statistics.null_fraction
+    distinct = max(1, column_statistics.distinct)
+    low, high = column_statistics.minimum, column_statistics.maximum
+    numeric_range = column_statistics.numeric and isinstance(low, float) and isinstance(high, float) and high > low
+    
+    if operator == "==":
+        return non_null / distinct
+    elif operator == "!=":
+        return non_null * (1.0 - 1.0 / distinct)
+    elif operator == "in" and isinstance(value, ArrayLiteral):
+        return non_null * min(1.0, len(value.elements) / distinct)
+    elif operator in ("<", "<=", ">", ">=") and numeric_range and _is_number(_literal_value(value)):
+        below = min(1.0, max(0.0, (_literal_value(value) - low) / (high - low)))
+        return non_null * (below if operator in ("<", "<=") else 1.0 - below)
+    elif (operator == "between" and numeric_range and isinstance(value, ArrayLiteral) and
+          len(value.elements) == 2 and all(_is_number(_literal_value(bound)) for bound in value.elements)):
+        lower, upper = (_literal_value(bound) for bound in value.elements)
+        return non_null * min(1.0, max(0.0, (min(upper, high) - max(lower, low)) / (high - low)))
+    
+    return non_null * default
+
+
+def estimate_cost(node: Expression) -> float:
+    """Estimate the relative cost of evaluating a condition."""
+    if isinstance(node, BinaryOperation):
+        return (PREDICATE_COSTS.get(node.operator, 1) +
+                _nested_cost(node.left) + _nested_cost(node.right))
+    if isinstance(node, UnaryOperation):
+        return estimate_cost(node.operand)
+    return 1 + _nested_cost(node)
+
+
+def _nested_cost(node: Any) -> float:
+    """Get the cost of the calls and operations inside an operand."""
+    if isinstance(node, FunctionCall):
+        cost = OPAQUE_COST if _is_opaque(node) else TEXT_FUNCTION_COST
+        return cost + sum(_nested_cost(argument) for argument in node.arguments)
+    if isinstance(node, (BinaryOperation, UnaryOperation)):
+        return estimate_cost(node)
+    return 0
+
+
+def _is_opaque(node: Any) -> bool:
+    """Check whether an expression calls anything other than the text.* helpers."""
+    if isinstance(node, FunctionCall):
+        function = node.function
+        if not (isinstance(function, AttributeAccess) and isinstance(function.object, Identifier) and
+                function.object.name == "text"):
+            return True
+    if isinstance(node, LambdaExpression):
+        return True
+    if isinstance(node, ASTNode):
+        return any(_is_opaque(getattr(node, field.name)) for field in fields(node))
+    if isinstance(node, (list, tuple)):
+        return any(_is_opaque(item) for item in node)
+    if isinstance(node, dict):
+        return any(_is_opaque(item) for item in node.values())
+    return False
+
+
+def _conjuncts(node: Expression) -> List[Expression]:
+    """Flatten a chain of 'and' operations into its conditions."""
+    if isinstance(node, BinaryOperation) and node.operator == "and":
+        return _conjuncts(node.left) + _conjuncts(node.right)
+    return [node]
+
+
+def _literal_value(node: Expression) -> Any:
+    """Get the value of a (possibly negated) literal, or None."""
+    if isinstance(node, Literal):
+        return node.value
+    if isinstance(node, UnaryOperation) and node.operator == "-" and isinstance(node.operand, Literal):
+        if _is_number(node.operand.value):
+            return -node.operand.value
+    return None
+
+
+def rename_parameter(node: Expression, old: str, new: str) -> Optional[Expression]:
+    """
+    Rename a lambda parameter throughout an expression.
+    
+    Returns None if the new name is already used for something else in the
+    expression, since renaming would then change what it refers to.
+    """
+    if old == new:
+        return node
+    if _uses_name(node, new):
+        return None
+    return _map(node, lambda value: replace(value, name=new)
+                if isinstance(value, Identifier) and value.name == old else None, old)
+
+
+# Sentinel for operations that cannot be evaluated at compile time
+_UNFOLDABLE = object()
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _evaluate(operator: str, left: Any, right: Any) -> Any:
+    """Evaluate an operator on two literal values, or return _UNFOLDABLE."""
+    if _is_number(left) and _is_number(right):
+        if operator == "+":
+            return left + right
+        elif operator == "-":
+            return left - right
+        elif operator == "*":
+            return left * right
+        elif operator == "/" and right != 0:
+            return left / right
+        elif operator == "%" and right != 0:
+            return left % right
+    
+    if isinstance(left, str) and isinstance(right, str) and operator == "+":
+        return left + right
+    
+    if type(left) is type(right) or (_is_number(left) and _is_number(right)):
+        if operator == "==":
+            return left == right
+        elif operator == "!=":
+            return left != right
+        elif operator in ("<", "<=", ">", ">=") and not isinstance(left, bool):
+            return {
+                "<": left < right,
+                "<=": left <= right,
+                ">": left > right,
+                ">=": left >= right,
+            }[operator]
+    
+    return _UNFOLDABLE
+
+
+def _literal(value: Any, position: Position) -> Literal:
+    """Create a literal node for a folded value."""
+    if isinstance(value, bool):
+        type_hint = "bool"
+    elif isinstance(value, str):
+        type_hint = "string"
+    elif isinstance(value, int):
+        type_hint = "int"
+    else:
+        type_hint = "float"
+    return Literal(value=value, type_hint=type_hint, position=position)
+
+
+def _uses_name(node: Any, name: str) -> bool:
+    """Check whether an identifier with the given name occurs anywhere in a node."""
+    if isinstance(node, Identifier):
+        return node.name == name
+    if isinstance(node, ASTNode):
+        return any(_uses_name(getattr(node, field.name), name) for field in fields(node))
+    if isinstance(node, (list, tuple)):
+        return any(_uses_name(item, name) for item in node)
+    if isinstance(node, dict):
+        return any(_uses_name(item, name) for item in node.values())
+    return False
+
+
+def _map(node: Any, rewrite, parameter: str) -> Any:
+    """
+    Copy a node, replacing sub-nodes for which rewrite returns a new node.
+    
+    Lambdas that rebind parameter are left alone, since names inside them
+    refer to their own parameter.
+    """
+    if isinstance(node, ASTNode):
+        rewritten = rewrite(node)
+        if rewritten is not None:
+            return rewritten
+        if isinstance(node, LambdaExpression) and node.parameter == parameter:
+            return node
+        changes = {}
+        for field in fields(node):
+            value = getattr(node, field.name)
+            mapped = _map(value, rewrite, parameter)
+            if mapped is not value:
+                changes[field.name] = mapped
+        return replace(node, **changes) if changes else node
+    if isinstance(node, list):
+        mapped = [_map(item, rewrite, parameter) for item in node]
+        return mapped if any(new is not old for new, old in zip(mapped, node)) else node
+    if isinstance(node, dict):
+        mapped = {key: _map(item, rewrite, parameter) for key, item in node.items()}
+        return mapped if any(mapped[key] is not node[key] for key in node) else node
+    return node
+
+
+def _substitute_columns(node: Expression, parameter: str, columns: Dict[str, Expression]) -> Expression:
+    """Replace parameter.column references with the given expressions."""
+    def rewrite(value: ASTNode) -> Optional[Expression]:
+        if isinstance(value, AttributeAccess):
+            name = column_name(value, parameter)
+            if name is not None:
+                return columns[name]
+        return None
+    
+    return _map(node, rewrite, parameter)
@@ -5,7 +5,8 @@ Converts tokens into an Abstract Syntax Tree (AST).
 Uses recursive descent parsing for clarity and maintainability.
 """
 
-from typing import List, Optional, Dict, Any
+from collections import deque
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Deque
 from .lexer import Token, TokenType, Lexer
 from .ast_nodes import *
 
@@ -21,14 +22,27 @@ class ParseError(Exception):
 class Parser:
     """Parses AgentScript tokens into an AST."""
     
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
+    def __init__(self, tokens: Iterable[Token]):
+        # Tokens are pulled lazily through a small lookahead buffer, so a
+        # token list and a streaming Lexer.iter_tokens() work the same way.
+        self._token_stream: Iterator[Token] = iter(tokens)
+        self._lookahead: Deque[Token] = deque()
+        self._previous: Optional[Token] = None
+        self._end_token: Optional[Token] = None
         self.position = 0
     
     def parse(self) -> Program:
         """Parse tokens into a Program AST node."""
-        statements = []
+        filename = self._current_token().filename if self._current_token() else None
+        statements = list(self.iter_statements())
         
+        return Program(
+            statements=statements,
+            position=Position(1, 1, filename)
+        )
+    
+    def iter_statements(self) -> Iterator[Statement]:
+        """Parse and yield top-level statements one at a time."""
         while not self._is_at_end():
             # Skip newlines and comments at the top level
             if self._current_token().type in [TokenType.NEWLINE, TokenType.COMMENT]:
@@ -37,31 +51,36 @@ class Parser:
                 
             stmt = self._parse_statement()
             if stmt:
-                statements.append(stmt)
-        
-        return Program(
-            statements=statements,
-            position=Position(1, 1, self.tokens[0].filename if self.tokens else None)
-        )
+                yield stmt
     
     def _current_token(self) -> Token:
         """Get the current token."""
-        if self.position >= len(self.tokens):
-            return self.tokens[-1]  # EOF token
-        return self.tokens[self.position]
+        return self._peek_token(0)
     
     def _peek_token(self, offset: int = 1) -> Token:
         """Peek at a token ahead."""
-        pos = self.position + offset
-        if pos >= len(self.tokens):
-            return self.tokens[-1]  # EOF token
-        return self.tokens[pos]
+        lookahead = self._lookahead
+        
+        while len(lookahead) <= offset and self._end_token is None:
+            token = next(self._token_stream, None)
+            if token is None:
+                # Stream ended without EOF; treat the last token as the end
+                self._end_token = lookahead[-1] if lookahead else self._previous
+                break
+            lookahead.append(token)
+            if token.type == TokenType.EOF:
+                self._end_token = token
+        
+        if offset < len(lookahead):
+            return lookahead[offset]
+        return self._end_token  # EOF token
     
     def _advance(self) -> Token:
         """Advance to the next token."""
         if not self._is_at_end():
             self.position += 1
-        return self.tokens[self.position - 1]
+            self._previous = self._lookahead.popleft()
+        return self._previous or self._current_token()
     
     def _is_at_end(self) -> bool:
         """Check if we're at the end of tokens."""
@@ -187,20 +206,25 @@ class Parser:
         stages = []
         
         # Parse first stage
+        # The position is taken before the operation consumes its tokens
+        start = self._current_token()
         first_stage = PipelineStage(
             operation=self._parse_primary_expression(),
-            position=Position(self._current_token().line, self._current_token().column, self._current_token().filename)
+            position=Position(start.line, start.column, start.filename)
         )
         stages.append(first_stage)
         
-        # Parse remaining stages connected by ->
-        while self._match(TokenType.ARROW):
+        # Parse remaining stages connected by ->, which may start the next line
+        while self._match(TokenType.ARROW) or self._arrow_follows_newlines():
+            while self._match(TokenType.NEWLINE, TokenType.COMMENT):
+                self._advance()
             self._advance()  # consume ->
             self._skip_newlines()
             
+            start = self._current_token()
             stage = PipelineStage(
                 operation=self._parse_primary_expression(),
-                position=Position(self._current_token().line, self._current_token().column, self._current_token().filename)
+                position=Position(start.line, start.column, start.filename)
             )
             stages.append(stage)
         
@@ -209,6 +233,13 @@ class Parser:
             position=Position(stages[0].position.line, stages[0].position.column, stages[0].position.filename)
         )
     
+    def _arrow_follows_newlines(self) -> bool:
+        """Check whether the next token after any newlines and comments is a pipeline arrow."""
+        offset = 0
+        while self._peek_token(offset).type in (TokenType.NEWLINE, TokenType.COMMENT):
+            offset += 1
+        return offset > 0 and self._peek_token(offset).type == TokenType.ARROW
+    
     def _parse_primary_expression(self) -> Expression:
         """Parse primary expressions."""
         if self._match(TokenType.IDENTIFIER):
@@ -245,6 +276,12 @@ class Parser:
             return self._parse_object_literal()
         elif self._match(TokenType.LBRACKET):
             return self._parse_array_literal()
+        elif self._match(TokenType.LPAREN):
+            # Parenthesized sub-expression, e.g. not (a or b)
+            self._advance()
+            expr = self._parse_expression()
+            self._consume(TokenType.RPAREN, "Expected ')'")
+            return expr
         else:
             raise ParseError(
                 f"Unexpected token in expression: {self._current_token().value}",
@@ -285,14 +322,14 @@ class Parser:
         
         if not self._match(TokenType.RPAREN):
             # Parse first argument
-            arguments.append(self._parse_argument())
+            self._parse_call_argument(arguments, keyword_arguments)
             
             # Parse remaining arguments
             while self._match(TokenType.COMMA):
                 self._advance()  # consume comma
                 if self._match(TokenType.RPAREN):  # Trailing comma
                     break
-                arguments.append(self._parse_argument())
+                self._parse_call_argument(arguments, keyword_arguments)
         
         self._consume(TokenType.RPAREN, "Expected ')'")
         
@@ -355,6 +392,16 @@ class Parser:
         
         return expr
     
+    def _parse_call_argument(self, arguments: List[Expression], keyword_arguments: Dict[str, Expression]):
+        """Parse a positional argument or a keyword argument like schema: User."""
+        if (self._match(TokenType.IDENTIFIER) and
+            self._peek_token().type == TokenType.ASSIGN):
+            name_token = self._advance()
+            self._advance()  # consume ':'
+            keyword_arguments[name_token.value] = self._parse_argument()
+        else:
+            arguments.append(self._parse_argument())
+    
     def _parse_argument(self) -> Expression:
         """Parse a function argument, which might be a lambda expression."""
         # Check if this is a lambda expression
@@ -407,6 +454,12 @@ class Parser:
             return self._parse_object_literal()
         elif self._match(TokenType.LBRACKET):
             return self._parse_array_literal()
+        elif self._match(TokenType.LPAREN):
+            # Parenthesized sub-expression, e.g. not (a or b)
+            self._advance()
+            expr = self._parse_expression()
+            self._consume(TokenType.RPAREN, "Expected ')'")
+            return expr
         else:
             raise ParseError(
                 f"Unexpected token in expression: {self._current_token().value}",
@@ -439,12 +492,23 @@ class Parser:
         return expr
     
     def _parse_comparison(self) -> Expression:
-        """Parse comparison expressions."""
+        """Parse comparison and membership expressions."""
         expr = self._parse_term()
         
-        while self._match(TokenType.LT, TokenType.LE, TokenType.GT, TokenType.GE):
+        while self._match(TokenType.LT, TokenType.LE, TokenType.GT, TokenType.GE,
+                          TokenType.IN, TokenType.CONTAINS, TokenType.MATCHES, TokenType.BETWEEN):
             op_token = self._advance()
-            right = self._parse_term()
+            if op_token.type == TokenType.BETWEEN:
+                # 'x between low and high' keeps both bounds in an array literal
+                low = self._parse_term()
+                self._consume(TokenType.AND, "Expected 'and' in between expression")
+                high = self._parse_term()
+                right = ArrayLiteral(
+                    elements=[low, high],
+                    position=Position(op_token.line, op_token.column, op_token.filename)
+                )
+            else:
+                right = self._parse_term()
             expr = BinaryOperation(
                 left=expr,
                 operator=op_token.value,
@@ -558,21 +622,69 @@ class Parser:
         )
     
     def _parse_behavior_declaration(self) -> BehaviorDeclaration:
-        """Parse behavior declarations."""
+        """
+        Parse behavior declarations.
+        
+        behavior ValidUser {
+            expects: User { name: string, age: int, signup: date("%Y-%m-%d") }
+            returns: bool
+            validate user.age >= 0
+        }
+        """
         behavior_token = self._consume(TokenType.BEHAVIOR, "Expected 'behavior'")
         name_token = self._consume(TokenType.IDENTIFIER, "Expected behavior name")
         self._consume(TokenType.LBRACE, "Expected '{'")
         
-        # For now, return a simple behavior declaration
-        # TODO: Parse the full behavior body
-        self._skip_until_closing_brace()
+        self._skip_newlines()
+        
+        expects = None
+        returns = None
+        description = None
+        rules = []
+        schema = None
+        
+        while not self._match(TokenType.RBRACE) and not self._is_at_end():
+            self._skip_newlines()
+            
+            if self._match(TokenType.EXPECTS):
+                self._advance()
+                self._consume(TokenType.ASSIGN, "Expected ':'")
+                if self._match(TokenType.IDENTIFIER):
+                    expects = self._advance().value
+                if self._match(TokenType.LBRACE):
+                    schema = self._parse_object_literal().fields
+            elif self._match(TokenType.RETURNS):
+                self._advance()
+                self._consume(TokenType.ASSIGN, "Expected ':'")
+                returns = self._consume(TokenType.IDENTIFIER, "Expected return type").value
+            elif self._match(TokenType.DESCRIPTION):
+                description = self._parse_description()
+            elif self._match(TokenType.VALIDATE):
+                validate_token = self._advance()
+                rules.append(ValidationRule(
+                    condition=self._parse_expression(),
+                    message=None,
+                    position=Position(validate_token.line, validate_token.column, validate_token.filename)
+                ))
+            elif self._match(TokenType.LBRACE):
+                # Skip nested blocks the behavior syntax does not cover yet
+                self._advance()
+                self._skip_until_closing_brace()
+            elif not self._match(TokenType.RBRACE):
+                # Skip unknown fields for now
+                self._advance()
+            
+            self._skip_newlines()
+        
+        self._consume(TokenType.RBRACE, "Expected '}'")
         
         return BehaviorDeclaration(
             name=name_token.value,
-            expects=None,
-            returns=None,
-            description=None,
-            rules=[],
+            expects=expects,
+            returns=returns,
+            description=description,
+            rules=rules,
+            schema=schema,
             position=Position(behavior_token.line, behavior_token.column, behavior_token.filename)
         )
     
@@ -618,6 +730,5 @@ class Parser:
 def parse_agentscript(source: str, filename: Optional[str] = None) -> Program:
     """Convenience function to parse AgentScript source code."""
     lexer = Lexer(source, filename)
-    tokens = lexer.tokenize()
-    parser = Parser(tokens)
+    parser = Parser(lexer.iter_tokens())
     return parser.parse()
\ No newline at end of file
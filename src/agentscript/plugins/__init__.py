@@ -6,6 +6,8 @@ target frameworks and interfaces from AgentScript source files.
 
 Supported Targets:
 - pandas (default): Pure pandas data processing
+- polars: Polars lazy queries with multi-threaded, streaming execution
+- duckdb: SQL pipelines executed by embedded DuckDB
 - django: Django web framework with models, views, and APIs
 - fastapi: FastAPI async web framework with Pydantic models  
 - flask: Flask web framework with SQLAlchemy and blueprints
@@ -7,13 +7,14 @@ AgentScript plugins must implement to generate code for different frameworks.
 
 import os
 import importlib
-import inspect
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Type
+from typing import Dict, List, Optional, Any, Type, TYPE_CHECKING
 from dataclasses import dataclass, field
 
-from ..ast_nodes import Program, IntentDeclaration
+# Only needed for annotations; keeps 'agentscript plugins' from loading the AST
+if TYPE_CHECKING:
+    from ..ast_nodes import Program, IntentDeclaration
 
 
 @dataclass
@@ -32,6 +33,23 @@ class PluginConfig:
     supports_auth: bool = False
 
 
+@dataclass
+class PluginSpec:
+    """
+    Static description of a plugin.
+    
+    Lets the registry list a plugin and report its metadata without importing
+    its module; the module is only imported when the plugin is requested.
+    """
+    module: str
+    class_name: str
+    config: PluginConfig
+    
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+
 @dataclass
 class GenerationContext:
     """Context information passed to plugins during code generation."""
@@ -69,7 +87,7 @@ class BasePlugin(ABC):
         pass
     
     @abstractmethod
-    def generate_code(self, ast: Program, context: GenerationContext) -> Dict[str, str]:
+    def generate_code(self, ast: 'Program', context: GenerationContext) -> Dict[str, str]:
         """
         Generate framework-specific code from AgentScript AST.
         
@@ -141,15 +159,15 @@ class BasePlugin(ABC):
         except ImportError:
             return False
     
-    def _generate_imports(self, ast: Program, context: GenerationContext) -> List[str]:
+    def _generate_imports(self, ast: 'Program', context: GenerationContext) -> List[str]:
         """Generate import statements for the target framework."""
         return []
     
-    def _generate_models(self, intents: List[IntentDeclaration], context: GenerationContext) -> str:
+    def _generate_models(self, intents: List['IntentDeclaration'], context: GenerationContext) -> str:
         """Generate data models for the target framework."""
         return ""
     
-    def _generate_views(self, intents: List[IntentDeclaration], context: GenerationContext) -> str:
+    def _generate_views(self, intents: List['IntentDeclaration'], context: GenerationContext) -> str:
         """Generate views/endpoints for the target framework."""
         return ""
     
@@ -161,24 +179,38 @@ class BasePlugin(ABC):
 class PluginRegistry:
     """Registry for managing available code generation plugins."""
     
+    # Entry point group third-party packages use to provide plugins
+    ENTRY_POINT_GROUP = "agentscript.plugins"
+    
     def __init__(self):
         self._plugins: Dict[str, Type[BasePlugin]] = {}
         self._instances: Dict[str, BasePlugin] = {}
+        self._specs: Dict[str, PluginSpec] = {}
+        self._entry_points: Dict[str, Any] = {}
+        self._entry_points_scanned = False
     
     def register(self, plugin_class: Type[BasePlugin]):
         """Register a plugin class."""
-        # Create temporary instance to get name
-        temp_config = PluginConfig(
-            name=getattr(plugin_class, 'plugin_name', plugin_class.__name__),
-            description=getattr(plugin_class, 'plugin_description', ''),
-        )
-        temp_instance = plugin_class(temp_config)
+        name = getattr(plugin_class, 'plugin_name', None)
+        
+        if name is None:
+            # Create temporary instance to get name
+            temp_config = PluginConfig(
+                name=plugin_class.__name__,
+                description=getattr(plugin_class, 'plugin_description', ''),
+            )
+            name = plugin_class(temp_config).name
         
-        self._plugins[temp_instance.name] = plugin_class
+        self._plugins[name] = plugin_class
+    
+    def register_spec(self, spec: PluginSpec):
+        """Register a plugin from its static description without importing it."""
+        if spec.name not in self._plugins:
+            self._specs[spec.name] = spec
     
     def get_plugin(self, name: str, **config_overrides) -> Optional[BasePlugin]:
         """Get a plugin instance by name."""
-        if name not in self._plugins:
+        if not self._load(name):
             return None
             
         # Use cached instance or create new one
@@ -199,36 +231,58 @@ class PluginRegistry:
     
     def list_plugins(self) -> List[str]:
         """Get list of registered plugin names."""
-        return list(self._plugins.keys())
+        self._scan_entry_points()
+        names = list(self._plugins.keys())
+        names.extend(name for name in self._specs if name not in self._plugins)
+        names.extend(name for name in self._entry_points if name not in names)
+        return names
     
     def get_plugin_info(self, name: str) -> Optional[Dict[str, Any]]:
         """Get information about a plugin."""
-        if name not in self._plugins:
-            return None
-            
-        plugin = self.get_plugin(name)
-        if not plugin:
-            return None
+        if name in self._specs and name not in self._plugins:
+            # Answer from the manifest so listing plugins imports nothing
+            config = self._specs[name].config
+        else:
+            plugin = self.get_plugin(name)
+            if not plugin:
+                return None
+            config = plugin.config
             
         return {
-            'name': plugin.config.name,
-            'description': plugin.config.description,
-            'version': plugin.config.version,
-            'dependencies': plugin.config.dependencies,
-            'optional_dependencies': plugin.config.optional_dependencies,
-            'output_extension': plugin.config.output_extension,
-            'supports_async': plugin.config.supports_async,
-            'supports_web': plugin.config.supports_web,
-            'supports_database': plugin.config.supports_database,
-            'supports_auth': plugin.config.supports_auth,
+            'name': config.name,
+            'description': config.description,
+            'version': config.version,
+            'dependencies': config.dependencies,
+            'optional_dependencies': config.optional_dependencies,
+            'output_extension': config.output_extension,
+            'supports_async': config.supports_async,
+            'supports_web': config.supports_web,
+            'supports_database': config.supports_database,
+            'supports_auth': config.supports_auth,
         }
     
     def discover_plugins(self):
-        """Auto-discover and register plugins from the plugins directory."""
+        """
+        Register built-in plugins from the static manifest.
+        
+        Manifest plugins are imported on first use. Any other *_plugin.py
+        module dropped into the plugins directory is still imported eagerly,
+        and installed packages can provide plugins through the
+        'agentscript.plugins' entry point group (scanned on demand).
+        """
+        import inspect
+        from .manifest import BUILTIN_PLUGINS
+        
+        for spec in BUILTIN_PLUGINS:
+            self.register_spec(spec)
+        
+        manifest_modules = {spec.module for spec in BUILTIN_PLUGINS}
         plugins_dir = Path(__file__).parent
         
         for plugin_file in plugins_dir.glob("*_plugin.py"):
             module_name = f"agentscript.plugins.{plugin_file.stem}"
+            if module_name in manifest_modules:
+                continue
             
             try:
                 module = importlib.import_module(module_name)
@@ -244,6 +298,55 @@ class PluginRegistry:
                 # Skip plugins with missing dependencies
                 pass
     
+    def _load(self, name: str) -> bool:
+        """Make sure the plugin class for name is imported and registered."""
+        if name in self._plugins:
+            return True
+        
+        if name in self._specs:
+            spec = self._specs[name]
+            try:
+                module = importlib.import_module(spec.module)
+                self._plugins[name] = getattr(module, spec.class_name)
+            except (ImportError, AttributeError):
+                # Plugins with missing dependencies are unavailable
+                return False
+            return True
+        
+        self._scan_entry_points()
+        if name in self._entry_points:
+            try:
+                self.register(self._entry_points[name].load())
+            except Exception:
+                return False
+            return name in self._plugins
+        
+        return False
+    
+    def _scan_entry_points(self):
+        """Collect plugin entry points from installed packages (once)."""
+        if self._entry_points_scanned:
+            return
+        self._entry_points_scanned = True
+        
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+        
+        try:
+            found = entry_points()
+            if hasattr(found, 'select'):
+                group = found.select(group=self.ENTRY_POINT_GROUP)
+            else:
+                group = found.get(self.ENTRY_POINT_GROUP, [])
+        except Exception:
+            return
+        
+        for entry_point in group:
+            if entry_point.name not in self._plugins and entry_point.name not in self._specs:
+                self._entry_points[entry_point.name] = entry_point
+    
     def _get_plugin_config(self, name: str, plugin_class: Type[BasePlugin]) -> PluginConfig:
         """Get default configuration for a plugin."""
         # Try to get config from plugin class attributes
@@ -0,0 +1,546 @@
+"""
+DuckDB Plugin for AgentScript
+
+This plugin compiles AgentScript pipelines to SQL run by embedded DuckDB.
+A pipeline like source.csv(...) -> filter(...) -> transform(...) -> sink.json(...)
+becomes the single statement
+
+    COPY (SELECT ... FROM read_csv_auto(...) WHERE ...) TO ... (FORMAT JSON)
+
+which DuckDB executes with its vectorized, parallel engine, spilling to
+disk when a pipeline does not fit in memory.
+"""
+
+from typing import Dict, List, Optional, Union
+
+from .base import BasePlugin, GenerationContext, PluginConfig
+from ..analysis import ColumnType, column_name, infer_column_types, required_columns, stage_call, stage_lambda
+from ..ast_nodes import *
+from ..codegen import PythonCodeGenerator, VectorizationError
+
+
+# Storage types from the analysis and the DuckDB column types they become.
+# Categories and integer downcasts are left to DuckDB's own compression.
+DUCKDB_TYPES = {
+    'str': 'VARCHAR',
+    'boolean': 'BOOLEAN',
+    'int8': 'TINYINT',
+    'int16': 'SMALLINT',
+    'int32': 'INTEGER',
+    'int64': 'BIGINT',
+    'uint8': 'UTINYINT',
+    'uint16': 'USMALLINT',
+    'uint32': 'UINTEGER',
+    'uint64': 'UBIGINT',
+    'float32': 'FLOAT',
+    'float64': 'DOUBLE',
+}
+
+# Source and sink formats and the DuckDB table functions / COPY options for them
+SOURCE_FUNCTIONS = {
+    'csv': 'read_csv_auto',
+    'json': 'read_json_auto',
+    'parquet': 'read_parquet',
+}
+
+
+def sql_string(value: str) -> str:
+    """Quote a value as an SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def sql_identifier(name: str) -> str:
+    """Quote a column name as an SQL identifier."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def sql_type(column_type: ColumnType) -> Optional[str]:
+    """Get the DuckDB type of a column with a declared or inferred storage type."""
+    if column_type.is_date:
+        return 'TIMESTAMP' if column_type.date_format and '%H' in column_type.date_format else 'DATE'
+    elif column_type.dtype == 'category':
+        return 'VARCHAR'
+    elif column_type.downcast == 'integer':
+        return 'BIGINT'
+    return DUCKDB_TYPES.get(column_type.dtype)
+
+
+class SQLExpressionGenerator:
+    """
+    Translates lambda bodies into SQL expressions.
+    
+    Attribute access on the lambda parameter becomes a column reference
+    (user.age -> "age"), so 'user => user.age >= 18 and user.active'
+    becomes ("age" >= 18 AND "active"). Expressions that have no SQL
+    equivalent raise VectorizationError.
+    
+    column_types holds the DuckDB types of the columns that are known, which
+    decides whether + adds numbers or concatenates strings (||).
+    """
+    
+    OPERATORS = {
+        "and": "AND", "or": "OR",
+        "==": "=", "!=": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">=",
+        "+": "+", "-": "-", "*": "*", "/": "/", "%": "%",
+    }
+    
+    # text.* helpers and their SQL functions
+    TEXT_FUNCTIONS = {
+        "uppercase": "upper",
+        "lowercase": "lower",
+        "trim": "trim",
+        "length": "length",
+    }
+    
+    # text.* helpers that return strings
+    STRING_FUNCTIONS = ("uppercase", "lowercase", "trim")
+    
+    def __init__(self, parameter: str, column_types: Optional[Dict[str, str]] = None):
+        self.parameter = parameter
+        self.column_types = column_types or {}
+        self.columns: List[str] = []  # Referenced columns, in first-use order
+    
+    def generate(self, node: Expression) -> str:
+        """Generate an SQL expression for node."""
+        if isinstance(node, Literal):
+            return self._literal(node)
+        elif isinstance(node, AttributeAccess):
+            return self._column(node)
+        elif isinstance(node, UnaryOperation):
+            operand = self.generate(node.operand)
+            if node.operator == "not":
+                return f"(NOT {operand})"
+            elif node.operator == "-":
+                return f"(-{operand})"
+        elif isinstance(node, BinaryOperation):
+            return self._binary(node)
+        elif isinstance(node, FunctionCall):
+            return self._call(node)
+        
+        raise VectorizationError(f"Cannot translate {type(node).__name__} to SQL")
+    
+    def sql_type(self, node: Expression) -> Optional[str]:
+        """Get the DuckDB type an expression evaluates to, or None if it is not known."""
+        if isinstance(node, Literal):
+            if isinstance(node.value, str):
+                return 'VARCHAR'
+            elif isinstance(node.value, bool):
+                return 'BOOLEAN'
+            elif isinstance(node.value, int):
+                return 'BIGINT'
+            elif isinstance(node.value, float):
+                return 'DOUBLE'
+        elif isinstance(node, AttributeAccess):
+            return self.column_types.get(column_name(node, self.parameter))
+        elif isinstance(node, UnaryOperation):
+            return 'BOOLEAN' if node.operator == "not" else self.sql_type(node.operand)
+        elif isinstance(node, BinaryOperation):
+            if node.operator == "+":
+                types = {self.sql_type(node.left), self.sql_type(node.right)}
+                if 'VARCHAR' in types:
+                    return 'VARCHAR'
+                return 'DOUBLE' if types - {None} else None
+            elif node.operator in ("-", "*", "/", "%"):
+                return 'DOUBLE'
+            return 'BOOLEAN'
+        elif isinstance(node, FunctionCall):
+            function = node.function
+            if isinstance(function, AttributeAccess) and isinstance(function.object, Identifier) and function.object.name == "text":
+                return 'VARCHAR' if function.attribute in self.STRING_FUNCTIONS else 'BIGINT'
+        return None
+    
+    def _column(self, node: AttributeAccess) -> str:
+        """Generate a column reference."""
+        name = column_name(node, self.parameter)
+        if name is None:
+            raise VectorizationError(f"'{node.attribute}' is not a column of {self.parameter}")
+        
+        if name not in self.columns:
+            self.columns.append(name)
+        return sql_identifier(name)
+    
+    def _literal(self, node: Literal) -> str:
+        """Generate an SQL literal."""
+        value = node.value
+        if value is None:
+            return "NULL"
+        elif isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        elif isinstance(value, str):
+            return sql_string(value)
+        return repr(value)
+    
+    def _list(self, node: ArrayLiteral) -> str:
+        """Generate the parenthesized value list of an IN test."""
+        return "(" + ", ".join(self.generate(element) for element in node.elements) + ")"
+    
+    def _binary(self, node: BinaryOperation) -> str:
+        """Generate a binary operation."""
+        operator = node.operator
+        
+        if operator == "+":
+            types = {self.sql_type(node.left), self.sql_type(node.right)}
+            if 'VARCHAR' in types:
+                # String concatenation
+                return f"({self.generate(node.left)} || {self.generate(node.right)})"
+            elif types == {None}:
+                raise VectorizationError("Cannot tell whether '+' adds numbers or concatenates strings; "
+                                         "declare the column types with an expects schema")
+        
+        if operator in self.OPERATORS:
+            return f"({self.generate(node.left)} {self.OPERATORS[operator]} {self.generate(node.right)})"
+        elif operator == "in":
+            if isinstance(node.right, ArrayLiteral):
+                return f"({self.generate(node.left)} IN {self._list(node.right)})"
+            # "text" in user.field: substring test on a string column
+            return f"contains({self.generate(node.right)}, {self.generate(node.left)})"
+        elif operator == "contains":
+            return f"contains({self.generate(node.left)}, {self.generate(node.right)})"
+        elif operator == "matches":
+            return f"regexp_full_match({self.generate(node.left)}, {self.generate(node.right)})"
+        elif operator == "between" and isinstance(node.right, ArrayLiteral) and len(node.right.elements) == 2:
+            low, high = node.right.elements
+            return f"({self.generate(node.left)} BETWEEN {self.generate(low)} AND {self.generate(high)})"
+        
+        raise VectorizationError(f"Cannot translate operator '{operator}' to SQL")
+    
+    def _call(self, node: FunctionCall) -> str:
+        """Generate a text.* helper call as an SQL function call."""
+        function = node.function
+        if (isinstance(function, AttributeAccess) and isinstance(function.object, Identifier) and
+                function.object.name == "text" and function.attribute in self.TEXT_FUNCTIONS and
+                len(node.arguments) == 1 and not node.keyword_arguments):
+            return f"{self.TEXT_FUNCTIONS[function.attribute]}({self.generate(node.arguments[0])})"
+        
+        raise VectorizationError("Cannot translate function call to SQL")
+
+
+class SelectBlock:
+    """One SELECT ... FROM ... WHERE ... level of the query a pipeline builds."""
+    
+    def __init__(self, source: Union[str, 'SelectBlock'], comment: str = "", alias: str = ""):
+        self.source = source                     # Table function call or inner block
+        self.source_comment = comment
+        self.alias = alias
+        self.conditions: List[str] = []          # Each with its stage comment
+        self.fields: Optional[List[str]] = None  # None selects every column
+        self.fields_comment = ""
+    
+    def render(self, indent: str = "") -> List[str]:
+        """Render the block as lines of SQL."""
+        if self.fields is None:
+            lines = [f"{indent}SELECT *"]
+        else:
+            lines = [f"{indent}SELECT{self.fields_comment}"]
+            lines.extend(f"{indent}    {field}{',' if i < len(self.fields) - 1 else ''}"
+                         for i, field in enumerate(self.fields))
+        if isinstance(self.source, SelectBlock):
+            lines.append(f"{indent}FROM (")
+            lines.extend(self.source.render(indent + "    "))
+            lines.append(f"{indent}) AS {self.alias}")
+        else:
+            lines.append(f"{indent}FROM {self.source}{self.source_comment}")
+        for i, condition in enumerate(self.conditions):
+            lines.append(f"{indent}{'WHERE' if i == 0 else '  AND'} {condition}")
+        return lines
+
+
+class DuckDBCodeGenerator(PythonCodeGenerator):
+    """
+    Generates Python code that runs AgentScript pipelines as DuckDB SQL.
+    
+    Filters become WHERE conditions and record transforms the SELECT list
+    of the current query block; a filter after a transform starts a new
+    block over the previous one as a subquery. Each sink runs a COPY of
+    the query up to its position in the pipeline.
+    """
+    
+    def visit_import(self, node: ImportStatement) -> str:
+        """Convert import statements to Python imports."""
+        return ""
+    
+    def visit_intent_declaration(self, node: IntentDeclaration) -> str:
+        """Convert intent declarations to Python classes."""
+        self.imports.add("import duckdb")
+        class_name = self._to_camel_case(node.name)
+        method_name = self._to_snake_case(node.name)
+        
+        class_lines = [f"class {class_name}:{self._add_source_comment(node.position.line)}"]
+        self._increase_indent()
+        
+        docstring_lines = ['"""']
+        if node.description:
+            docstring_lines.extend([node.description, ""])
+        docstring_lines.extend([
+            "This class was generated from an AgentScript 'intent' declaration.",
+            f"Its pipeline is compiled to SQL that {method_name}() runs in an",
+            "embedded, in-memory DuckDB database.",
+            '"""',
+        ])
+        class_lines.extend(self._indent(line) for line in docstring_lines)
+        class_lines.append("")
+        
+        class_lines.append(self._indent("def __init__(self, connection: 'duckdb.DuckDBPyConnection' = None):"))
+        self._increase_indent()
+        class_lines.append(self._indent('"""Initialize the data processor with a DuckDB connection and error tracking."""'))
+        class_lines.append(self._indent("self.connection = connection or duckdb.connect()"))
+        class_lines.append(self._indent("# Track validation errors during processing for debugging"))
+        class_lines.append(self._indent("self.validation_errors = []"))
+        self._decrease_indent()
+        
+        if node.pipeline:
+            method_code = self._generate_pipeline_method(node.pipeline, method_name, node.description, node.position.line)
+            class_lines.append("")
+            class_lines.append(self._indent(method_code))
+        
+        self._decrease_indent()
+        
+        self.classes.extend(class_lines)
+        self.classes.append("")  # Empty line between classes
+        
+        return ""
+    
+    def _generate_file_header(self, program: Program) -> List[str]:
+        """Generate header comment with generation and debugging info."""
+        return [
+            "# This file was automatically generated from AgentScript",
+            f"# Source: {self.source_filename or 'unknown'}",
+            f"# Generated at: {self._get_timestamp()}",
+            "#",
+            "# - Each AgentScript 'intent' becomes a Python class",
+            "# - Pipelines are compiled to SQL executed by embedded DuckDB",
+            "# - Error handling is built-in with validation_errors tracking",
+            "#",
+            "# For debugging: Line numbers in comments refer to the original .ags file"
+        ]
+    
+    def _generate_pipeline_method(self, pipeline: PipelineExpression, method_name: str, description: Optional[str], source_line: int = None) -> str:
+        """Generate a method that runs the SQL for a pipeline."""
+        lines = [f"def {method_name}(self) -> 'duckdb.DuckDBPyRelation':{self._add_source_comment(source_line)}"]
+        
+        lines.append('    """')
+        if description:
+            lines.extend([f"    {description}", ""])
+        lines.extend([
+            f"    This method implements the AgentScript pipeline from {self.source_filename or 'source'}.",
+            "    The stages are compiled to SQL; each sink runs a COPY statement that",
+            "    DuckDB executes in parallel without loading the data into Python:",
+            "",
+        ])
+        for i, stage in enumerate(pipeline.stages):
+            lines.append(f"    {i + 1}. {self._describe_pipeline_stage(stage, i)}")
+        lines.extend([
+            "",
+            "    Returns:",
+            "        duckdb.DuckDBPyRelation: The pipeline result, evaluated when it is used",
+            "",
+            "    Raises:",
+            "        Exception: Re-raises any processing errors after logging to validation_errors",
+            '    """',
+            "",
+            "    # Run the AgentScript pipeline as DuckDB SQL",
+            "    try:",
+        ])
+        
+        indent = "        "
+        block = SelectBlock(self._generate_source(pipeline), self._sql_comment(pipeline.stages[0], 0))
+        # Known types of the current block's columns; a transform replaces them with its fields' types
+        column_types = {column: sql_type(column_type) for column, column_type in self._source_column_types(pipeline).items()
+                        if sql_type(column_type)}
+        
+        for i, stage in enumerate(pipeline.stages[1:], start=1):
+            sink_format = self._io_format(stage, "sink")
+            predicate = stage_lambda(stage)
+            
+            if sink_format is not None:
+                lines.append(f"{indent}# Stage {i + 1}: Data output{self._stage_source_comment(stage)}")
+                lines.extend(self._generate_copy(block, stage, sink_format, indent))
+            elif stage_call(stage) == "filter" and predicate is not None:
+                if block.fields is not None:
+                    block = SelectBlock(block, alias=f"stage_{i}")
+                condition = self._translate(predicate.parameter, predicate.body, i, column_types)
+                block.conditions.append(f"{condition}{self._sql_comment(stage, i)}")
+            elif stage_call(stage) == "transform" and predicate is not None and isinstance(predicate.body, ObjectLiteral):
+                if block.fields is not None:
+                    block = SelectBlock(block, alias=f"stage_{i}")
+                block.fields = [f"{self._translate(predicate.parameter, value, i, column_types)} AS {sql_identifier(name)}"
+                                for name, value in predicate.body.fields.items()]
+                block.fields_comment = self._sql_comment(stage, i)
+                generator = SQLExpressionGenerator(predicate.parameter, column_types)
+                column_types = {name: generator.sql_type(value) for name, value in predicate.body.fields.items()
+                                if generator.sql_type(value)}
+            else:
+                raise VectorizationError(f"Stage {i + 1} of '{method_name}' cannot be translated to SQL")
+        
+        lines.append(f"{indent}# Query for the pipeline's result")
+        lines.extend(self._sql_literal("query", block.render(), indent))
+        lines.extend([
+            "",
+            f"{indent}# Pipeline executed successfully",
+            f"{indent}return self.connection.sql(query)",
+            "",
+            "    except Exception as e:",
+            "        # Log error for debugging while preserving original exception",
+            "        error_info = {",
+            "            'error': str(e),",
+            "            'error_type': type(e).__name__,",
+            f"            'method': '{method_name}',",
+            f"            'source_file': '{self.source_filename or 'unknown'}'",
+            "        }",
+            "        self.validation_errors.append(error_info)",
+            "        raise  # Re-raise for proper error handling",
+        ])
+        
+        return "\n".join(lines)
+    
+    def _translate(self, parameter: str, node: Expression, index: int,
+                   column_types: Optional[Dict[str, str]] = None) -> str:
+        """Translate an expression over a stage's lambda parameter to SQL."""
+        try:
+            return SQLExpressionGenerator(parameter, column_types).generate(node)
+        except VectorizationError as e:
+            raise VectorizationError(f"Stage {index + 1} cannot be translated to SQL: {e}") from None
+    
+    def _sql_comment(self, stage: PipelineStage, index: int) -> str:
+        """Get the SQL comment naming the stage and .ags line a clause came from."""
+        position = getattr(stage, 'position', None)
+        if position and self.source_filename:
+            return f"  -- Stage {index + 1}, {self.source_filename}:{position.line}"
+        return f"  -- Stage {index + 1}"
+    
+    def _generate_source(self, pipeline: PipelineExpression) -> str:
+        """
+        Generate the table function call that reads a pipeline's source.
+        
+        Declared or inferred column types are passed with types= so DuckDB
+        does not have to sniff them; date columns get their format.
+        """
+        stage = pipeline.stages[0]
+        source_format = self._io_format(stage, "source")
+        arguments = stage.operation.arguments if source_format is not None else []
+        if (source_format not in SOURCE_FUNCTIONS or not arguments or
+                not isinstance(arguments[0], Literal) or not isinstance(arguments[0].value, str)):
+            raise VectorizationError("Only CSV, JSON and Parquet sources with a file name can be translated to SQL")
+        
+        parameters = [sql_string(arguments[0].value)]
+        if source_format == "csv":
+            parameters.extend(self._type_parameters(self._source_column_types(pipeline)))
+        
+        return f"{SOURCE_FUNCTIONS[source_format]}({', '.join(parameters)})"
+    
+    def _source_column_types(self, pipeline: PipelineExpression) -> Dict[str, ColumnType]:
+        """Get the declared or inferred types of the source columns a pipeline uses."""
+        columns = required_columns(pipeline)
+        column_types = infer_column_types(pipeline, self._source_schema(pipeline.stages[0]))
+        if columns:
+            column_types = {column: column_type for column, column_type in column_types.items() if column in columns}
+        return column_types
+    
+    def _type_parameters(self, column_types: Dict[str, ColumnType]) -> List[str]:
+        """Get the types= and date format parameters of read_csv_auto."""
+        types = {}
+        formats = {}
+        for column, column_type in column_types.items():
+            if column_type.is_date:
+                kind = sql_type(column_type)
+                types[column] = kind
+                if column_type.date_format:
+                    formats.setdefault(kind, set()).add(column_type.date_format)
+            elif column_type.dtype in DUCKDB_TYPES:
+                types[column] = DUCKDB_TYPES[column_type.dtype]
+        
+        parameters = []
+        if types:
+            entries = ", ".join(f"{sql_string(column)}: {sql_string(kind)}" for column, kind in types.items())
+            parameters.append(f"types = {{{entries}}}")
+        # The reader takes one format per kind; with several, leave detection to DuckDB
+        for kind, option in (('DATE', 'dateformat'), ('TIMESTAMP', 'timestampformat')):
+            if len(formats.get(kind, ())) == 1:
+                parameters.append(f"{option} = {sql_string(next(iter(formats[kind])))}")
+        return parameters
+    
+    def _generate_copy(self, block: SelectBlock, stage: PipelineStage, sink_format: str, indent: str) -> List[str]:
+        """
+        Generate the COPY statement that writes the query so far to a sink.
+        
+        JSON is written as one array, like the pandas target, or as JSON
+        lines in streaming mode. Parquet sinks take their compression and
+        row group size options.
+        """
+        arguments = stage.operation.arguments
+        if (sink_format == "arrow" or not arguments or
+                not isinstance(arguments[0], Literal) or not isinstance(arguments[0].value, str)):
+            raise VectorizationError("Only CSV, JSON and Parquet sinks with a file name can be translated to SQL")
+        
+        if sink_format == "parquet":
+            options = "FORMAT PARQUET"
+            sink_options = self._sink_options(stage.operation)
+            if "compression" in sink_options:
+                options += f", COMPRESSION {sql_string(str(sink_options['compression']))}"
+            if "row_group_size" in sink_options:
+                options += f", ROW_GROUP_SIZE {int(sink_options['row_group_size'])}"
+        elif sink_format == "csv":
+            options = "FORMAT CSV, HEADER"
+        elif self.streaming:
+            options = "FORMAT JSON"
+        else:
+            options = "FORMAT JSON, ARRAY true"
+        
+        sql = ["COPY ("]
+        sql.extend(block.render("    "))
+        sql.append(f") TO {sql_string(arguments[0].value)} ({options})")
+        
+        lines = self._sql_literal("statement", sql, indent)
+        lines.append(f"{indent}self.connection.execute(statement)")
+        lines.append("")
+        return lines
+    
+    def _sql_literal(self, name: str, sql: List[str], indent: str) -> List[str]:
+        """Generate the assignment of SQL text to a variable as a triple-quoted string."""
+        lines = [f'{indent}{name} = """']
+        lines.extend(f"{indent}{line}".replace('\\', '\\\\').replace('"""', '\\"\\"\\"') for line in sql)
+        lines.append(f'{indent}"""')
+        return lines
+
+
+class DuckDBPlugin(BasePlugin):
+    """DuckDB SQL generator."""
+    
+    plugin_name = "duckdb"
+    plugin_description = "Generate SQL pipelines executed by embedded DuckDB"
+    plugin_version = "1.0.0"
+    plugin_dependencies = ["duckdb>=0.10"]
+    plugin_optional_dependencies = []
+    plugin_output_extension = ".py"
+    plugin_supports_async = False
+    plugin_supports_web = False
+    plugin_supports_database = True
+    plugin_supports_auth = False
+    
+    @property
+    def name(self) -> str:
+        return "duckdb"
+    
+    @property
+    def description(self) -> str:
+        return "Generate SQL pipelines executed by embedded, out-of-core DuckDB"
+    
+    def generate_code(self, ast: Program, context: GenerationContext) -> Dict[str, str]:
+        """Generate a DuckDB module from AgentScript AST."""
+        files = {}
+        
+        if not any(isinstance(stmt, IntentDeclaration) for stmt in ast.statements):
+            return files
+        
+        generator = DuckDBCodeGenerator(str(context.source_file), streaming=context.options.get('streaming', False))
+        try:
+            files[f"{context.source_file.stem}.py"] = generator.generate(ast)
+        except VectorizationError as e:
+            raise ValueError(f"Cannot compile to DuckDB SQL: {e}") from None
+        files["requirements.txt"] = "\n".join(self.get_dependencies(context)) + "\n"
+        
+        return files
+    
+    def get_dependencies(self, context: GenerationContext) -> List[str]:
+        """Get required dependencies for the generated module."""
+        return self.plugin_dependencies.copy()
@@ -0,0 +1,111 @@
+"""
+Built-in Plugin Manifest
+
+Static metadata for the plugins shipped with AgentScript. The registry reads
+this instead of importing every plugin module, so listing plugins or compiling
+for one target never pays for loading the other generators.
+
+Keep each entry in sync with the plugin_* class attributes of its plugin.
+"""
+
+from .base import PluginConfig, PluginSpec
+
+
+BUILTIN_PLUGINS = [
+    PluginSpec(
+        module="agentscript.plugins.polars_plugin",
+        class_name="PolarsPlugin",
+        config=PluginConfig(
+            name="polars",
+            description="Generate Polars lazy queries with multi-threaded, streaming execution",
+            version="1.0.0",
+            dependencies=["polars>=1.0"],
+            optional_dependencies=["pyarrow>=14.0"],
+            output_extension=".py",
+            supports_async=False,
+            supports_web=False,
+            supports_database=False,
+            supports_auth=False,
+        ),
+    ),
+    PluginSpec(
+        module="agentscript.plugins.duckdb_plugin",
+        class_name="DuckDBPlugin",
+        config=PluginConfig(
+            name="duckdb",
+            description="Generate SQL pipelines executed by embedded DuckDB",
+            version="1.0.0",
+            dependencies=["duckdb>=0.10"],
+            optional_dependencies=[],
+            output_extension=".py",
+            supports_async=False,
+            supports_web=False,
+            supports_database=True,
+            supports_auth=False,
+        ),
+    ),
+    PluginSpec(
+        module="agentscript.plugins.django_plugin",
+        class_name="DjangoPlugin",
+        config=PluginConfig(
+            name="django",
+            description="Generate Django web applications with models, views, and APIs",
+            version="1.0.0",
+            dependencies=["django>=4.0", "djangorestframework>=3.14"],
+            optional_dependencies=["django-cors-headers", "django-filter", "celery"],
+            output_extension=".py",
+            supports_async=True,
+            supports_web=True,
+            supports_database=True,
+            supports_auth=True,
+        ),
+    ),
+    PluginSpec(
+        module="agentscript.plugins.fastapi_plugin",
+        class_name="FastAPIPlugin",
+        config=PluginConfig(
+            name="fastapi",
+            description="Generate modern async FastAPI applications with Pydantic models",
+            version="1.0.0",
+            dependencies=["fastapi[all]>=0.104.0", "uvicorn[standard]>=0.24.0", "pydantic>=2.0"],
+            optional_dependencies=["sqlalchemy>=2.0", "asyncpg", "aiomysql", "celery", "redis"],
+            output_extension=".py",
+            supports_async=True,
+            supports_web=True,
+            supports_database=True,
+            supports_auth=True,
+        ),
+    ),
+    PluginSpec(
+        module="agentscript.plugins.flask_plugin",
+        class_name="FlaskPlugin",
+        config=PluginConfig(
+            name="flask",
+            description="Generate Flask web applications with SQLAlchemy, blueprints, and REST APIs",
+            version="1.0.0",
+            dependencies=["Flask>=2.3.0", "Flask-SQLAlchemy>=3.0.0", "Flask-Migrate>=4.0.0"],
+            optional_dependencies=["Flask-Login", "Flask-Admin", "Flask-CORS", "Flask-Bcrypt"],
+            output_extension=".py",
+            supports_async=False,
+            supports_web=True,
+            supports_database=True,
+            supports_auth=True,
+        ),
+    ),
+    PluginSpec(
+        module="agentscript.plugins.tui_plugin",
+        class_name="TUIPlugin",
+        config=PluginConfig(
+            name="tui",
+            description="Generate interactive Terminal User Interface applications",
+            version="1.0.0",
+            dependencies=["rich>=13.0", "textual>=0.45.0", "pandas>=1.3.0"],
+            optional_dependencies=["matplotlib>=3.5", "plotly>=5.0", "asyncio-mqtt"],
+            output_extension=".py",
+            supports_async=True,
+            supports_web=False,
+            supports_database=False,
+            supports_auth=False,
+        ),
+    ),
+]
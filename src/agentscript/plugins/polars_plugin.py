@@ -0,0 +1,394 @@
+"""
+Polars Plugin for AgentScript
+
+This plugin compiles AgentScript pipelines to Polars lazy queries. Every
+intent becomes a class whose pipeline method builds a query like
+pl.scan_csv(...).filter(...).select(...) and executes it with sink_csv(),
+so Polars can push filters and column selections into the scan, run the
+query on all cores and stream it through its streaming engine.
+"""
+
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+from .base import BasePlugin, GenerationContext, PluginConfig
+from ..analysis import ColumnType, column_name, infer_column_types, referenced_columns, required_columns, stage_call, stage_lambda
+from ..ast_nodes import *
+from ..codegen import COLUMNAR_FORMATS, TEXT_FORMATS, PandasExpressionGenerator, PythonCodeGenerator, VectorizationError
+
+
+# Storage types from the analysis and the Polars data types they become
+POLARS_DTYPES = {
+    'str': 'pl.String',
+    'category': 'pl.Categorical',
+    'boolean': 'pl.Boolean',
+    'int8': 'pl.Int8',
+    'int16': 'pl.Int16',
+    'int32': 'pl.Int32',
+    'int64': 'pl.Int64',
+    'uint8': 'pl.UInt8',
+    'uint16': 'pl.UInt16',
+    'uint32': 'pl.UInt32',
+    'uint64': 'pl.UInt64',
+    'float32': 'pl.Float32',
+    'float64': 'pl.Float64',
+}
+
+
+class PolarsExpressionGenerator(PandasExpressionGenerator):
+    """
+    Translates lambda bodies into Polars expressions.
+    
+    Attribute access on the lambda parameter becomes pl.col(...), so
+    'user => user.age >= 18 and user.active' becomes the expression
+    (pl.col('age') >= 18) & pl.col('active'). Note that matches uses the
+    regex syntax of Polars (Rust), which differs from Python's re in a few
+    rarely used constructs.
+    """
+    
+    # text.* helpers and their Polars string namespace methods
+    TEXT_FUNCTIONS = {
+        "uppercase": "to_uppercase",
+        "lowercase": "to_lowercase",
+        "trim": "strip_chars",
+        "length": "len_chars",
+    }
+    
+    def _column(self, node: AttributeAccess) -> str:
+        """Generate a column reference."""
+        name = column_name(node, self.parameter)
+        if name is None:
+            raise VectorizationError(f"'{node.attribute}' is not a column of {self.parameter}")
+        
+        if name not in self.columns:
+            self.columns.append(name)
+        return f"pl.col({name!r})"
+    
+    def _binary(self, node: BinaryOperation) -> str:
+        """Generate a binary operation."""
+        operator = node.operator
+        
+        if operator == "in":
+            if isinstance(node.right, ArrayLiteral):
+                return f"{self._column_operand(node.left)}.is_in({self.generate(node.right)})"
+            # "text" in user.field: substring test on a string column
+            return f"{self._column_operand(node.right)}.str.contains({self._scalar(node.left)}, literal=True)"
+        elif operator == "contains":
+            return f"{self._column_operand(node.left)}.str.contains({self._scalar(node.right)}, literal=True)"
+        elif operator == "matches":
+            # Polars only searches, so anchor the pattern to match the whole value
+            if not isinstance(node.right, Literal) or not isinstance(node.right.value, str):
+                raise VectorizationError("Expected a literal pattern")
+            return f"{self._column_operand(node.left)}.str.contains({'^(?:' + node.right.value + ')$'!r})"
+        elif operator == "between" and isinstance(node.right, ArrayLiteral) and len(node.right.elements) == 2:
+            low, high = node.right.elements
+            return f"{self._column_operand(node.left)}.is_between({self._scalar(low)}, {self._scalar(high)})"
+        
+        return super()._binary(node)
+
+
+class PolarsCodeGenerator(PythonCodeGenerator):
+    """
+    Generates Python code that runs AgentScript pipelines as Polars lazy queries.
+    
+    Reuses the pandas generator's handling of intents, behaviors and source
+    line references; only the pipeline methods differ. Each stage extends
+    the query and nothing is read until a sink writes the result.
+    """
+    
+    def visit_import(self, node: ImportStatement) -> str:
+        """Convert import statements to Python imports."""
+        for module in node.modules:
+            if module.startswith("validation."):
+                self.imports.add("import re")
+        return ""
+    
+    def visit_intent_declaration(self, node: IntentDeclaration) -> str:
+        """Convert intent declarations to Python classes."""
+        self.imports.add("import polars as pl")
+        class_name = self._to_camel_case(node.name)
+        method_name = self._to_snake_case(node.name)
+        
+        class_lines = [f"class {class_name}:{self._add_source_comment(node.position.line)}"]
+        self._increase_indent()
+        
+        docstring_lines = ['"""']
+        if node.description:
+            docstring_lines.extend([node.description, ""])
+        docstring_lines.extend([
+            "This class was generated from an AgentScript 'intent' declaration.",
+            f"Its pipeline is compiled to a Polars lazy query in {method_name}(),",
+            "which Polars optimizes as a whole and executes on all cores.",
+            '"""',
+        ])
+        class_lines.extend(self._indent(line) for line in docstring_lines)
+        class_lines.append("")
+        
+        class_lines.append(self._indent("def __init__(self):"))
+        self._increase_indent()
+        class_lines.append(self._indent('"""Initialize the data processor with error tracking."""'))
+        class_lines.append(self._indent("# Track validation errors during processing for debugging"))
+        class_lines.append(self._indent("self.validation_errors = []"))
+        self._decrease_indent()
+        
+        if node.pipeline:
+            method_code = self._generate_pipeline_method(node.pipeline, method_name, node.description, node.position.line)
+            class_lines.append("")
+            class_lines.append(self._indent(method_code))
+        
+        self._decrease_indent()
+        
+        self.classes.extend(class_lines)
+        self.classes.append("")  # Empty line between classes
+        
+        return ""
+    
+    def _generate_file_header(self, program: Program) -> List[str]:
+        """Generate header comment with generation and debugging info."""
+        return [
+            "# This file was automatically generated from AgentScript",
+            f"# Source: {self.source_filename or 'unknown'}",
+            f"# Generated at: {self._get_timestamp()}",
+            "#",
+            "# - Each AgentScript 'intent' becomes a Python class",
+            "# - Pipelines are compiled to Polars lazy queries, executed by their sinks",
+            "# - Error handling is built-in with validation_errors tracking",
+            "#",
+            "# For debugging: Line numbers in comments refer to the original .ags file"
+        ]
+    
+    def _generate_pipeline_method(self, pipeline: PipelineExpression, method_name: str, description: Optional[str], source_line: int = None) -> str:
+        """Generate a method that builds and executes the lazy query for a pipeline."""
+        lines = [f"def {method_name}(self) -> 'pl.LazyFrame':{self._add_source_comment(source_line)}"]
+        
+        lines.append('    """')
+        if description:
+            lines.extend([f"    {description}", ""])
+        lines.extend([
+            f"    This method implements the AgentScript pipeline from {self.source_filename or 'source'}.",
+            "    The stages are composed into a single Polars lazy query; Polars pushes",
+            "    filters and column selections down into the scan and each sink",
+            "    executes the query up to its position in the pipeline:",
+            "",
+        ])
+        for i, stage in enumerate(pipeline.stages):
+            lines.append(f"    {i + 1}. {self._describe_pipeline_stage(stage, i)}")
+        lines.extend([
+            "",
+            "    Returns:",
+            "        pl.LazyFrame: The query as of the last stage, for further processing",
+            "",
+            "    Raises:",
+            "        Exception: Re-raises any processing errors after logging to validation_errors",
+            '    """',
+            "",
+            "    # Build the AgentScript pipeline as a Polars lazy query",
+            "    try:",
+        ])
+        
+        # Polars prunes unused columns itself; only give the used ones their types
+        columns = required_columns(pipeline)
+        column_types = infer_column_types(pipeline, self._source_schema(pipeline.stages[0]))
+        if columns:
+            column_types = {column: column_type for column, column_type in column_types.items() if column in columns}
+        
+        indent = "        "
+        for i, stage in enumerate(pipeline.stages):
+            stage_line_comment = self._stage_source_comment(stage)
+            sink_format = self._io_format(stage, "sink")
+            
+            if i == 0:
+                lines.append(f"{indent}# Stage {i + 1}: Data input{stage_line_comment}")
+                lines.append(f"{indent}query = {self._generate_scan(stage, column_types)}")
+                if self._io_format(stage, "source") in TEXT_FORMATS:
+                    lines.extend(self._generate_conversions(column_types, indent))
+            elif sink_format is not None:
+                lines.append(f"{indent}# Stage {i + 1}: Data output{stage_line_comment}")
+                lines.append(f"{indent}{self._generate_sink(stage, sink_format)}")
+            elif stage_call(stage) == "filter" and stage.operation.arguments:
+                lines.append(f"{indent}# Stage {i + 1}: Data filtering{stage_line_comment}")
+                lines.append(f"{indent}{self._generate_filter(stage.operation.arguments[0])}")
+            elif stage_call(stage) == "transform" and stage.operation.arguments:
+                lines.append(f"{indent}# Stage {i + 1}: Data transformation{stage_line_comment}")
+                lines.extend(indent + line for line in self._generate_transform(stage.operation.arguments[0]))
+            else:
+                lines.append(f"{indent}# Stage {i + 1}: Custom operation{stage_line_comment}")
+                lines.append(f"{indent}query = query.pipe(lambda x: {stage.accept(self)})")
+            lines.append("")
+        
+        lines.extend([
+            f"{indent}# Pipeline built successfully",
+            f"{indent}return query",
+            "",
+            "    except Exception as e:",
+            "        # Log error for debugging while preserving original exception",
+            "        error_info = {",
+            "            'error': str(e),",
+            "            'error_type': type(e).__name__,",
+            f"            'method': '{method_name}',",
+            f"            'source_file': '{self.source_filename or 'unknown'}'",
+            "        }",
+            "        self.validation_errors.append(error_info)",
+            "        raise  # Re-raise for proper error handling",
+        ])
+        
+        return "\n".join(lines)
+    
+    def _generate_scan(self, stage: PipelineStage, column_types: Dict[str, ColumnType]) -> str:
+        """
+        Generate the lazy frame for a source stage.
+        
+        CSV sources are scanned lazily with known column types given through
+        schema_overrides=. JSON sources are read whole, as in the pandas
+        target, except in streaming mode where they are scanned as JSON lines.
+        Parquet and Arrow IPC files are scanned with their stored types.
+        """
+        source_format = self._io_format(stage, "source")
+        if source_format is None:
+            return f"pl.LazyFrame({stage.accept(self)})"
+        
+        arguments = [stage.operation.arguments[0].accept(self) if stage.operation.arguments else '""']
+        if source_format == "csv":
+            overrides = {column: POLARS_DTYPES[column_type.dtype] for column, column_type in column_types.items()
+                         if column_type.dtype in POLARS_DTYPES}
+            if overrides:
+                entries = ", ".join(f"{column!r}: {dtype}" for column, dtype in overrides.items())
+                arguments.append(f"schema_overrides={{{entries}}}")
+            return f"pl.scan_csv({', '.join(arguments)})"
+        elif source_format == "parquet":
+            return f"pl.scan_parquet({', '.join(arguments)})"
+        elif source_format == "arrow":
+            return f"pl.scan_ipc({', '.join(arguments)})"
+        elif self.streaming:
+            return f"pl.scan_ndjson({', '.join(arguments)})"
+        return f"pl.read_json({', '.join(arguments)}).lazy()"
+    
+    def _generate_conversions(self, column_types: Dict[str, ColumnType], indent: str) -> List[str]:
+        """
+        Generate the date parsing applied right after the scan.
+        
+        Integer columns need no downcast: Polars stores them unboxed already.
+        """
+        conversions = [f"pl.col({column!r}).str.to_datetime({column_type.date_format!r})"
+                       for column, column_type in column_types.items() if column_type.is_date]
+        if not conversions:
+            return []
+        return [f"{indent}query = query.with_columns({', '.join(conversions)})"]
+    
+    def _generate_sink(self, stage: PipelineStage, sink_format: str) -> str:
+        """
+        Generate the statement that executes the query into a sink.
+        
+        CSV, Parquet and Arrow IPC sinks stream through sink_csv(),
+        sink_parquet() and sink_ipc(). JSON sinks collect the result and
+        write one JSON array like the pandas target; in streaming mode they
+        are written as JSON lines through sink_ndjson() instead.
+        """
+        sink_file = stage.operation.arguments[0].accept(self) if stage.operation.arguments else '""'
+        if sink_format in COLUMNAR_FORMATS:
+            arguments = [sink_file]
+            options = self._sink_options(stage.operation)
+            if "compression" in options:
+                arguments.append(f"compression={options['compression']!r}")
+            if "row_group_size" in options and sink_format == "parquet":
+                arguments.append(f"row_group_size={options['row_group_size']!r}")
+            method = "sink_parquet" if sink_format == "parquet" else "sink_ipc"
+            return f"query.{method}({', '.join(arguments)})"
+        elif sink_format == "csv":
+            return f"query.sink_csv({sink_file})"
+        elif self.streaming:
+            return f"query.sink_ndjson({sink_file})"
+        return f"query.collect().write_json({sink_file})"
+    
+    def _generate_filter(self, predicate: Expression) -> str:
+        """
+        Generate the statement for a filter stage.
+        
+        Lambda predicates become Polars expressions; predicates without one
+        (e.g. calls to helper functions) are evaluated row by row on a
+        struct of all columns.
+        """
+        if isinstance(predicate, LambdaExpression):
+            description = f"{predicate.parameter} => {predicate.body.accept(self)}"
+            expression_generator = PolarsExpressionGenerator(predicate.parameter)
+            try:
+                expression = expression_generator.generate(predicate.body)
+                if expression_generator.columns:
+                    return f"query = query.filter({expression})  # Filter: {description}"
+            except VectorizationError:
+                pass
+        
+        self.imports.add("from types import SimpleNamespace")
+        return (f"query = query.filter(pl.struct(pl.all()).map_elements("
+                f"lambda row: bool(({predicate.accept(self)})(SimpleNamespace(**row))), return_dtype=pl.Boolean))")
+    
+    def _generate_transform(self, function: Expression) -> List[str]:
+        """
+        Generate the statements for a transform stage.
+        
+        A lambda building a record becomes a select() with one expression per
+        field; fields that read no column are wrapped in pl.lit(). Other
+        transforms collect the query and are applied row by row.
+        """
+        if isinstance(function, LambdaExpression) and isinstance(function.body, ObjectLiteral):
+            expression_generator = PolarsExpressionGenerator(function.parameter)
+            try:
+                fields = []
+                for name, value in function.body.fields.items():
+                    expression = expression_generator.generate(value)
+                    if referenced_columns(replace(function, body=value)) == []:
+                        expression = f"pl.lit({expression})"  # A constant such as -1 or 1 + 2 is a plain Python value
+                    fields.append(f"{expression}.alias({name!r})")
+            except VectorizationError:
+                pass
+            else:
+                lines = ["query = query.select("]
+                lines.extend(f"    {field}," for field in fields)
+                lines.append(")")
+                return lines
+        
+        self.imports.add("from types import SimpleNamespace")
+        return [
+            f"records = [({function.accept(self)})(SimpleNamespace(**row)) for row in query.collect().iter_rows(named=True)]",
+            "query = pl.LazyFrame(records)",
+        ]
+
+
+class PolarsPlugin(BasePlugin):
+    """Polars lazy query generator."""
+    
+    plugin_name = "polars"
+    plugin_description = "Generate Polars lazy queries with multi-threaded, streaming execution"
+    plugin_version = "1.0.0"
+    plugin_dependencies = ["polars>=1.0"]
+    plugin_optional_dependencies = ["pyarrow>=14.0"]
+    plugin_output_extension = ".py"
+    plugin_supports_async = False
+    plugin_supports_web = False
+    plugin_supports_database = False
+    plugin_supports_auth = False
+    
+    @property
+    def name(self) -> str:
+        return "polars"
+    
+    @property
+    def description(self) -> str:
+        return "Generate Polars lazy queries with predicate/projection pushdown and streaming"
+    
+    def generate_code(self, ast: Program, context: GenerationContext) -> Dict[str, str]:
+        """Generate a Polars module from AgentScript AST."""
+        files = {}
+        
+        if not any(isinstance(stmt, IntentDeclaration) for stmt in ast.statements):
+            return files
+        
+        generator = PolarsCodeGenerator(str(context.source_file), streaming=context.options.get('streaming', False))
+        files[f"{context.source_file.stem}.py"] = generator.generate(ast)
+        files["requirements.txt"] = "\n".join(self.get_dependencies(context)) + "\n"
+        
+        return files
+    
+    def get_dependencies(self, context: GenerationContext) -> List[str]:
+        """Get required dependencies for the generated module."""
+        return self.plugin_dependencies.copy()
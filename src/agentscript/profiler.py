@@ -0,0 +1,287 @@
+"""
+AgentScript Profiler
+
+Profiling of AgentScript programs at run time and of the compiler itself.
+
+profile_module() runs the pipelines of a compiled program under cProfile and
+reports where the time went per intent and per .ags line, using the source
+map of the generated module. cProfile only knows functions, and a pipeline
+is one generated method, so the time of each line of the pipeline methods
+(including everything the line calls) is measured alongside it with a line
+tracer that is confined to those methods.
+
+CompileProfile measures the phases of compiling one file (read, lex, parse,
+optimize, generate, write) for agentscript compile --profile: wall time and,
+while tracemalloc is tracing, the memory each phase allocated.
+"""
+
+import cProfile
+import linecache
+import pstats
+import sys
+import tracemalloc
+import types
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields, asdict
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional, Any, Set, Tuple, Iterator
+
+from .ast_nodes import ASTNode, Program
+from .lexer import Lexer
+from .parser import Parser
+from .sourcemap import SourceMap
+
+
+class LineTimer:
+    """Measures the wall time of each line of selected functions of one file."""
+    
+    def __init__(self, filename: str, functions: Set[str]):
+        self.filename = filename
+        self.functions = functions
+        self.times: Dict[int, float] = {}                 # Python line -> seconds
+        self._current: Dict[types.FrameType, Tuple[int, float]] = {}
+    
+    def start(self):
+        """Start timing lines of functions called from now on."""
+        sys.settrace(self._trace_calls)
+    
+    def stop(self):
+        """Stop timing."""
+        sys.settrace(None)
+    
+    def _trace_calls(self, frame: types.FrameType, event: str, arg: Any):
+        """Global trace function: only trace the frames of the selected functions."""
+        code = frame.f_code
+        if event == 'call' and code.co_filename == self.filename and code.co_name in self.functions:
+            return self._trace_lines
+        return None
+    
+    def _trace_lines(self, frame: types.FrameType, event: str, arg: Any):
+        """Local trace function: charge the time since the last event to the running line."""
+        now = perf_counter()
+        running = self._current.get(frame)
+        if running is not None:
+            line, started = running
+            self.times[line] = self.times.get(line, 0.0) + now - started
+        
+        if event == 'return':
+            self._current.pop(frame, None)
+        else:
+            self._current[frame] = (frame.f_lineno, now)
+        return self._trace_lines
+
+
+@dataclass
+class ProfileReport:
+    """Time per intent and per AgentScript line of one profiled run."""
+    source: str
+    total_seconds: float
+    intents: List[Dict[str, Any]] = field(default_factory=list)
+    lines: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the report as plain data, e.g. for JSON output."""
+        return asdict(self)
+    
+    def format(self, limit: Optional[int] = None) -> str:
+        """Format the report as text tables, hottest first."""
+        total = self.total_seconds or 1.0
+        output = [f"Profile of {self.source}: {self.total_seconds:.3f}s", ""]
+        
+        output.append("Cumulative time per intent:")
+        output.append(f"  {'seconds':>10}  {'share':>6}  intent")
+        for intent in self.intents:
+            outcome = f"  FAILED: {intent['error']}" if intent.get('error') else ""
+            output.append(f"  {intent['seconds']:>10.3f}  {intent['seconds'] / total:>6.1%}  "
+                          f"{intent['name']} ({self.source}:{intent['line']}){outcome}")
+        output.append("")
+        
+        output.append("Cumulative time per AgentScript line:")
+        output.append(f"  {'seconds':>10}  {'share':>6}  line")
+        for line in self.lines[:limit]:
+            output.append(f"  {line['seconds']:>10.3f}  {line['seconds'] / total:>6.1%}  "
+                          f"{self.source}:{line['line']}  {line['code']}")
+        
+        return "\n".join(output)
+
+
+def profile_module(python_code: str, source_map: SourceMap, source_code: str,
+                   intents: Optional[List[str]] = None) -> Tuple[ProfileReport, pstats.Stats]:
+    """
+    Run the pipeline of every intent in a generated module and profile it.
+    
+    Intents run in declaration order, each on a new instance of its class;
+    intents restricts the run to the named ones. An intent that fails is
+    reported with its error and the remaining intents still run.
+    """
+    unknown = set(intents or []) - {intent['name'] for intent in source_map.intents}
+    if unknown:
+        raise ValueError(f"No intent named {', '.join(sorted(unknown))} in {source_map.source}")
+    selected = [intent for intent in source_map.intents
+                if intent.get('method') and (not intents or intent['name'] in intents)]
+    
+    filename = source_map.generated
+    lines = python_code.splitlines(keepends=True)
+    linecache.cache[filename] = (len(python_code), None, lines, filename)  # For tracebacks
+    
+    module = types.ModuleType(Path(filename).stem)
+    module.__file__ = filename
+    exec(compile(python_code, filename, 'exec'), module.__dict__)
+    
+    profiler = cProfile.Profile()
+    timer = LineTimer(filename, {intent['method'] for intent in selected})
+    errors: Dict[str, str] = {}
+    started = perf_counter()
+    for intent in selected:
+        instance = getattr(module, intent['class'])()
+        profiler.enable()
+        timer.start()
+        try:
+            getattr(instance, intent['method'])()
+        except Exception as e:
+            errors[intent['name']] = f"{type(e).__name__}: {e}"
+        finally:
+            timer.stop()
+            profiler.disable()
+    total_seconds = perf_counter() - started
+    
+    stats = pstats.Stats(profiler)
+    report = ProfileReport(source=source_map.source, total_seconds=total_seconds)
+    
+    # cProfile has the cumulative time of each pipeline method
+    method_times = {}
+    for (function_file, _, function_name), (_, calls, _, cumulative, _) in stats.stats.items():
+        if function_file == filename:
+            method_times[function_name] = (calls, cumulative)
+    for intent in selected:
+        calls, seconds = method_times.get(intent['method'], (0, 0.0))
+        report.intents.append({
+            'name': intent['name'],
+            'line': intent['line'],
+            'calls': calls,
+            'seconds': seconds,
+            'error': errors.get(intent['name']),
+        })
+    report.intents.sort(key=lambda intent: intent['seconds'], reverse=True)
+    
+    # The line timer's times are summed over the Python lines of each .ags line
+    ags_times: Dict[int, float] = {}
+    for python_line, seconds in timer.times.items():
+        ags_line = source_map.ags_line(python_line)
+        if ags_line is not None:
+            ags_times[ags_line] = ags_times.get(ags_line, 0.0) + seconds
+    
+    source_lines = source_code.splitlines()
+    for ags_line, seconds in ags_times.items():
+        intent = source_map.intent_at(ags_line)
+        code = source_lines[ags_line - 1].strip() if 0 < ags_line <= len(source_lines) else ''
+        report.lines.append({
+            'line': ags_line,
+            'seconds': seconds,
+            'intent': intent['name'] if intent else None,
+            'code': code,
+        })
+    report.lines.sort(key=lambda line: line['seconds'], reverse=True)
+    
+    return report, stats
+
+
+def count_nodes(node: Any) -> int:
+    """Count the AST nodes in a tree."""
+    if isinstance(node, ASTNode):
+        return 1 + sum(count_nodes(getattr(node, field.name)) for field in fields(node))
+    if isinstance(node, (list, tuple)):
+        return sum(count_nodes(item) for item in node)
+    if isinstance(node, dict):
+        return sum(count_nodes(item) for item in node.values())
+    return 0
+
+
+@dataclass
+class PhaseMeasurement:
+    """Cost of one compilation phase."""
+    phase: str
+    seconds: float
+    allocated_bytes: int = 0                            # Net growth of traced memory
+    peak_bytes: int = 0                                 # Peak traced memory above the phase's start
+                                                        # (Python 3.8: peak since tracing started)
+
+
+@dataclass
+class CompileProfile:
+    """Phase costs and sizes of compiling one file."""
+    source: str
+    target: str
+    phases: List[PhaseMeasurement] = field(default_factory=list)
+    tokens: int = 0
+    ast_nodes: int = 0
+    generated_bytes: int = 0
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the code run in the with block as a phase."""
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            if hasattr(tracemalloc, 'reset_peak'):      # Python 3.9+
+                tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            measurement = PhaseMeasurement(phase=name, seconds=perf_counter() - started)
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                measurement.allocated_bytes = current - start_memory
+                measurement.peak_bytes = peak - start_memory
+            self.phases.append(measurement)
+    
+    def parse(self, source: str, filename: Optional[str] = None) -> Program:
+        """
+        Lex and parse source as separate phases.
+        
+        The compiler normally streams tokens into the parser; here the token
+        list is built first so the two phases can be told apart.
+        """
+        with self.phase('lex'):
+            tokens = Lexer(source, filename).tokenize()
+        self.tokens = len(tokens)
+        
+        with self.phase('parse'):
+            program = Parser(tokens).parse()
+        self.ast_nodes = count_nodes(program)
+        return program
+    
+    @property
+    def total_seconds(self) -> float:
+        """Wall time of all phases."""
+        return sum(measurement.seconds for measurement in self.phases)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the profile as plain data, e.g. for JSON output."""
+        data = asdict(self)
+        data['total_seconds'] = self.total_seconds
+        return data
+    
+    def format(self) -> str:
+        """Format the profile as a text table."""
+        output = [f"Compile profile of {self.source} ({self.target}): {self.total_seconds * 1000:.1f} ms",
+                  f"  {'phase':<10} {'ms':>10} {'allocated':>12} {'peak':>12}"]
+        for measurement in self.phases:
+            output.append(f"  {measurement.phase:<10} {measurement.seconds * 1000:>10.2f} "
+                          f"{_format_bytes(measurement.allocated_bytes):>12} "
+                          f"{_format_bytes(measurement.peak_bytes):>12}")
+        output.append(f"  {self.tokens} tokens, {self.ast_nodes} AST nodes, "
+                      f"{_format_bytes(self.generated_bytes)} generated")
+        return "\n".join(output)
+
+
+def _format_bytes(size: int) -> str:
+    """Format a byte count with a binary unit."""
+    value = float(size)
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
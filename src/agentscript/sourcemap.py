@@ -0,0 +1,104 @@
+"""
+AgentScript Source Maps
+
+Maps lines of generated Python back to the .ags lines they were compiled
+from, so that profiles and tracebacks of generated code can be reported
+where agents actually edit. The compiler writes the map of pipeline.py next
+to it as pipeline.py.map:
+
+    {"version": 1, "source": "pipeline.ags", "generated": "pipeline.py",
+     "mappings": {"57": 10, "58": 10, "62": 11},
+     "intents": [{"name": "ProcessUsers", "class": "ProcessUsers",
+                  "method": "process_users", "line": 7}]}
+
+Mappings are keyed by 1-based Python line; lines of module-level helpers
+have no AgentScript line and are left out.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from .codegen import PythonCodeGenerator
+
+
+# Bump when the map layout changes so tools can reject maps they don't understand
+SOURCE_MAP_VERSION = 1
+
+SOURCE_MAP_SUFFIX = '.map'
+
+
+@dataclass
+class SourceMap:
+    """Python line to AgentScript line map of one generated module."""
+    source: str                                         # The .ags file
+    generated: str                                      # The generated .py file
+    mappings: Dict[int, int] = field(default_factory=dict)
+    intents: List[Dict[str, Any]] = field(default_factory=list)
+    
+    @classmethod
+    def from_generator(cls, generator: PythonCodeGenerator, generated: str) -> 'SourceMap':
+        """Build the map of the code a generator produced last."""
+        return cls(
+            source=generator.source_filename or 'unknown',
+            generated=generated,
+            mappings=dict(generator.line_mappings),
+            intents=[dict(intent) for intent in generator.intents],
+        )
+    
+    def ags_line(self, python_line: int) -> Optional[int]:
+        """Get the AgentScript line a Python line was generated from."""
+        return self.mappings.get(python_line)
+    
+    def intent_at(self, ags_line: int) -> Optional[Dict[str, Any]]:
+        """Get the intent whose declaration contains an AgentScript line."""
+        containing = None
+        for intent in sorted(self.intents, key=lambda intent: intent['line']):
+            if intent['line'] > ags_line:
+                break
+            containing = intent
+        return containing
+    
+    def to_json(self) -> str:
+        """Serialize the map in the sidecar file format."""
+        return json.dumps({
+            'version': SOURCE_MAP_VERSION,
+            'source': self.source,
+            'generated': self.generated,
+            'mappings': {str(line): ags_line for line, ags_line in sorted(self.mappings.items())},
+            'intents': self.intents,
+        }, indent=1)
+    
+    @classmethod
+    def from_json(cls, text: str) -> 'SourceMap':
+        """Read a map in the sidecar file format."""
+        data = json.loads(text)
+        if data.get('version') != SOURCE_MAP_VERSION:
+            raise ValueError(f"Unsupported source map version: {data.get('version')}")
+        
+        return cls(
+            source=data['source'],
+            generated=data['generated'],
+            mappings={int(line): ags_line for line, ags_line in data['mappings'].items()},
+            intents=data.get('intents', []),
+        )
+    
+    def write(self, path: Path):
+        """Write the map to a sidecar file, replacing it atomically."""
+        path = Path(path)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(self.to_json(), encoding='utf-8')
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def load(cls, path: Path) -> 'SourceMap':
+        """Read the map from a sidecar file."""
+        return cls.from_json(Path(path).read_text(encoding='utf-8'))
+
+
+def source_map_path(generated_file: Path) -> Path:
+    """Get the sidecar file holding the source map of a generated module."""
+    generated_file = Path(generated_file)
+    return generated_file.with_name(generated_file.name + SOURCE_MAP_SUFFIX)
@@ -0,0 +1,217 @@
+"""
+AgentScript Source Statistics
+
+Per-column statistics of pipeline source files, used by the optimizer to
+estimate how selective each filter predicate is. Statistics are collected
+from a sample of the file with the standard library (the compiler itself
+does not need pandas) and cached on disk keyed by the file's path, size and
+modification time, so a source is only sampled again after it changes.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Optional, Any, Union
+
+from .cache import default_cache_dir
+
+
+# Bump when the statistics layout changes so stale entries are never read back
+STATS_FORMAT_VERSION = 1
+
+# Distinct values tracked per column before the column counts as high-cardinality
+MAX_TRACKED_DISTINCT = 10_000
+
+
+@dataclass
+class ColumnStatistics:
+    """Statistics for one source column."""
+    null_fraction: float = 0.0
+    distinct: int = 0                                   # Approximate number of distinct values
+    minimum: Optional[Union[float, str]] = None
+    maximum: Optional[Union[float, str]] = None
+    numeric: bool = False                               # All non-null values parse as numbers
+
+
+@dataclass
+class SourceStatistics:
+    """Statistics for a source file."""
+    path: str
+    row_count: int                                      # Estimated if only a sample was read
+    sampled_rows: int
+    columns: Dict[str, ColumnStatistics] = field(default_factory=dict)
+    
+    def column(self, name: str) -> Optional[ColumnStatistics]:
+        """Get the statistics for a column, if it was seen."""
+        return self.columns.get(name)
+
+
+def collect_csv_statistics(path: Path, sample_rows: int = 100_000) -> SourceStatistics:
+    """
+    Collect column statistics from the first sample_rows rows of a CSV file.
+    
+    The row count is extrapolated from the sample's average row size when
+    the file is larger than the sample, and so is the distinct count of
+    columns whose sampled values were nearly all different.
+    """
+    with open(path, newline='', encoding='utf-8', errors='replace') as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None) or []
+        
+        nulls = [0] * len(header)
+        values = [set() for _ in header]
+        numeric = [True] * len(header)
+        minimums = [None] * len(header)
+        maximums = [None] * len(header)
+        
+        rows = 0
+        truncated = False
+        for row in reader:
+            if rows >= sample_rows:
+                truncated = True
+                break
+            rows += 1
+            
+            for index in range(len(header)):
+                value = row[index] if index < len(row) else ''
+                if value == '':
+                    nulls[index] += 1
+                    continue
+                
+                if len(values[index]) < MAX_TRACKED_DISTINCT:
+                    values[index].add(value)
+                
+                if numeric[index]:
+                    try:
+                        number = float(value)
+                    except ValueError:
+                        numeric[index] = False
+                    else:
+                        if minimums[index] is None or number < minimums[index]:
+                            minimums[index] = number
+                        if maximums[index] is None or number > maximums[index]:
+                            maximums[index] = number
+    
+    row_count = rows
+    if truncated:
+        # Only part of the file was read: extrapolate from the average row size
+        file_size = os.path.getsize(path)
+        row_count = max(rows, int(file_size * rows / max(1, _sampled_bytes(path, rows))))
+    
+    columns = {}
+    for index, name in enumerate(header):
+        non_null = rows - nulls[index]
+        distinct = len(values[index])
+        if row_count > rows and non_null and distinct >= 0.9 * non_null:
+            distinct = int(distinct * row_count / rows)  # Looks unique: scale with the data
+        
+        minimum, maximum = minimums[index], maximums[index]
+        if not numeric[index] and values[index]:
+            minimum, maximum = min(values[index]), max(values[index])
+        
+        columns[name] = ColumnStatistics(
+            null_fraction=nulls[index] / rows if rows else 0.0,
+            distinct=distinct,
+            minimum=minimum,
+            maximum=maximum,
+            numeric=numeric[index] and non_null > 0,
+        )
+    
+    return SourceStatistics(path=str(path), row_count=row_count, sampled_rows=rows, columns=columns)
+
+
+def _sampled_bytes(path: Path, rows: int) -> int:
+    """Get the size in bytes of the header and the first rows lines of a file."""
+    size = 0
+    with open(path, 'rb') as handle:
+        for _ in range(rows + 1):
+            line = handle.readline()
+            if not line:
+                break
+            size += len(line)
+    return size
+
+
+class StatisticsCache:
+    """Caches source statistics on disk, keyed by path, size and modification time."""
+    
+    def __init__(self, cache_dir: Optional[Path] = None, sample_rows: int = 100_000):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / 'stats'
+        self.sample_rows = sample_rows
+        self._memory: Dict[str, Optional[SourceStatistics]] = {}
+    
+    def get(self, path: Path) -> Optional[SourceStatistics]:
+        """
+        Get statistics for a source file, collecting them if needed.
+        
+        Returns None for files that do not exist or cannot be read; only
+        CSV sources are supported.
+        """
+        path = Path(path)
+        if path.suffix.lower() != '.csv':
+            return None
+        
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        
+        key = self._make_key(path, stat.st_size, stat.st_mtime_ns)
+        if key in self._memory:
+            return self._memory[key]
+        
+        statistics = self._read(key)
+        if statistics is None:
+            try:
+                statistics = collect_csv_statistics(path, self.sample_rows)
+            except (OSError, UnicodeError, csv.Error):
+                statistics = None
+            else:
+                self._write(key, statistics)
+        
+        self._memory[key] = statistics
+        return statistics
+    
+    def _make_key(self, path: Path, size: int, mtime_ns: int) -> str:
+        """Build the cache key for a version of a file."""
+        identity = f"{STATS_FORMAT_VERSION}:{path.resolve()}:{size}:{mtime_ns}:{self.sample_rows}"
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+    
+    def _entry_path(self, key: str) -> Path:
+        """Get the file holding the statistics for a key."""
+        return self.cache_dir / f"{key}.stats"
+    
+    def _read(self, key: str) -> Optional[SourceStatistics]:
+        """Read cached statistics, or None on a miss."""
+        try:
+            data = json.loads(self._entry_path(key).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        
+        if data.get('format') != STATS_FORMAT_VERSION:
+            return None
+        
+        columns = {name: ColumnStatistics(**column) for name, column in data['columns'].items()}
+        return SourceStatistics(
+            path=data['path'],
+            row_count=data['row_count'],
+            sampled_rows=data['sampled_rows'],
+            columns=columns,
+        )
+    
+    def _write(self, key: str, statistics: SourceStatistics):
+        """Store statistics; like the compilation cache this is best effort."""
+        data: Dict[str, Any] = asdict(statistics)
+        data['format'] = STATS_FORMAT_VERSION
+        
+        entry_path = self._entry_path(key)
+        temp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps(data), encoding='utf-8')
+            os.replace(temp_path, entry_path)
+        except OSError:
+            pass
@@ -0,0 +1,179 @@
+"""
+AgentScript Watch Mode
+
+Recompiles AgentScript files as they change. The lexer, parser and plugin
+registry stay loaded between builds, and each file's previous AST is kept so
+that only the top-level statements (intents, behaviors, resources, imports)
+whose source text changed are parsed again.
+"""
+
+import copy
+import sys
+import time
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any, Callable
+
+from .lexer import Lexer, TokenType
+from .parser import Parser
+from .ast_nodes import ASTNode, Position, Program, Statement
+
+
+# Tokens that begin a top-level statement
+STATEMENT_KEYWORDS = (TokenType.USE, TokenType.INTENT, TokenType.BEHAVIOR, TokenType.RESOURCE)
+
+
+class IncrementalParser:
+    """
+    Parses AgentScript files, reusing AST nodes for unchanged statements.
+    
+    Sources are split into segments at every top-level statement keyword.
+    A segment whose text is identical to one from the previous parse of the
+    same file reuses its statements (a copy with shifted line numbers if the segment
+    moved); all other segments are parsed on their own.
+    """
+    
+    def __init__(self):
+        self._segments: Dict[str, Dict[str, List[Tuple[int, List[Statement]]]]] = {}
+        self.reparsed = 0
+        self.reused = 0
+    
+    def parse(self, source: str, filename: Optional[str] = None) -> Program:
+        """Parse source code, reusing statements from the previous parse of filename."""
+        self.reparsed = 0
+        self.reused = 0
+        
+        # Work on copies so that a parse that fails part-way leaves the stored segments untouched
+        previous = {text: list(entries) for text, entries in self._segments.get(filename or '', {}).items()}
+        current: Dict[str, List[Tuple[int, List[Statement]]]] = {}
+        statements: List[Statement] = []
+        
+        for start_line, text in self._split_segments(source, filename):
+            candidates = previous.get(text)
+            if candidates:
+                old_line, segment_statements = candidates.pop()
+                if start_line != old_line:
+                    segment_statements = copy.deepcopy(segment_statements)
+                    self._shift_positions(segment_statements, start_line - old_line)
+                self.reused += len(segment_statements)
+            else:
+                segment_statements = self._parse_segment(text, start_line, filename)
+                self.reparsed += len(segment_statements)
+            
+            current.setdefault(text, []).append((start_line, segment_statements))
+            statements.extend(segment_statements)
+        
+        self._segments[filename or ''] = current
+        
+        return Program(
+            statements=statements,
+            position=Position(1, 1, sys.intern(filename) if filename else filename)
+        )
+    
+    def forget(self, filename: Optional[str] = None):
+        """Drop cached statements for one file, or for every file."""
+        if filename is None:
+            self._segments.clear()
+        else:
+            self._segments.pop(filename, None)
+    
+    def _split_segments(self, source: str, filename: Optional[str]) -> List[Tuple[int, str]]:
+        """Split source into (start line, text) segments, one per top-level statement."""
+        starts = [1]
+        depth = 0
+        
+        for token in Lexer(source, filename).iter_tokens():
+            if token.type == TokenType.LBRACE:
+                depth += 1
+            elif token.type == TokenType.RBRACE:
+                depth = max(0, depth - 1)
+            elif depth == 0 and token.type in STATEMENT_KEYWORDS and token.line > starts[-1]:
+                starts.append(token.line)
+        
+        lines = source.splitlines(keepends=True)
+        segments = []
+        for index, start in enumerate(starts):
+            end = starts[index + 1] if index + 1 < len(starts) else len(lines) + 1
+            segments.append((start, "".join(lines[start - 1:end - 1])))
+        
+        return segments
+    
+    def _parse_segment(self, text: str, start_line: int, filename: Optional[str]) -> List[Statement]:
+        """Parse one segment as if it were still at start_line of the full file."""
+        lexer = Lexer(text, filename)
+        lexer.line = start_line
+        return list(Parser(lexer.iter_tokens()).iter_statements())
+    
+    def _shift_positions(self, statements: List[Statement], delta: int):
+        """Move every position in the given statements by delta lines."""
+        seen = set()
+        
+        def shift(value: Any):
+            if isinstance(value, Position):
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    value.line += delta
+            elif isinstance(value, ASTNode):
+                for field in fields(value):
+                    shift(getattr(value, field.name))
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    shift(item)
+            elif isinstance(value, dict):
+                for item in value.values():
+                    shift(item)
+        
+        shift(statements)
+
+
+def watch_files(
+    files: List[Path],
+    compile_one: Callable[[Path, Callable[[str, str], Program]], int],
+    interval: float = 0.5
+) -> int:
+    """
+    Poll files for changes and recompile them until interrupted.
+    
+    Args:
+        files: AgentScript files to watch
+        compile_one: Compiles a single file using the given parse function
+        interval: Seconds between modification-time checks
+    
+    Returns:
+        Exit code of the last build (0 if it succeeded)
+    """
+    parser = IncrementalParser()
+    mtimes: Dict[Path, int] = {}
+    exit_code = 0
+    
+    print(f"👀 Watching {len(files)} file(s) for changes (Ctrl+C to stop)...")
+    
+    try:
+        while True:
+            for file_path in files:
+                try:
+                    mtime = file_path.stat().st_mtime_ns
+                except OSError:
+                    if mtimes.pop(file_path, None) is not None:
+                        print(f"Warning: {file_path} is no longer available", file=sys.stderr)
+                        parser.forget(str(file_path))
+                    continue
+                
+                if mtimes.get(file_path) == mtime:
+                    continue
+                mtimes[file_path] = mtime
+                
+                parser.reparsed = parser.reused = 0
+                started = time.perf_counter()
+                exit_code = compile_one(file_path, parser.parse)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                
+                if exit_code == 0:
+                    print(f"   {parser.reparsed} statement(s) re-parsed, "
+                          f"{parser.reused} reused in {elapsed_ms:.1f}ms")
+            
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    
+    return exit_code
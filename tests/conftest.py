@@ -0,0 +1,43 @@
+"""
+Shared pytest configuration: run the tests against the source tree, and
+compile and run AgentScript programs in a temporary directory.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from agentscript.codegen import PythonCodeGenerator  # noqa: E402
+from agentscript.optimizer import optimize_program  # noqa: E402
+from agentscript.parser import parse_agentscript  # noqa: E402
+
+
+def compile_program(source: str, opt_level: int = 0, statistics=None, **options) -> str:
+    """Compile AgentScript source to pandas code."""
+    program = optimize_program(parse_agentscript(source, "test.ags"), opt_level, statistics)
+    return PythonCodeGenerator("test.ags", **options).generate(program)
+
+
+def run_program(source: str, opt_level: int = 0, statistics=None, **options):
+    """Compile a program and run the pipeline of every intent; returns {intent method: result}."""
+    generator = PythonCodeGenerator("test.ags", **options)
+    program = optimize_program(parse_agentscript(source, "test.ags"), opt_level, statistics)
+    module = types.ModuleType("generated")
+    exec(compile(generator.generate(program), "generated.py", "exec"), module.__dict__)
+
+    results = {}
+    for intent in generator.intents:
+        if intent["method"]:
+            results[intent["method"]] = getattr(getattr(module, intent["class"])(), intent["method"])()
+    return results
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run the test in an empty temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,99 @@
+"""
+Tests for the column type inference that generated readers rely on: types
+inferred from filter literals must never change what a pipeline computes.
+"""
+
+import pandas as pd
+import pytest
+
+from agentscript.analysis import ColumnType, infer_column_types
+from agentscript.parser import parse_agentscript
+from agentscript.plugins.polars_plugin import PolarsCodeGenerator
+
+from conftest import compile_program, run_program
+
+
+ORDERS = "qty,country,city\n100,US,Austin\n120,US,Boston\n90,DE,Berlin\n30,US,Miami\n"
+
+
+def pipeline_types(stages: str):
+    source = f'intent Orders {{\n    pipeline: source.csv("orders.csv") -> {stages}\n}}\n'
+    program = parse_agentscript(source, "test.ags")
+    return infer_column_types(program.statements[0].pipeline)
+
+
+def run_orders(workdir, stages: str) -> pd.DataFrame:
+    (workdir / "orders.csv").write_text(ORDERS)
+    source = f'use io.csv\n\nintent Orders {{\n    pipeline: source.csv("orders.csv") -> {stages}\n}}\n'
+    return run_program(source)["orders"]
+
+
+def test_columns_only_compared_to_literals_are_narrowed():
+    types = pipeline_types('filter(u => u.qty > 50 and u.country == "US" and u.city contains "o")')
+    assert types == {
+        "qty": ColumnType(downcast="integer", inferred=True),
+        "country": ColumnType(dtype="category", inferred=True),
+        "city": ColumnType(dtype="str", inferred=True),
+    }
+
+
+@pytest.mark.parametrize("stages, column", [
+    ("filter(u => u.qty > 50) -> transform(u => {doubled: u.qty + u.qty})", "qty"),
+    ("filter(u => u.qty > 50) -> transform(u => {scaled: u.qty * 1000})", "qty"),
+    ("filter(u => u.qty + 5 > 50)", "qty"),
+    ('filter(u => u.country == "US") -> transform(u => {place: u.country + "-" + u.city})', "country"),
+    ('filter(u => u.country == "US") -> filter(u => u.country > "A")', "country"),
+    ('filter(u => u.country == "US") -> transform(u => {country: u.country})', "country"),
+])
+def test_columns_used_beyond_literal_comparisons_keep_their_type(stages, column):
+    assert column not in pipeline_types(stages)
+
+
+def test_whole_record_use_disables_inference():
+    assert pipeline_types('filter(u => u.qty > 50) -> transform(u => check(u))') == {}
+
+
+def test_arithmetic_on_filtered_column_does_not_overflow(workdir):
+    result = run_orders(workdir, "filter(u => u.qty > 50) -> transform(u => {doubled: u.qty + u.qty})")
+    assert result["doubled"].tolist() == [200, 240, 180]
+
+    result = run_orders(workdir, "filter(u => u.qty > 50) -> transform(u => {scaled: u.qty * 1000})")
+    assert result["scaled"].tolist() == [100000, 120000, 90000]
+
+
+def test_concatenating_filtered_column(workdir):
+    result = run_orders(workdir, 'filter(u => u.country == "US") -> transform(u => {place: u.country + "-" + u.city})')
+    assert result["place"].tolist() == ["US-Austin", "US-Boston", "US-Miami"]
+
+
+def test_narrowed_columns_keep_output_values(workdir):
+    result = run_orders(workdir, 'filter(u => u.qty > 50 and u.country in ["US", "DE"])')
+    assert result["qty"].tolist() == [100, 120, 90]
+    assert result["country"].astype(str).tolist() == ["US", "US", "DE"]
+
+    code = compile_program('use io.csv\n\nintent Orders {\n    pipeline: source.csv("orders.csv") -> '
+                           'filter(u => u.qty > 50 and u.country in ["US", "DE"])\n}\n')
+    assert "dtype={'country': 'category'}" in code
+    assert "downcast='integer'" in code
+
+
+def test_polars_scan_only_overrides_compared_columns():
+    source = ('intent Orders {\n    pipeline: source.csv("orders.csv") -> filter(u => u.country == "US" and u.city == "Miami")'
+              ' -> transform(u => {place: u.country + "-" + u.city, city: u.city})\n}\n')
+    code = PolarsCodeGenerator("test.ags").generate(parse_agentscript(source, "test.ags"))
+    assert "pl.Categorical" not in code
+
+
+@pytest.mark.parametrize("opt_level", [0, 1, 2])
+@pytest.mark.parametrize("values, expected", [
+    (["ABC12", "98765", "12345"], "id,zip\n"),  # Read as strings: no row equals the integer
+    (["54321", "98765", "12345"], "id,zip\n3,12345\n"),
+    (["12345.0", "98765.0", "1.5"], "id,zip\n1,12345.0\n"),  # Floats keep their formatting
+])
+def test_integer_literal_only_downcasts_integer_columns(workdir, opt_level, values, expected):
+    rows = "".join(f"{index},{value}\n" for index, value in enumerate(values, start=1))
+    (workdir / "d.csv").write_text("id,zip\n" + rows)
+    source = ('use io.csv\n\nintent Zips {\n    pipeline: source.csv("d.csv") -> filter(u => u.zip == 12345) '
+              '-> sink.csv("out.csv")\n}\n')
+    run_program(source, opt_level=opt_level)
+    assert (workdir / "out.csv").read_text() == expected
@@ -0,0 +1,86 @@
+"""
+Slotted AST nodes: every node, position and token drops its __dict__ but
+keeps the constructor, defaults, equality, repr and copy behaviour of the
+plain dataclass.
+"""
+
+import copy
+import inspect
+import pickle
+from dataclasses import asdict, dataclass, field, is_dataclass, replace
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from agentscript import ast_nodes
+from agentscript.ast_nodes import ASTNode, Position, slotted
+from agentscript.lexer import Lexer, Token
+from agentscript.parser import parse_agentscript
+
+EXAMPLES = [path for path in sorted((Path(__file__).resolve().parent.parent / "examples").glob("*.ags"))
+            if path.name != "error_test.ags"]
+
+NODE_CLASSES = [cls for _, cls in inspect.getmembers(ast_nodes, inspect.isclass)
+                if cls.__module__ == ast_nodes.__name__ and is_dataclass(cls)]
+
+
+def nodes(value):
+    """Yield every AST node and position in a tree."""
+    if isinstance(value, (ASTNode, Position)):
+        yield value
+        for name in value.__dataclass_fields__:
+            yield from nodes(getattr(value, name))
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from nodes(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from nodes(item)
+
+
+@dataclass
+class Plain:
+    name: str
+    count: int = 0
+    tags: List[str] = field(default_factory=list)
+
+
+@slotted
+@dataclass
+class Slotted:
+    name: str
+    count: int = 0
+    tags: List[str] = field(default_factory=list)
+
+
+@pytest.mark.parametrize("cls", NODE_CLASSES + [Token], ids=lambda cls: cls.__name__)
+def test_every_node_class_is_slotted(cls):
+    assert "__slots__" in cls.__dict__
+    slots = [name for base in cls.__mro__ for name in base.__dict__.get("__slots__", ())]
+    assert sorted(slots) == sorted(cls.__dataclass_fields__)
+
+
+def test_slotted_keeps_dataclass_behaviour():
+    plain, slotted_instance = Plain("a"), Slotted("a")
+    assert repr(slotted_instance) == repr(plain).replace("Plain", "Slotted")
+    assert Slotted("a", 2, ["x"]) == Slotted("a", 2, ["x"]) != Slotted("b")
+    assert Slotted("a").tags is not Slotted("a").tags
+    assert asdict(replace(slotted_instance, count=3)) == asdict(replace(plain, count=3))
+    with pytest.raises(AttributeError):
+        slotted_instance.extra = 1
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda path: path.name)
+def test_example_trees_have_no_instance_dicts_and_copy_equal(path):
+    program = parse_agentscript(path.read_text(encoding="utf-8"), str(path))
+    assert not [node for node in nodes(program) if hasattr(node, "__dict__")]
+    assert copy.deepcopy(program) == program
+    assert pickle.loads(pickle.dumps(program)) == program
+
+
+def test_tokens_and_positions_share_the_interned_filename():
+    filename = "".join(["orders", ".ags"])  # Not interned by the compiler
+    tokens = Lexer('use io.csv\nintent Orders {\n    description: "x"\n}\n', filename).tokenize()
+    assert not hasattr(tokens[0], "__dict__")
+    assert len({id(token.filename) for token in tokens}) == 1
@@ -0,0 +1,55 @@
+"""Compilation cache keys."""
+
+from agentscript import cache as cache_module
+from agentscript.cache import CompilationCache, compiler_fingerprint
+from agentscript.main import compile_file
+from agentscript.sourcemap import SourceMap
+
+
+def make_key(cache, **overrides):
+    arguments = dict(source_code="use io.csv", source_file="a.ags", target="pandas",
+                     options={"opt_level": 1}, version="0.1.0")
+    arguments.update(overrides)
+    return cache.make_key(**arguments)
+
+
+def test_key_depends_on_compiler_source(tmp_path, monkeypatch):
+    cache = CompilationCache(tmp_path)
+    before = make_key(cache)
+
+    monkeypatch.setattr(cache_module, "compiler_fingerprint", lambda *files: "changed compiler")
+    assert make_key(cache) != before
+
+
+def test_key_depends_on_plugin_module_outside_the_package(tmp_path):
+    cache = CompilationCache(tmp_path / "cache")
+    plugin = tmp_path / "my_plugin.py"
+    plugin.write_text("VERSION = 1\n")
+    before = make_key(cache, module_files=[str(plugin)])
+
+    plugin.write_text("VERSION = 2\n")
+    compiler_fingerprint.cache_clear()
+    assert make_key(cache, module_files=[str(plugin)]) != before
+
+
+def test_key_depends_on_statistics_inputs(tmp_path):
+    cache = CompilationCache(tmp_path)
+    before = make_key(cache, inputs=[["/data/users.csv", 100, 1]])
+
+    assert make_key(cache, inputs=[["/data/users.csv", 100, 2]]) != before
+    assert make_key(cache, inputs=[["/data/users.csv", 100, 1]]) == before
+
+
+def test_cached_source_map_names_the_new_output(tmp_path, capsys):
+    source = tmp_path / "orders.ags"
+    source.write_text('use io.csv\n\nintent Orders {\n    pipeline: source.csv("orders.csv") -> sink.csv("out.csv")\n}\n')
+    cache = CompilationCache(tmp_path / "cache")
+
+    assert compile_file(source, tmp_path / "first.py", cache=cache, opt_level=1) == 0
+    assert compile_file(source, tmp_path / "second.py", cache=cache, opt_level=1) == 0
+    assert "(cached)" in capsys.readouterr().out
+
+    first = SourceMap.load(tmp_path / "first.py.map")
+    second = SourceMap.load(tmp_path / "second.py.map")
+    assert (first.generated, second.generated) == ("first.py", "second.py")
+    assert second.mappings == first.mappings
@@ -0,0 +1,102 @@
+"""
+Tests for stage checkpoints: stage hashes follow what a stage computes, and
+a run that failed in its sink resumes from the saved stages with the same
+output as a run without checkpoints.
+"""
+
+import io
+import os
+import re
+
+import pandas as pd
+import pytest
+
+from conftest import compile_program, run_program
+
+
+ORDERS = "id,qty,country\n1,100,US\n2,120,DE\n3,30,US\n4,75,FR\n"
+
+PROGRAM = """use io.csv
+
+intent Orders {
+    pipeline: source.csv("orders.csv")
+        -> filter(o => o.qty > 50)
+        -> transform(o => {id: o.id, doubled: o.qty + o.qty, country: o.country})
+        -> filter(o => o.country != "FR")
+        -> sink.csv("out/orders.csv")
+}
+"""
+
+
+def stage_hashes(source: str, **options):
+    code = compile_program(source, checkpoint_dir="checkpoints", **options)
+    return re.search(r"stage_hashes = (\{.*\})", code).group(1)
+
+
+def test_stage_hashes_ignore_source_lines_and_instrumentation():
+    hashes = stage_hashes(PROGRAM)
+    assert stage_hashes("// Moved down\n\n" + PROGRAM) == hashes
+    assert stage_hashes(PROGRAM, instrument=True) == hashes
+
+
+def test_stage_hashes_change_from_the_edited_stage_on():
+    before = eval(stage_hashes(PROGRAM))
+    after = eval(stage_hashes(PROGRAM.replace('o.country != "FR"', 'o.country != "DE"')))
+    assert [before[stage] == after[stage] for stage in sorted(before)] == [True, True, True, False]
+
+
+@pytest.mark.parametrize("instrument", [False, True])
+def test_failed_run_resumes_with_the_same_output(workdir, instrument):
+    orders = workdir / "orders.csv"
+    orders.write_text(ORDERS)
+    (workdir / "out").mkdir()
+    expected = run_program(PROGRAM)["orders"].reset_index(drop=True)
+    (workdir / "out" / "orders.csv").unlink()
+    (workdir / "out").rmdir()
+
+    with pytest.raises(OSError):
+        run_program(PROGRAM, checkpoint_dir="checkpoints", instrument=instrument)
+    assert list((workdir / "checkpoints").glob("*.parquet"))
+
+    # Same path, size and modification time but other rows: only a resumed run ignores them
+    stat = orders.stat()
+    orders.write_text(ORDERS.replace("US", "UK"))
+    os.utime(orders, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    (workdir / "out").mkdir()
+    result = run_program(PROGRAM, checkpoint_dir="checkpoints", instrument=instrument)["orders"]
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected)
+    pd.testing.assert_frame_equal(pd.read_csv(workdir / "out" / "orders.csv"), expected)
+    assert not list((workdir / "checkpoints").glob("*.parquet"))
+
+
+@pytest.mark.parametrize("opt_level", [0, 2])
+def test_changed_input_is_not_resumed(workdir, opt_level):
+    orders = workdir / "orders.csv"
+    orders.write_text(ORDERS)
+    with pytest.raises(OSError):
+        run_program(PROGRAM, opt_level=opt_level, checkpoint_dir="checkpoints")
+
+    orders.write_text(ORDERS + "5,300,US\n")
+    (workdir / "out").mkdir()
+    result = run_program(PROGRAM, opt_level=opt_level, checkpoint_dir="checkpoints")["orders"]
+    expected = run_program(PROGRAM, opt_level=0)["orders"]
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert result["id"].tolist() == [1, 2, 5]
+
+
+def test_columnar_source_resumes_with_the_same_output(workdir):
+    pd.read_csv(io.StringIO(ORDERS)).to_parquet(workdir / "orders.parquet", index=False)
+    program = PROGRAM.replace("use io.csv", "use io.csv, io.parquet").replace('source.csv("orders.csv")',
+                                                                          'source.parquet("orders.parquet")')
+    (workdir / "out").mkdir()
+    expected = run_program(program, opt_level=2)["orders"]
+    (workdir / "out" / "orders.csv").unlink()
+    (workdir / "out").rmdir()
+
+    with pytest.raises(OSError):
+        run_program(program, opt_level=2, checkpoint_dir="checkpoints")
+    assert list((workdir / "checkpoints").glob("*.parquet"))
+    (workdir / "out").mkdir()
+    result = run_program(program, opt_level=2, checkpoint_dir="checkpoints")["orders"]
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,93 @@
+"""
+Tests for the pandas code generator: vectorized filter masks and transform
+columns must select and compute exactly what the compiler's row-by-row
+fallback (df.apply over the lambda) does.
+"""
+
+import pandas as pd
+import pytest
+
+from agentscript.codegen import PandasExpressionGenerator, VectorizationError
+
+from conftest import compile_program, run_program
+
+
+USERS = """first,age,status,score,address.city
+Anna,34,active,88.5,Berlin
+bob,17,trial,42.0,Paris
+Carla,52,paused,91.25,berlin
+dave,25,active,67.0,Oslo
+Eve,41,churned,12.5,Paris
+frank,18,active,75.0,Rome
+"""
+
+
+def users_program(stages: str) -> str:
+    return f'use io.csv\n\nintent Users {{\n    pipeline: source.csv("users.csv") -> {stages}\n}}\n'
+
+
+def run_vectorized_and_row_wise(workdir, monkeypatch, stages: str):
+    """Run a pipeline as generated and with every stage forced row by row; returns (code, vectorized, row-wise)."""
+    (workdir / "users.csv").write_text(USERS)
+    program = users_program(stages)
+    code = compile_program(program)
+    vectorized = run_program(program)["users"]
+
+    def refuse(self, node):
+        raise VectorizationError("Row-wise reference run")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(PandasExpressionGenerator, "generate", refuse)
+        assert "df.apply(" in compile_program(program)
+        row_wise = run_program(program)["users"]
+    return code, vectorized, row_wise
+
+
+@pytest.mark.parametrize("predicate", [
+    "u.age >= 18",
+    "u.age >= 18 and u.status == \"active\"",
+    "u.age < 20 or u.score > 90",
+    "not (u.status == \"active\")",
+    "u.status != \"trial\" and not (u.age > 40 or u.score < 50)",
+    "u.status in [\"active\", \"paused\"]",
+    "u.age between 18 and 41",
+    "u.first contains \"a\"",
+    "\"ar\" in u.first",
+    "u.first matches \"[A-Z][a-z]+\"",
+    "u.score * 2 - u.age > 100",
+    "u.age % 2 == 0",
+    "-u.age < -30",
+])
+def test_filter_masks_match_row_wise_evaluation(workdir, monkeypatch, predicate):
+    code, vectorized, row_wise = run_vectorized_and_row_wise(workdir, monkeypatch, f"filter(u => {predicate})")
+    assert "df.apply(" not in code and ".query(" not in code
+    pd.testing.assert_frame_equal(vectorized, row_wise)
+    assert 0 < len(vectorized) < 6
+
+
+def test_filter_on_nested_attribute(workdir):
+    (workdir / "users.csv").write_text(USERS)
+    result = run_program(users_program('filter(u => u.address.city == "Paris")'))["users"]
+    assert result["first"].tolist() == ["bob", "Eve"]
+
+
+@pytest.mark.parametrize("fields", [
+    "first: u.first, age: u.age",
+    "upper: text.uppercase(u.first), lower: text.lowercase(u.status)",
+    "label: u.first + \" (\" + u.status + \")\"",
+    "points: u.score * 2 - u.age, ratio: u.score / u.age, bucket: u.age % 10",
+    "adult: u.age >= 18, engaged: u.status == \"active\" and u.score > 70",
+    "trimmed: text.trim(u.status), negated: -u.age",
+])
+def test_transform_columns_match_row_wise_evaluation(workdir, monkeypatch, fields):
+    code, vectorized, row_wise = run_vectorized_and_row_wise(workdir, monkeypatch, f"transform(u => {{{fields}}})")
+    assert "df.apply(" not in code
+    pd.testing.assert_frame_equal(vectorized, row_wise, check_dtype=False)
+
+
+def test_filter_after_transform_reads_new_columns(workdir, monkeypatch):
+    code, vectorized, row_wise = run_vectorized_and_row_wise(
+        workdir, monkeypatch, 'transform(u => {who: text.uppercase(u.first), next_age: u.age + 1}) '
+                              '-> filter(r => r.next_age > 30)')
+    pd.testing.assert_frame_equal(vectorized, row_wise, check_dtype=False)
+    assert vectorized["who"].tolist() == ["ANNA", "CARLA", "EVE"]
@@ -0,0 +1,51 @@
+"""
+Tests for the SQL the DuckDB target generates. The generated module is only
+compiled to text here, so duckdb itself is not needed.
+"""
+
+import pytest
+
+from agentscript.codegen import VectorizationError
+from agentscript.parser import parse_agentscript
+from agentscript.plugins.duckdb_plugin import DuckDBCodeGenerator
+
+
+SCHEMA = 'behavior Person {\n    expects: User { first: string, last: string, age: int }\n}\n\n'
+
+
+def generate_sql(stages: str, schema: bool = False) -> str:
+    source = (f'{SCHEMA if schema else ""}intent People {{\n'
+              f'    pipeline: source.csv("people.csv"{", schema: Person" if schema else ""}) -> {stages}'
+              f' -> sink.csv("out.csv")\n}}\n')
+    return DuckDBCodeGenerator("test.ags").generate(parse_agentscript(source, "test.ags"))
+
+
+@pytest.mark.parametrize("stages, expected", [
+    ('transform(u => {name: u.first + " " + u.last})', '(("first" || \' \') || "last") AS "name"'),
+    ('transform(u => {name: text.uppercase(u.first) + u.last})', '(upper("first") || "last") AS "name"'),
+    ('transform(u => {initial: text.trim(u.first) + "."})', '(trim("first") || \'.\') AS "initial"'),
+])
+def test_plus_on_string_expressions_concatenates(stages, expected):
+    assert expected in generate_sql(stages)
+
+
+def test_plus_on_varchar_columns_concatenates():
+    code = generate_sql("transform(u => {name: u.first + u.last, next_age: u.age + u.age})", schema=True)
+    assert '("first" || "last") AS "name"' in code
+    assert '("age" + "age") AS "next_age"' in code
+
+
+def test_plus_on_transformed_string_fields_concatenates():
+    code = generate_sql('transform(u => {label: u.first + ":", years: u.age + 1}) '
+                        '-> transform(r => {tag: r.label + r.label, twice: r.years + r.years})')
+    assert '("label" || "label") AS "tag"' in code
+    assert '("years" + "years") AS "twice"' in code
+
+
+def test_plus_with_a_number_adds():
+    assert '("age" + 1) AS "next_age"' in generate_sql("transform(u => {next_age: u.age + 1})")
+
+
+def test_plus_on_columns_of_unknown_type_is_rejected():
+    with pytest.raises(VectorizationError, match="adds numbers or concatenates strings"):
+        generate_sql("transform(u => {name: u.first + u.last})")
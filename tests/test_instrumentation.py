@@ -0,0 +1,135 @@
+"""
+Tests for pipeline instrumentation: an instrumented pipeline reports every
+stage with its row counts and .ags line, and the collectors write the
+formats that log shippers and the Prometheus textfile collector read.
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from agentscript import instrumentation
+from agentscript.instrumentation import (InMemoryCollector, JSONLinesCollector, PrometheusCollector, StageMetrics,
+                                         collector_from_env, record_stage)
+
+from conftest import run_program
+
+
+ORDERS = "id,qty,status\n1,3,shipped\n2,1,pending\n3,5,shipped\n"
+
+PROGRAM = """use io.csv
+
+intent Orders {
+    pipeline:
+        source.csv("orders.csv")
+        -> filter(o => o.status == "shipped")
+        -> transform(o => {id: o.id, doubled: o.qty * 2})
+        -> sink.csv("out.csv")
+}
+"""
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    collector = InMemoryCollector()
+    monkeypatch.setattr(instrumentation, "_collector", collector)
+    return collector
+
+
+def stage_rows(collector):
+    return [(total["stage"], total["kind"], total["ags_line"], total["calls"], total["rows_in"], total["rows_out"])
+            for total in sorted(collector.summary(), key=lambda total: total["stage"])]
+
+
+def test_instrumented_pipeline_reports_every_stage(workdir, collector):
+    (workdir / "orders.csv").write_text(ORDERS)
+    run_program(PROGRAM, instrument=True)
+
+    assert stage_rows(collector) == [
+        (1, "source", 5, 1, 0, 3),
+        (2, "filter", 6, 1, 3, 2),
+        (3, "transform", 7, 1, 2, 2),
+        (4, "sink", 8, 1, 2, 2),
+    ]
+    assert {metrics.ags_file for metrics in collector.metrics} == {"test.ags"}
+    assert all(metrics.memory_bytes > 0 for metrics in collector.metrics)
+
+
+def test_streamed_pipeline_reports_every_chunk(workdir, collector):
+    (workdir / "orders.csv").write_text(ORDERS)
+    run_program(PROGRAM, instrument=True, streaming=True, chunksize=2)
+
+    assert stage_rows(collector) == [
+        (1, "source", 5, 2, 0, 3),
+        (2, "filter", 6, 2, 3, 2),
+        (3, "transform", 7, 2, 2, 2),
+        (4, "sink", 8, 2, 2, 2),
+    ]
+    assert sorted({metrics.chunk for metrics in collector.metrics}) == [0, 1]
+
+
+def test_record_stage_measures_the_output_frame(collector):
+    df = pd.DataFrame({"id": [1, 2, 3]})
+    record_stage("orders", 2, "filter", 0.0, 5, df, "orders.ags", 6)
+    record_stage("orders", 3, "custom", 0.0, 3, None)
+
+    first, second = collector.metrics
+    assert (first.rows_in, first.rows_out, first.memory_bytes) == (5, 3, int(df.memory_usage(deep=False).sum()))
+    assert (first.ags_file, first.ags_line, first.chunk) == ("orders.ags", 6, None)
+    assert (second.rows_out, second.memory_bytes) == (0, 0)
+
+
+def metrics(stage=2, seconds=0.5, rows_in=10, rows_out=4, memory_bytes=128, chunk=None):
+    return StageMetrics(method="orders", stage=stage, kind="filter", seconds=seconds, rows_in=rows_in,
+                        rows_out=rows_out, memory_bytes=memory_bytes, ags_file="orders.ags", ags_line=6,
+                        chunk=chunk, timestamp=1.0)
+
+
+def test_json_lines_collector_appends_one_object_per_stage(tmp_path):
+    collector = JSONLinesCollector(tmp_path / "stages.jsonl")
+    collector.record(metrics(chunk=0))
+    collector.record(metrics(chunk=1, rows_out=2))
+
+    records = [json.loads(line) for line in (tmp_path / "stages.jsonl").read_text().splitlines()]
+    assert records == [
+        {"method": "orders", "stage": 2, "kind": "filter", "seconds": 0.5, "rows_in": 10, "rows_out": 4,
+         "memory_bytes": 128, "ags_file": "orders.ags", "ags_line": 6, "chunk": 0, "timestamp": 1.0},
+        {"method": "orders", "stage": 2, "kind": "filter", "seconds": 0.5, "rows_in": 10, "rows_out": 2,
+         "memory_bytes": 128, "ags_file": "orders.ags", "ags_line": 6, "chunk": 1, "timestamp": 1.0},
+    ]
+
+
+def test_prometheus_collector_writes_stage_totals(tmp_path):
+    collector = PrometheusCollector(tmp_path / "agentscript.prom")
+    collector.record(metrics(seconds=0.5, rows_out=4, memory_bytes=128))
+    collector.record(metrics(seconds=0.25, rows_out=2, memory_bytes=64))
+
+    labels = 'method="orders",stage="2",kind="filter",ags_line="6"'
+    lines = (tmp_path / "agentscript.prom").read_text().splitlines()
+    assert "# TYPE agentscript_stage_seconds_total counter" in lines
+    assert "# TYPE agentscript_stage_memory_bytes gauge" in lines
+    assert [line for line in lines if not line.startswith("#")] == [
+        f"agentscript_stage_seconds_total{{{labels}}} 0.75",
+        f"agentscript_stage_runs_total{{{labels}}} 2",
+        f"agentscript_stage_rows_in_total{{{labels}}} 20",
+        f"agentscript_stage_rows_out_total{{{labels}}} 6",
+        f"agentscript_stage_memory_bytes{{{labels}}} 64",
+    ]
+    assert list(tmp_path.iterdir()) == [tmp_path / "agentscript.prom"]
+
+
+@pytest.mark.parametrize("setting, collector_class, path", [
+    ("jsonl:stages.jsonl", JSONLinesCollector, "stages.jsonl"),
+    ("prometheus:/var/lib/node_exporter/agentscript.prom", PrometheusCollector,
+     "/var/lib/node_exporter/agentscript.prom"),
+    ("jsonl:", InMemoryCollector, None),
+    ("statsd:localhost", InMemoryCollector, None),
+    ("", InMemoryCollector, None),
+])
+def test_collector_from_env(monkeypatch, setting, collector_class, path):
+    monkeypatch.setenv("AGENTSCRIPT_METRICS", setting)
+    collector = collector_from_env()
+    assert type(collector) is collector_class
+    if path is not None:
+        assert str(collector.path) == path
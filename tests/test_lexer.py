@@ -0,0 +1,51 @@
+"""Parity of the regex scanner (the default) with the character scanner."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from agentscript.lexer import Lexer, LexerError
+
+EXAMPLES = sorted((Path(__file__).resolve().parent.parent / "examples").glob("*.ags"))
+
+FRAGMENTS = [
+    "intent", "behavior", "use", "pipeline", "description", "source", "sink", "filter",
+    "transform", "true", "false", "and", "or", "not", "in", "contains", "matches", "between",
+    "user", "_x1", "Name42", "0", "42", "3.14", "7.", ".5", "007",
+    '"text"', '"esc \\" \\n \\t \\\\ q"', "'single'", "'it\\'s'", '"unterminated', "'open",
+    "// comment", "//", "->", "=>", "==", "!=", "<=", ">=", "<", ">", "=", "!", ":", ",", ".",
+    "+", "-", "*", "/", "%", "(", ")", "{", "}", "[", "]", "@", "#", "$", "\\", "\0", "é",
+    " ", "  ", "\t", "\r", "\n", "\n\n",
+]
+
+
+def scan(source: str, fast: bool):
+    """Get the token stream of source, or the error the scanner raised."""
+    try:
+        return Lexer(source, "test.ags", fast=fast).tokenize()
+    except LexerError as e:
+        return ("error", e.message, e.line, e.column)
+
+
+def random_source(rng: random.Random) -> str:
+    """Build a source from random fragments, mostly but not always well formed."""
+    return "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 40)))
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda path: path.name)
+def test_examples_scan_identically(path):
+    source = path.read_text(encoding="utf-8")
+    assert scan(source, fast=True) == scan(source, fast=False)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_inputs_scan_identically(seed):
+    rng = random.Random(seed)
+    for _ in range(250):
+        source = random_source(rng)
+        assert scan(source, fast=True) == scan(source, fast=False), repr(source)
+
+
+def test_fast_scanner_is_the_default():
+    assert Lexer("x").fast
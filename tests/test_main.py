@@ -0,0 +1,93 @@
+"""
+Tests for the compile command: compiling across worker processes, or with
+every phase profiled, must write what a plain serial compile writes.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROGRAMS = {
+    "orders.ags": 'use io.csv\n\nintent Orders {\n    pipeline: source.csv("orders.csv") '
+                  '-> filter(o => o.qty > 2) -> sink.csv("out.csv")\n}\n',
+    "users.ags": 'use io.csv\n\nintent Users {\n    pipeline: source.csv("users.csv") '
+                 '-> transform(u => {id: u.id, adult: u.age >= 18})\n}\n',
+    "broken.ags": 'use io.csv\n\nintent Broken {\n    pipeline: source.csv("broken.csv") ->\n}\n',
+    "totals.ags": 'use io.csv\n\nintent Totals {\n    pipeline: source.csv("orders.csv") '
+                  '-> transform(o => {id: o.id, total: o.qty * o.price})\n}\n',
+}
+
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def compile_command(*arguments) -> subprocess.CompletedProcess:
+    """Run 'agentscript compile' in a fresh interpreter, so worker processes never fork the test process."""
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    return subprocess.run([sys.executable, "-m", "agentscript.main", "compile", *arguments],
+                          capture_output=True, text=True, env=env)
+
+
+def without_timestamp(code: str) -> str:
+    return re.sub(r"# Generated at: .*", "# Generated at: <time>", code)
+
+
+def test_parallel_compile_matches_serial(workdir):
+    for name, source in PROGRAMS.items():
+        (workdir / name).write_text(source)
+    outputs = {}
+    logs = {}
+
+    for jobs in ["1", "2"]:
+        output_dir = workdir / f"jobs-{jobs}"
+        output_dir.mkdir()
+        logs[jobs] = compile_command(*PROGRAMS, "-o", str(output_dir), "-j", jobs, "--no-cache")
+        assert logs[jobs].returncode == 1
+        outputs[jobs] = {path.name: without_timestamp(path.read_text()) for path in sorted(output_dir.iterdir())}
+
+    assert sorted(outputs["2"]) == ["orders.py", "orders.py.map", "totals.py", "totals.py.map",
+                                    "users.py", "users.py.map"]
+    assert outputs["2"] == outputs["1"]
+    # The failing file is reported once, after the log of every file in input order
+    assert "1 of 4 files failed to compile" in logs["2"].stderr
+    assert "- broken.ags" in logs["2"].stderr
+    assert logs["2"].stdout.replace("jobs-2", "jobs-1") == logs["1"].stdout
+
+
+PHASES = ["read", "lex", "parse", "optimize", "generate", "write"]
+
+
+def test_profiled_compile_reports_every_phase(workdir):
+    (workdir / "orders.ags").write_text(PROGRAMS["orders.ags"])
+
+    assert compile_command("orders.ags", "-o", "plain.py", "--no-cache").returncode == 0
+    result = compile_command("orders.ags", "-o", "profiled.py", "--profile", "json")
+    assert result.returncode == 0
+
+    [profile] = json.loads(result.stdout)
+    assert [phase["phase"] for phase in profile["phases"]] == PHASES
+    assert profile["tokens"] > 0 and profile["ast_nodes"] > 0
+    assert profile["generated_bytes"] == len((workdir / "profiled.py").read_bytes())
+    assert profile["total_seconds"] == pytest.approx(sum(phase["seconds"] for phase in profile["phases"]))
+    assert any(phase["peak_bytes"] > 0 for phase in profile["phases"])
+
+    assert "Compiled to profiled.py" in result.stderr  # Progress messages stay out of the JSON document
+    plain = (workdir / "plain.py").read_text()
+    assert without_timestamp((workdir / "profiled.py").read_text()) == without_timestamp(plain)
+    assert (workdir / "profiled.py.map").read_text() == (workdir / "plain.py.map").read_text().replace(
+        '"plain.py"', '"profiled.py"')
+
+
+def test_profiled_compile_text_report(workdir):
+    (workdir / "orders.ags").write_text(PROGRAMS["orders.ags"])
+    result = compile_command("orders.ags", "-o", "orders.py", "--profile")
+
+    assert result.returncode == 0
+    report = result.stdout[result.stdout.index("Compile profile of orders.ags (pandas)"):]
+    assert [line.split()[0] for line in report.splitlines()[2:2 + len(PHASES)]] == PHASES
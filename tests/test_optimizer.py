@@ -0,0 +1,70 @@
+"""
+Tests for the pipeline optimizer: every optimization level must compute what
+the unoptimized (-O 0) pipeline computes, while doing less work.
+"""
+
+import pandas as pd
+import pytest
+
+from agentscript.analysis import stage_call
+from agentscript.optimizer import optimize_program
+from agentscript.parser import parse_agentscript
+
+from conftest import run_program
+
+
+USERS = """id,first,age,status,score,city
+1,Anna,34,active,88.5,Berlin
+2,bob,17,trial,42.0,Paris
+3,Carla,52,paused,91.25,Berlin
+4,dave,25,active,67.0,Oslo
+5,Eve,41,churned,12.5,Paris
+6,frank,18,active,75.0,Rome
+7,Gina,29,trial,55.0,Oslo
+"""
+
+PIPELINES = {
+    "fused filters": 'filter(u => u.age >= 18) -> filter(u => u.status in ["active", "trial"]) '
+                     '-> filter(u => u.first contains "a")',
+    "mask operators": 'filter(u => u.age between 18 and 45) -> filter(u => u.first matches "[A-Z].*") '
+                      '-> filter(u => u.city in ["Berlin", "Oslo"] and not (u.score < 50))',
+    "filter pushed ahead of transform": 'transform(u => {id: u.id, city: u.city, points: u.score * 2}) '
+                                        '-> filter(r => r.city == "Berlin" or r.city == "Oslo")',
+    "filter on computed field": 'transform(u => {id: u.id, points: u.score * 2}) -> filter(r => r.points > 100)',
+    "constant folding": "filter(u => u.age >= 10 + 8 and u.score > 100 / 4)",
+    "no-op filter": 'filter(u => true) -> filter(u => 1 < 2 or u.age > 99) -> filter(u => u.status != "churned")',
+}
+
+
+def users_program(stages: str) -> str:
+    return f'use io.csv\n\nintent Users {{\n    pipeline: source.csv("users.csv") -> {stages}\n}}\n'
+
+
+def optimized_stages(stages: str, level: int):
+    program = optimize_program(parse_agentscript(users_program(stages), "test.ags"), level)
+    return [stage_call(stage) for stage in program.statements[-1].pipeline.stages[1:]]
+
+
+@pytest.mark.parametrize("level", [1, 2])
+@pytest.mark.parametrize("pipeline", list(PIPELINES))
+def test_optimized_pipeline_matches_unoptimized(workdir, pipeline, level):
+    (workdir / "users.csv").write_text(USERS)
+    program = users_program(PIPELINES[pipeline])
+    expected = run_program(program, opt_level=0)["users"]
+    result = run_program(program, opt_level=level)["users"]
+    # Folding a literal can let a column be downcast from it, which changes its dtype but not its values
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_consecutive_filters_are_fused():
+    assert optimized_stages(PIPELINES["fused filters"], 1) == ["filter"]
+
+
+def test_filter_moves_ahead_of_transform_at_level_2():
+    assert optimized_stages(PIPELINES["filter pushed ahead of transform"], 1) == ["transform", "filter"]
+    assert optimized_stages(PIPELINES["filter pushed ahead of transform"], 2) == ["filter", "transform"]
+    assert optimized_stages(PIPELINES["filter on computed field"], 2) == ["transform", "filter"]
+
+
+def test_no_op_filters_are_dropped():
+    assert optimized_stages(PIPELINES["no-op filter"], 1) == ["filter"]
@@ -0,0 +1,67 @@
+"""Parity of the streaming parser (tokens pulled from the lexer) with parsing a token list."""
+
+from pathlib import Path
+
+import pytest
+
+from agentscript.lexer import Lexer, LexerError
+from agentscript.parser import ParseError, Parser, parse_agentscript
+
+EXAMPLES = sorted((Path(__file__).resolve().parent.parent / "examples").glob("*.ags"))
+
+INTENT = 'intent Orders{index} {{\n    pipeline: source.csv("orders.csv") -> filter(o => o.qty > {index})\n}}\n'
+
+
+def parse(source: str, streaming: bool, fast: bool = True):
+    """Get the program parsed from source, or the error lexing or parsing raised."""
+    lexer = Lexer(source, "test.ags", fast=fast)
+    try:
+        return Parser(lexer.iter_tokens() if streaming else lexer.tokenize()).parse()
+    except (LexerError, ParseError) as e:
+        return ("error", type(e).__name__, str(e))
+
+
+@pytest.mark.parametrize("fast", [True, False])
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda path: path.name)
+def test_examples_parse_identically(path, fast):
+    source = path.read_text(encoding="utf-8")
+    assert parse(source, streaming=True, fast=fast) == parse(source, streaming=False, fast=fast)
+
+
+@pytest.mark.parametrize("source", [
+    "",
+    "// Only a comment\n",
+    "use io.csv",
+    "use io.csv\nintent Broken {\n    pipeline: ->\n}\n",
+    "intent Orders { description: \"unterminated }\n",
+])
+def test_edge_cases_parse_identically(source):
+    assert parse(source, streaming=True) == parse(source, streaming=False)
+
+
+def test_parse_agentscript_streams_from_the_lexer():
+    source = "use io.csv\n\n" + "\n".join(INTENT.format(index=index) for index in range(5))
+    program = parse_agentscript(source, "test.ags")
+    assert program == Parser(Lexer(source, "test.ags").tokenize()).parse()
+    assert len(program.statements) == 6
+
+
+def test_syntax_error_stops_the_stream():
+    source = INTENT.format(index=0) + "intent Broken {\n    pipeline: ->\n}\n" + "".join(
+        INTENT.format(index=index) for index in range(1, 500))
+    tokens = Lexer(source, "test.ags").tokenize()
+    pulled = []
+
+    def stream():
+        for token in tokens:
+            pulled.append(token)
+            yield token
+
+    parser = Parser(stream())
+    statements = parser.iter_statements()
+    assert next(statements).name == "Orders0"
+    with pytest.raises(ParseError):
+        next(statements)
+    # Only the tokens up to the error (plus the parser's lookahead) were read
+    assert pulled[-1].line <= 6
+    assert len(pulled) < len(tokens) // 100
@@ -0,0 +1,58 @@
+"""
+Tests for lazy loading: the plugin manifest must describe each built-in
+plugin exactly as the plugin class does, and looking up one plugin (or one
+package attribute) must not import the modules of the others.
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from agentscript.plugins.base import PluginRegistry
+from agentscript.plugins.manifest import BUILTIN_PLUGINS
+
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def imported_modules(code: str) -> list:
+    """Run code in a fresh interpreter; returns the agentscript modules it imported."""
+    script = f"import sys\n{code}\nprint(sorted(name for name in sys.modules if name.startswith('agentscript')))"
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True)
+    return eval(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("spec", BUILTIN_PLUGINS, ids=lambda spec: spec.name)
+def test_manifest_matches_plugin_class(spec):
+    plugin_class = getattr(importlib.import_module(spec.module), spec.class_name)
+    config = PluginRegistry()._get_plugin_config(spec.name, plugin_class)
+    assert replace(config, templates_dir=None) == spec.config
+
+
+def test_manifest_lists_every_builtin_plugin_module():
+    plugins_dir = SRC / "agentscript" / "plugins"
+    modules = {f"agentscript.plugins.{path.stem}" for path in plugins_dir.glob("*_plugin.py")}
+    assert {spec.module for spec in BUILTIN_PLUGINS} == modules
+
+
+def test_plugin_lookup_imports_only_that_plugin():
+    modules = imported_modules("from agentscript.plugins import get_registry\n"
+                               "registry = get_registry()\n"
+                               "assert registry.get_plugin_info('django')['supports_web']\n"
+                               "assert registry.get_plugin('polars').name == 'polars'")
+    plugins = [name for name in modules if name.endswith("_plugin")]
+    assert plugins == ["agentscript.plugins.polars_plugin"]
+
+
+def test_package_attributes_are_imported_on_first_use():
+    assert "agentscript.lexer" not in imported_modules("import agentscript\nagentscript.__version__")
+
+    modules = imported_modules("import agentscript\nagentscript.parse_agentscript")
+    assert "agentscript.parser" in modules
+    assert "agentscript.codegen" not in modules and "agentscript.plugins" not in modules
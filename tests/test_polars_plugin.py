@@ -0,0 +1,98 @@
+"""
+Tests for the Polars target. The generated code is checked as text; where
+polars is installed, the generated queries also run and must write the same
+records as the pandas target at -O 0.
+"""
+
+import types
+
+import pandas as pd
+import pytest
+
+from agentscript.optimizer import optimize_program
+from agentscript.parser import parse_agentscript
+from agentscript.plugins.polars_plugin import PolarsCodeGenerator
+
+from conftest import run_program
+
+
+ORDERS = """id,customer,qty,price,status
+1,anna,3,9.5,shipped
+2,bob,1,120.0,pending
+3,carla,12,4.25,shipped
+4,dave,7,15.0,cancelled
+5,eve,2,60.0,shipped
+6,frank,9,3.5,pending
+"""
+
+PIPELINES = {
+    "filter": 'filter(o => o.status == "shipped" and o.qty > 2)',
+    "mask operators": 'filter(o => o.status in ["shipped", "pending"] and o.qty between 2 and 9 '
+                      'and o.customer contains "a" and not (o.customer matches "c.*"))',
+    "transform": "transform(o => {id: o.id, customer: text.uppercase(o.customer), total: o.qty * o.price})",
+    "filter after transform": 'transform(o => {id: o.id, label: o.customer + "/" + o.status, total: o.qty * o.price}) '
+                              '-> filter(r => r.total > 40)',
+}
+
+
+def orders_program(stages: str) -> str:
+    return (f'use io.csv\n\nintent Orders {{\n'
+            f'    pipeline: source.csv("orders.csv") -> {stages} -> sink.csv("out.csv")\n}}\n')
+
+
+def generate_polars(source: str, opt_level: int = 0) -> str:
+    program = optimize_program(parse_agentscript(source, "test.ags"), opt_level)
+    return PolarsCodeGenerator("test.ags").generate(program)
+
+
+@pytest.mark.parametrize("pipeline", list(PIPELINES))
+def test_pipelines_become_lazy_queries(pipeline):
+    code = generate_polars(orders_program(PIPELINES[pipeline]))
+    compile(code, "generated.py", "exec")
+    assert 'pl.scan_csv("orders.csv"' in code
+    assert 'query.sink_csv("out.csv")' in code
+    assert "map_elements" not in code and ".apply(" not in code
+
+
+@pytest.mark.parametrize("opt_level", [0, 2])
+@pytest.mark.parametrize("pipeline", list(PIPELINES))
+def test_polars_output_matches_pandas(workdir, pipeline, opt_level):
+    pytest.importorskip("polars")
+    (workdir / "orders.csv").write_text(ORDERS)
+    source = orders_program(PIPELINES[pipeline])
+
+    run_program(source)
+    expected = pd.read_csv(workdir / "out.csv")
+    (workdir / "out.csv").unlink()
+
+    module = types.ModuleType("generated")
+    exec(compile(generate_polars(source, opt_level), "generated.py", "exec"), module.__dict__)
+    module.Orders().orders()
+    pd.testing.assert_frame_equal(pd.read_csv(workdir / "out.csv"), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("fields, expected", [
+    ("id: o.id, neg: -1", "pl.lit((-1)).alias('neg')"),
+    ("id: o.id, three: 1 + 2", "pl.lit((1 + 2)).alias('three')"),
+    ('id: o.id, tag: "a" + "b"', "pl.lit(('a' + 'b')).alias('tag')"),
+])
+def test_constant_fields_become_literals_without_folding(fields, expected):
+    code = generate_polars(orders_program(f"transform(o => {{{fields}}})"), opt_level=0)
+    assert expected in code
+    assert "pl.col('id').alias('id')" in code
+
+
+@pytest.mark.parametrize("opt_level", [0, 1])
+def test_constant_fields_match_pandas(workdir, opt_level):
+    pytest.importorskip("polars")
+    (workdir / "orders.csv").write_text(ORDERS)
+    source = orders_program("transform(o => {id: o.id, neg: -1, three: 1 + 2, scaled: o.qty * (2 + 1)})")
+
+    run_program(source, opt_level=opt_level)
+    expected = pd.read_csv(workdir / "out.csv")
+
+    module = types.ModuleType("generated")
+    exec(compile(generate_polars(source, opt_level), "generated.py", "exec"), module.__dict__)
+    module.Orders().orders()
+    pd.testing.assert_frame_equal(pd.read_csv(workdir / "out.csv"), expected, check_dtype=False)
+    assert expected["three"].tolist() == [3] * 6
@@ -0,0 +1,77 @@
+"""
+Tests for column projection: a pipeline whose sources read only the columns
+it uses must write what the same pipeline writes when every column is read,
+with whole frames and in chunks, from CSV and from JSON.
+"""
+
+import json
+
+import pytest
+
+from agentscript import codegen
+from agentscript.analysis import required_columns
+from agentscript.parser import parse_agentscript
+
+from conftest import compile_program, run_program
+
+
+ORDERS = [
+    {"id": 1, "customer": "anna", "qty": 3, "price": 9.5, "status": "shipped", "note": "gift"},
+    {"id": 2, "customer": "bob", "qty": 1, "price": 120.0, "status": "pending", "note": ""},
+    {"id": 3, "customer": "carla", "qty": 12, "price": 4.25, "status": "shipped", "note": "bulk"},
+    {"id": 4, "customer": "dave", "qty": 7, "price": 15.0, "status": "cancelled", "note": "late"},
+    {"id": 5, "customer": "eve", "qty": 2, "price": 60.0, "status": "shipped", "note": ""},
+]
+
+PIPELINES = {
+    "filter, transform": ('filter(o => o.status == "shipped") -> transform(o => {id: o.id, total: o.qty * o.price})',
+                          ["status", "id", "qty", "price"]),
+    "transform, filter": ("transform(o => {id: o.id, total: o.qty * o.price}) -> filter(r => r.total > 40)",
+                          ["id", "qty", "price"]),
+    "transform only": ("transform(o => {customer: text.uppercase(o.customer)})", ["customer"]),
+    "filter only": ("filter(o => o.qty > 2)", None),
+}
+
+
+def orders_program(stages: str, source_format: str) -> str:
+    return (f'use io.csv, io.json\n\nintent Orders {{\n'
+            f'    pipeline: source.{source_format}("orders.{source_format}") -> {stages} -> sink.csv("out.csv")\n}}\n')
+
+
+def write_orders(workdir, source_format: str, streaming: bool):
+    if source_format == "csv":
+        lines = [",".join(ORDERS[0])] + [",".join(str(value) for value in order.values()) for order in ORDERS]
+        (workdir / "orders.csv").write_text("\n".join(lines) + "\n")
+    elif streaming:
+        (workdir / "orders.json").write_text("".join(json.dumps(order) + "\n" for order in ORDERS))
+    else:
+        (workdir / "orders.json").write_text(json.dumps(ORDERS))
+
+
+@pytest.mark.parametrize("pipeline", list(PIPELINES))
+def test_required_columns(pipeline):
+    stages, expected = PIPELINES[pipeline]
+    program = parse_agentscript(orders_program(stages, "csv"), "test.ags")
+    assert required_columns(program.statements[-1].pipeline) == expected
+
+
+@pytest.mark.parametrize("options", [{}, {"streaming": True, "chunksize": 2}], ids=["whole", "chunked"])
+@pytest.mark.parametrize("source_format", ["csv", "json"])
+@pytest.mark.parametrize("pipeline", list(PIPELINES))
+def test_projected_pipeline_matches_reading_every_column(workdir, monkeypatch, pipeline, source_format, options):
+    write_orders(workdir, source_format, bool(options))
+    program = orders_program(PIPELINES[pipeline][0], source_format)
+
+    run_program(program, **options)
+    projected = (workdir / "out.csv").read_text()
+
+    monkeypatch.setattr(codegen, "required_columns", lambda pipeline: None)
+    run_program(program, **options)
+    assert (workdir / "out.csv").read_text() == projected
+
+
+def test_csv_sources_read_only_the_required_columns():
+    code = compile_program(orders_program(PIPELINES["filter, transform"][0], "csv"))
+    assert "usecols=['status', 'id', 'qty', 'price']" in code
+    code = compile_program(orders_program(PIPELINES["filter only"][0], "csv"))
+    assert "usecols=" not in code
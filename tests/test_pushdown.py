@@ -0,0 +1,94 @@
+"""
+Tests for filters pushed down into pyarrow dataset scans: a Parquet source
+must give the same rows as the same data read from CSV, where every filter
+runs in pandas.
+"""
+
+import pandas as pd
+import pytest
+
+from conftest import compile_program, run_program
+
+
+USERS = pd.DataFrame({
+    "name": ["anna", "bob", "otto", "eve", "hannah", "tom", None],
+    "code": ["AB-12", "CD-34", "ABAB", "x-1", "AA-99", "ab-12", "ZZ-00"],
+    "age": [31, 17, 45, 22, 64, 38, 29],
+})
+
+
+def run_both(workdir, predicate: str):
+    """Run a filter on the Parquet and on the CSV copy of USERS; returns (pushed-down code, parquet rows, csv rows)."""
+    USERS.to_parquet(workdir / "users.parquet", index=False)
+    USERS.to_csv(workdir / "users.csv", index=False)
+
+    def program(source_format):
+        return (f'use io.{source_format}\n\nintent Users {{\n'
+                f'    pipeline: source.{source_format}("users.{source_format}") -> filter(u => {predicate})\n}}\n')
+
+    code = compile_program(program("parquet"))
+    parquet = run_program(program("parquet"))["users"].reset_index(drop=True)
+    csv = run_program(program("csv"))["users"].reset_index(drop=True)
+    return code, parquet, csv
+
+
+@pytest.mark.parametrize("pattern", [r"[A-Z]{2}-[0-9]+", r"(?i)ab-.*"])
+def test_re2_compatible_patterns_are_pushed_down(workdir, pattern):
+    code, parquet, csv = run_both(workdir, f'u.code matches "{pattern}"')
+    assert "pc.match_substring_regex" in code
+    pd.testing.assert_frame_equal(parquet, csv)
+
+
+@pytest.mark.parametrize("pattern", [
+    r"(\\w)\\1.*",            # Backreference
+    r"(?P<pair>AB)(?P=pair)",  # Named backreference
+    r"(?!AB)..-.*",            # Lookahead
+    r".*(?<=9)",               # Lookbehind
+    r"\\w+-\\d+",              # Unicode-aware classes in Python, ASCII in RE2
+])
+def test_python_only_patterns_stay_in_pandas(workdir, pattern):
+    code, parquet, csv = run_both(workdir, f'u.code matches "{pattern}"')
+    assert "match_substring_regex" not in code
+    assert ".str.fullmatch(" in code
+    pd.testing.assert_frame_equal(parquet, csv)
+
+
+@pytest.mark.parametrize("predicate", [
+    "u.age >= 30",
+    "u.age > 20 and u.age <= 45",
+    "u.age between 22 and 40",
+    'u.code in ["AB-12", "ABAB", "ZZ-00"]',
+    'u.name contains "o"',
+    '"an" in u.name',
+    'u.code == "CD-34" or u.age < 20',
+    'u.age > 25 and u.name != "tom"',
+    'not (u.age > 40)',
+])
+def test_pushed_down_masks_match_pandas(workdir, predicate):
+    code, parquet, csv = run_both(workdir, predicate)
+    assert "ds.dataset(" in code
+    # Parquet keeps its stored types where the CSV reader narrows them, so only the values must agree
+    pd.testing.assert_frame_equal(parquet, csv, check_dtype=False, check_categorical=False)
+
+
+@pytest.mark.parametrize("source_format", ["parquet", "arrow"])
+@pytest.mark.parametrize("opt_level", [0, 2])
+def test_columnar_pipeline_matches_csv(workdir, source_format, opt_level):
+    USERS.to_csv(workdir / "input.csv", index=False)
+    USERS.to_parquet(workdir / "input.parquet", index=False)
+    USERS.to_feather(workdir / "input.arrow")
+
+    def program(source, sink):
+        return (f'use io.csv, io.parquet\n\nintent Users {{\n'
+                f'    pipeline: source.{source}("input.{source}") -> filter(u => u.age >= 20) '
+                f'-> transform(u => {{name: u.name, decade: u.age - u.age % 10}}) -> filter(r => r.decade < 60) '
+                f'-> sink.{sink}("output.{sink}", compression: "zstd", row_group_size: 2)\n}}\n')
+
+    run_program(program("csv", "csv"), opt_level=0)
+    expected = pd.read_csv(workdir / "output.csv")
+    run_program(program(source_format, source_format), opt_level=opt_level)
+    if source_format == "parquet":
+        result = pd.read_parquet(workdir / "output.parquet")
+    else:
+        result = pd.read_feather(workdir / "output.arrow")
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
@@ -0,0 +1,67 @@
+"""
+Tests for source maps: the map written next to a compiled module points each
+pipeline stage at the generated statements that run it, and the profiler
+charges the time of those statements to the stage's .ags line.
+"""
+
+from pathlib import Path
+
+from agentscript.main import compile_file
+from agentscript.profiler import profile_module
+from agentscript.sourcemap import SourceMap
+
+
+ORDERS = "id,qty,status\n1,3,shipped\n2,1,pending\n3,5,shipped\n"
+
+PROGRAM = """use io.csv
+
+intent Orders {
+    description: "Shipped orders"
+
+    pipeline:
+        source.csv("orders.csv")
+        -> filter(o => o.status == "shipped")
+        -> transform(o => {id: o.id, doubled: o.qty * 2})
+}
+"""
+
+SOURCE_LINE, FILTER_LINE, TRANSFORM_LINE = 7, 8, 9
+
+
+def compile_orders(workdir: Path):
+    (workdir / "orders.csv").write_text(ORDERS)
+    (workdir / "orders.ags").write_text(PROGRAM)
+    assert compile_file(Path("orders.ags"), Path("orders.py"), opt_level=0) == 0
+    return (workdir / "orders.py").read_text(), SourceMap.load(workdir / "orders.py.map")
+
+
+def python_lines(code: str, source_map: SourceMap, ags_line: int):
+    lines = code.splitlines()
+    return [lines[line - 1].strip() for line, mapped in sorted(source_map.mappings.items()) if mapped == ags_line]
+
+
+def test_stages_map_to_the_statements_that_run_them(workdir):
+    code, source_map = compile_orders(workdir)
+
+    assert (source_map.source, source_map.generated) == ("orders.ags", "orders.py")
+    assert python_lines(code, source_map, SOURCE_LINE)[0].startswith('df = pd.read_csv("orders.csv"')
+    assert python_lines(code, source_map, FILTER_LINE) == [
+        "df = df[(df['status'] == 'shipped')]  # Filter: o => o.status == \"shipped\"",
+    ]
+    assert python_lines(code, source_map, TRANSFORM_LINE)[0] == "df = pd.DataFrame({"
+    assert source_map.intent_at(FILTER_LINE)["method"] == "orders"
+    assert sorted(path.name for path in workdir.iterdir()) == ["orders.ags", "orders.csv", "orders.py",
+                                                                "orders.py.map"]
+
+
+def test_profile_charges_stage_time_to_its_ags_line(workdir):
+    code, source_map = compile_orders(workdir)
+
+    report, _ = profile_module(code, source_map, PROGRAM)
+    lines = {line["line"]: line for line in report.lines}
+
+    assert set(lines) >= {SOURCE_LINE, FILTER_LINE, TRANSFORM_LINE}
+    assert lines[FILTER_LINE]["code"] == '-> filter(o => o.status == "shipped")'
+    assert lines[FILTER_LINE]["intent"] == "Orders"
+    assert all(lines[line]["seconds"] > 0 for line in (SOURCE_LINE, FILTER_LINE, TRANSFORM_LINE))
+    assert [intent["error"] for intent in report.intents] == [None]
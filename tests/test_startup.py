@@ -0,0 +1,65 @@
+"""
+CLI start-up: commands that do not compile must not import the compiler,
+and the start-up benchmark must read -X importtime output and budgets right.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+BENCHMARK = Path(__file__).resolve().parent.parent / "benchmarks" / "startup.py"
+
+spec = importlib.util.spec_from_file_location("startup_benchmark", BENCHMARK)
+startup = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(startup)
+
+COMPILER_MODULES = {"agentscript.lexer", "agentscript.parser", "agentscript.ast_nodes", "agentscript.codegen",
+                    "agentscript.optimizer", "agentscript.config"}
+
+IMPORT_TIME = """import time: self [us] | cumulative | imported package
+import time:       131 |        131 | agentscript
+import time:      1779 |       1779 |   agentscript.plugins.base
+import time:       111 |        111 |   agentscript.plugins.registry
+import time:       180 |       2069 | agentscript.plugins
+Plugins listed
+"""
+
+
+def imported_agentscript_modules(command, tmp_path):
+    args = startup._command_args(command, tmp_path)
+    stderr = startup._run(args, startup._environment(), ["-X", "importtime"]).stderr
+    return {record["module"] for record in startup.parse_import_times(stderr)
+            if record["module"].startswith("agentscript")}
+
+
+@pytest.mark.parametrize("command", ["version", "plugins"])
+def test_commands_that_do_not_compile_skip_the_compiler(command, tmp_path):
+    modules = imported_agentscript_modules(command, tmp_path)
+    assert "agentscript" in modules
+    assert not modules & COMPILER_MODULES
+    assert not [module for module in modules if module.endswith("_plugin")]
+
+
+def test_compile_imports_the_compiler_but_no_plugin(tmp_path):
+    modules = imported_agentscript_modules("compile", tmp_path)
+    assert {"agentscript.lexer", "agentscript.parser", "agentscript.codegen"} <= modules
+    assert not [module for module in modules if module.startswith("agentscript.plugins")]
+    assert (tmp_path / "trivial.py").exists()
+
+
+def test_parse_import_times():
+    assert startup.parse_import_times(IMPORT_TIME) == [
+        {"module": "agentscript", "self_us": 131, "cumulative_us": 131, "depth": 0},
+        {"module": "agentscript.plugins.base", "self_us": 1779, "cumulative_us": 1779, "depth": 1},
+        {"module": "agentscript.plugins.registry", "self_us": 111, "cumulative_us": 111, "depth": 1},
+        {"module": "agentscript.plugins", "self_us": 180, "cumulative_us": 2069, "depth": 0},
+    ]
+
+
+def test_check_budgets_reports_each_exceeded_metric():
+    result = {"command": "version", "wall_ms": {"median": 120.0}, "import_ms": 70.0, "agentscript_import_ms": 5.0}
+    budgets = {"version": {"wall_ms": 150, "import_ms": 60, "agentscript_import_ms": 10}}
+
+    assert startup.check_budgets([result], budgets) == ["version: import_ms 70.0 exceeds budget 60.0"]
+    assert startup.check_budgets([result], {"plugins": {"wall_ms": 1}}) == []
@@ -0,0 +1,68 @@
+"""
+Tests for selectivity-based condition ordering: with source statistics the
+-O 2 pipeline runs its conditions in a different order, and in more filters,
+but must select the same rows as the pipeline as written (-O 0).
+"""
+
+import random
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from agentscript.analysis import referenced_columns, stage_lambda
+from agentscript.optimizer import optimize_program
+from agentscript.parser import parse_agentscript
+from agentscript.stats import collect_csv_statistics
+
+from conftest import run_program
+
+
+FILTERS = {
+    "mixed": 'filter(t => t.memo contains "refund" and t.country == "US" and t.amount > 950)',
+    "expensive last": 'filter(t => t.code matches "[A-Z]{2}-[0-9]{3}" and t.amount between 100 and 200 '
+                      'and t.country in ["US", "DE"])',
+    "or groups": 'filter(t => (t.country == "FR" or t.amount < 50) and t.memo contains "card")',
+    "chained filters": 'filter(t => t.memo contains "card") -> filter(t => t.amount > 900)',
+}
+
+
+def write_transactions(path: Path, rows: int = 400):
+    rng = random.Random(7)
+    lines = ["id,country,amount,memo,code"]
+    for index in range(rows):
+        country = rng.choice(["US", "DE", "FR", "JP", "BR"])
+        memo = rng.choice(["card payment", "refund issued", "wire transfer", "card refund"])
+        code = rng.choice(["AB-123", "XY-9", "zz-100", "CD-456"])
+        lines.append(f"{index},{country},{rng.randint(0, 1000)},{memo},{code}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def transactions_program(stages: str) -> str:
+    return (f'use io.csv\n\nintent Transactions {{\n'
+            f'    pipeline: source.csv("transactions.csv") -> {stages}\n}}\n')
+
+
+def statistics(path: str):
+    return collect_csv_statistics(Path(path))
+
+
+@pytest.mark.parametrize("stages", list(FILTERS))
+def test_ordered_conditions_select_the_same_rows(workdir, stages):
+    write_transactions(workdir / "transactions.csv")
+    program = transactions_program(FILTERS[stages])
+
+    expected = run_program(program, opt_level=0)["transactions"]
+    result = run_program(program, opt_level=2, statistics=statistics)["transactions"]
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert len(expected)
+
+
+def test_most_selective_condition_runs_first(workdir):
+    write_transactions(workdir / "transactions.csv")
+    program = parse_agentscript(transactions_program(FILTERS["mixed"]), "test.ags")
+
+    stages = optimize_program(program, 2, statistics).statements[-1].pipeline.stages[1:]
+    columns = [referenced_columns(stage_lambda(stage)) for stage in stages]
+    # amount > 950 keeps about 5% of the rows, country == "US" about 20%; contains gets a filter of its own
+    assert columns == [["amount", "country"], ["memo"]]
@@ -0,0 +1,63 @@
+"""
+Tests for streaming pipelines: processing the input in chunks must write the
+same records as processing the whole frame at once.
+"""
+
+import pandas as pd
+import pytest
+
+from conftest import run_program
+
+
+ORDERS = """id,customer,qty,price,status
+1,anna,3,9.5,shipped
+2,bob,1,120.0,pending
+3,carla,12,4.25,shipped
+4,dave,7,15.0,cancelled
+5,eve,2,60.0,shipped
+6,frank,9,3.5,pending
+7,gina,4,22.0,shipped
+"""
+
+STAGES = {
+    "filter": 'filter(o => o.status == "shipped" and o.qty > 2)',
+    "transform": "transform(o => {id: o.id, customer: text.uppercase(o.customer), total: o.qty * o.price})",
+    "filter, transform": 'filter(o => o.status != "cancelled") -> transform(o => {id: o.id, total: o.qty * o.price})',
+    "no rows": "filter(o => o.qty > 100)",
+}
+
+
+def orders_program(stages: str, sink: str) -> str:
+    return (f'use io.csv, io.json\n\nintent Orders {{\n'
+            f'    pipeline: source.csv("orders.csv") -> {stages} -> sink.{sink}("out.{sink}")\n}}\n')
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 100])
+@pytest.mark.parametrize("stages", list(STAGES))
+def test_streamed_csv_sink_matches_whole_frame(workdir, stages, chunksize):
+    (workdir / "orders.csv").write_text(ORDERS)
+    program = orders_program(STAGES[stages], "csv")
+
+    whole = run_program(program)["orders"]
+    expected = (workdir / "out.csv").read_text()
+    rows = run_program(program, streaming=True, chunksize=chunksize)["orders"]
+
+    assert (workdir / "out.csv").read_text() == expected
+    assert rows == len(whole)
+
+
+@pytest.mark.parametrize("chunksize", [1, 3])
+@pytest.mark.parametrize("stages", list(STAGES))
+def test_streamed_json_lines_sink_matches_whole_frame(workdir, stages, chunksize):
+    (workdir / "orders.csv").write_text(ORDERS)
+    program = orders_program(STAGES[stages], "json")
+
+    run_program(program)
+    expected = pd.read_json(workdir / "out.json")
+    run_program(program, streaming=True, chunksize=chunksize)
+    text = (workdir / "out.json").read_text()
+
+    if expected.empty:
+        assert text == ""
+    else:
+        pd.testing.assert_frame_equal(pd.read_json(workdir / "out.json", lines=True), expected)
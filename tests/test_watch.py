@@ -0,0 +1,66 @@
+"""
+Tests for the incremental parser used by watch mode: unchanged statements are
+reused with the line numbers a fresh parse would give them, and a failed
+parse does not disturb what the next parse can reuse.
+"""
+
+import pytest
+
+from agentscript.parser import ParseError, parse_agentscript
+from agentscript.watch import IncrementalParser
+
+
+SOURCE = """use io.csv
+
+intent Orders {
+    pipeline: source.csv("orders.csv") -> filter(o => o.qty > 2)
+}
+
+intent Users {
+    pipeline: source.csv("users.csv") -> filter(u => u.age >= 18)
+}
+"""
+
+BROKEN = """
+intent Broken {
+    pipeline: ->
+}
+"""
+
+
+def lines(program):
+    return [statement.position.line for statement in program.statements]
+
+
+def test_unchanged_statements_are_reused():
+    parser = IncrementalParser()
+    first = parser.parse(SOURCE, "test.ags")
+    assert (parser.reparsed, parser.reused) == (3, 0)
+
+    second = parser.parse(SOURCE.replace("u.age >= 18", "u.age >= 21"), "test.ags")
+    assert (parser.reparsed, parser.reused) == (1, 2)
+    assert second.statements[1] is first.statements[1]
+
+
+def test_edit_above_shifts_reused_statements():
+    parser = IncrementalParser()
+    first = parser.parse(SOURCE, "test.ags")
+    edited = SOURCE.replace("use io.csv\n", "// Orders and users\nuse io.csv\n\n")
+
+    program = parser.parse(edited, "test.ags")
+    assert parser.reused == 2
+    assert lines(program) == lines(parse_agentscript(edited, "test.ags")) == [2, 5, 9]
+    # The previous AST keeps its own line numbers
+    assert lines(first) == [1, 3, 7]
+
+
+def test_failed_parse_leaves_reusable_statements():
+    parser = IncrementalParser()
+    parser.parse(SOURCE, "test.ags")
+
+    with pytest.raises(ParseError):
+        parser.parse("// Moved down\n" + SOURCE + BROKEN, "test.ags")
+
+    program = parser.parse(SOURCE, "test.ags")
+    assert (parser.reparsed, parser.reused) == (0, 3)
+    assert lines(program) == lines(parse_agentscript(SOURCE, "test.ags")) == [1, 3, 7]